@@ -1,23 +1,46 @@
-from fastapi import FastAPI, APIRouter, HTTPException
+from fastapi import FastAPI, APIRouter, HTTPException, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReturnDocument, ReplaceOne, UpdateOne, UpdateMany, DeleteOne, DeleteMany
+from pymongo.errors import BulkWriteError, OperationFailure
+from bson import ObjectId
+from bson.errors import InvalidId
 import os
 import logging
 import requests
+from requests.adapters import HTTPAdapter
 import zipfile
 import json
+import re
 import pandas as pd
 from pathlib import Path
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Callable, Iterable, Iterator, Tuple
 import uuid
 from datetime import datetime, timedelta
 import asyncio
-from io import BytesIO
 import tempfile
 import os
 import time
+import threading
+import multiprocessing
+import hashlib
+import base64
+import inspect
+import functools
+import shutil
+import msgpack
+import typer
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from match_parser import (
+    DEFAULT_SQUAD, SQUADS, BALL_BY_BALL, SUMMARY_VERSION,
+    squad_resolvers, squad_person_ids, set_squad_person_ids, may_involve_squad,
+    _process_item, _process_match_chunk
+)
 
 from fastapi import FastAPI, APIRouter
 from fastapi.staticfiles import StaticFiles
@@ -45,69 +68,109 @@ STATIC_DIR = ROOT_DIR / "static"
 # Mount static assets (JS/CSS)
 app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
 
-# Serve index.html at root
-@app.get("/")
-async def serve_index():
-    return FileResponse(STATIC_DIR / "index.html")
+# Mount API router (included below, once all API routes are defined)
+api_router = APIRouter(prefix="/api")
 
-# Catch-all for React client-side routing
-@app.get("/{full_path:path}")
-async def serve_static_or_index(full_path: str):
-    file_path = STATIC_DIR / full_path
-    if file_path.exists():
-        return FileResponse(file_path)
-    return FileResponse(STATIC_DIR / "index.html")
+# Data corrections, applied to records as they are written and by POST /api/sync-data to
+# stored records (see CorrectionRules). CORRECTION_RULES_FILE (JSON list) replaces the defaults.
+#   rename:   {"team": optional, "from": name, "to": name} - rename a player's records
+#   reassign: {"where": {...}, "set": {...}}                - overwrite fields of matching records
+#   delete:   {"where": {...}}                              - drop matching records
+# where maps fields to a value or to {"$in" | "$nin" | "$ne": ...}, as in a MongoDB filter.
+CORRECTION_RULES_FILE = os.environ.get('CORRECTION_RULES_FILE')
+CORRECTION_RULES = [
+    {"name": "rg-sharma-alias", "action": "rename", "team": DEFAULT_SQUAD, "from": "RG Sharma", "to": "Rohit Sharma"},
+    # Namesakes in Singapore / Bahrain etc. matches that involve neither MI nor India
+    {"name": "rohit-sharma-namesakes", "action": "delete", "where": {
+        "player_name": "Rohit Sharma",
+        "team1": {"$nin": ["Mumbai Indians", "India"]},
+        "team2": {"$nin": ["Mumbai Indians", "India"]}
+    }}
+]
 
-# Mount API router
-api_router = APIRouter(prefix="/api")
-# Add your API routes here...
-app.include_router(api_router)
+def load_correction_rules() -> List[Dict[str, Any]]:
+    if CORRECTION_RULES_FILE:
+        with open(CORRECTION_RULES_FILE) as f:
+            return json.load(f)
+    return CORRECTION_RULES
 
-# Mumbai Indians 2025 squad
-MI_PLAYERS = [
-    # Retained players
-    "Jasprit Bumrah", "Suryakumar Yadav", "Hardik Pandya", "Rohit Sharma", "Tilak Varma",
-    # New acquisitions
-    "Trent Boult", "Deepak Chahar", "Will Jacks", "Naman Dhir", "Allah Ghazanfar",
-    "Mitchell Santner", "Ryan Rickelton", "Reece Topley", "Lizaad Williams", "Robin Minz",
-    "Karn Sharma", "Ashwani Kumar", "Shrijith Krishnan", "Raj Angad Bawa", "Satyanarayana Raju",
-    "Bevon Jacobs", "Arjun Tendulkar", "Vignesh Puthur", "Mujeeb Ur Rahman", "Corbin Bosch",
-    # Latest additions - 2025 season
-    "JM Bairstow", "RJ Gleeson", "Charith Asalanka"
+# Streaming download settings - archives are spooled to disk instead of held in RAM
+DOWNLOAD_CHUNK_SIZE = int(os.environ.get('DOWNLOAD_CHUNK_SIZE', 1024 * 1024))  # 1 MB per network read
+SPOOL_MAX_MEMORY = int(os.environ.get('SPOOL_MAX_MEMORY', 8 * 1024 * 1024))  # roll over to disk past 8 MB
+INSERT_BATCH_SIZE = int(os.environ.get('INSERT_BATCH_SIZE', 1000))
+
+# Cricsheet download location - override to point syncs at a mirror or local stand-in
+CRICSHEET_BASE_URL = os.environ.get('CRICSHEET_BASE_URL', 'https://cricsheet.org/downloads').rstrip('/')
+
+# Comprehensive archives for ALL cricket formats
+CRICSHEET_ARCHIVES = [
+    # Year-based data (most comprehensive) - PRIORITY
+    "2025_male_json.zip",
+    "2024_male_json.zip",
+    
+    # Format-specific data for comprehensive coverage
+    "tests_male_json.zip",    # Test matches
+    "odis_male_json.zip",     # ODI matches  
+    "t20s_male_json.zip",     # T20 Internationals
+    "it20s_male_json.zip",    # Non-official T20Is
+    
+    # Major tournaments and leagues
+    "ipl_male_json.zip",      # Indian Premier League
+    "bbl_male_json.zip",      # Big Bash League
+    "cpl_male_json.zip",      # Caribbean Premier League
+    "psl_male_json.zip",      # Pakistan Super League
+    "bpl_male_json.zip",      # Bangladesh Premier League
+    "lpl_male_json.zip",      # Lanka Premier League
+    "sat_male_json.zip",      # SA20
+    "mlc_male_json.zip",      # Major League Cricket
+    "ilt_male_json.zip",      # International League T20
+    
+    # Domestic competitions  
+    "ntb_male_json.zip",      # T20 Blast (England)
+    "rlc_male_json.zip",      # One-Day Cup (England)
+    "cch_male_json.zip",      # County Championship
+    "ssh_male_json.zip",      # Sheffield Shield (Australia)
+    "ssm_male_json.zip",      # Super Smash (New Zealand)
+    "sma_male_json.zip",      # Syed Mushtaq Ali Trophy (India)
 ]
 
-# Alternative name mappings for player matching - COMPREHENSIVE MAPPING
-PLAYER_ALTERNATIVES = {
-    "Jasprit Bumrah": ["J Bumrah", "JJ Bumrah", "Bumrah"],
-    "Suryakumar Yadav": ["SA Yadav"],
-    "Hardik Pandya": ["H Pandya", "HH Pandya", "Pandya"],
-    "Rohit Sharma": ["RG Sharma"],
-    "Tilak Varma": ["T Varma", "Tilak"],
-    "Trent Boult": ["TA Boult", "T Boult", "Boult"],
-    "Deepak Chahar": ["D Chahar", "DL Chahar", "Chahar"],
-    "Will Jacks": ["WG Jacks", "W Jacks", "Jacks"],
-    "Mitchell Santner": ["MJ Santner", "M Santner", "Santner"],
-    "Ryan Rickelton": ["R Rickelton", "RD Rickelton", "Rickelton"],
-    "Reece Topley": ["RJW Topley", "R Topley", "Topley"],
-    "Arjun Tendulkar": ["A Tendulkar", "Tendulkar"],
-    "Vignesh Puthur": ["V Puthur", "Puthur"],
-    "Satyanarayana Raju": ["PVSN Raju", "Raju", "Satyanarayana"],
-    "Naman Dhir": ["N Dhir", "Dhir"],
-    "Allah Ghazanfar": ["A Ghazanfar", "Ghazanfar"],
-    "Robin Minz": ["R Minz", "Minz"],
-    "Karn Sharma": ["K Sharma", "Sharma"],
-    "Ashwani Kumar": ["A Kumar", "Kumar"],
-    "Shrijith Krishnan": ["S Krishnan", "Krishnan"],
-    "Raj Angad Bawa": ["RA Bawa", "R Bawa", "Bawa"],
-    "Bevon Jacobs": ["B Jacobs", "Jacobs"],
-    "Lizaad Williams": ["L Williams", "Williams"],
-    "Mujeeb Ur Rahman": ["Mujeeb", "M Rahman", "Mujeeb Rahman"],
-    "Corbin Bosch": ["C Bosch", "Bosch"],
-    # Latest additions - 2025 season
-    "JM Bairstow": ["J Bairstow", "Jinny Bairstow", "Bairstow"],
-    "RJ Gleeson": ["R Gleeson", "Richard Gleeson", "Gleeson"],
-    "Charith Asalanka": ["C Asalanka", "KIC Asalanka", "Asalanka"]
-}
+# Rolling archives of matches added in the last N days (2, 7 or 30) for daily top-ups
+RECENTLY_ADDED_ARCHIVE = "recently_added_{days}_male_json.zip"
+
+# Number of archives downloaded ahead of the one being parsed
+SYNC_DOWNLOAD_CONCURRENCY = int(os.environ.get('SYNC_DOWNLOAD_CONCURRENCY', 3))
+_http_session: Optional[requests.Session] = None
+
+# Parallel parsing settings - SYNC_WORKERS > 1 enables the process pool
+SYNC_WORKERS = int(os.environ.get('SYNC_WORKERS', 1))
+PARSE_CHUNK_SIZE = int(os.environ.get('PARSE_CHUNK_SIZE', 200))  # matches per worker task
+
+# Skip decoding ZIP members whose raw bytes never mention a squad name
+PREFILTER_MATCHES = os.environ.get('PREFILTER_MATCHES', '1') == '1'
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_workers = 0
+
+# Full-sync pipeline (download -> parse -> write) - stages overlap, bounded by queues and a memory budget
+SYNC_MEMORY_BUDGET = int(os.environ.get('SYNC_MEMORY_BUDGET', 256 * 1024 * 1024))  # split between archives and records
+SYNC_WRITE_QUEUE_SIZE = int(os.environ.get('SYNC_WRITE_QUEUE_SIZE', 8))  # parsed batches waiting for MongoDB
+RECORD_MEMORY_ESTIMATE = 2048  # rough in-memory size of one match record
+CHECKPOINT_INTERVAL = int(os.environ.get('CHECKPOINT_INTERVAL', 500))  # matches between member checkpoints
+
+# On-disk cache of downloaded archives and parsed match summaries (see ArchiveCache)
+CACHE_ENABLED = os.environ.get('CRICSHEET_CACHE', '1') == '1'
+CACHE_DIR = Path(os.environ.get('CRICSHEET_CACHE_DIR', ROOT_DIR / '.cricsheet_cache'))
+
+# In-process cache of read endpoint responses (see ResponseCache)
+RESPONSE_CACHE_MAX_BYTES = int(os.environ.get('RESPONSE_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+DATA_GENERATION_CHECK_INTERVAL = float(os.environ.get('DATA_GENERATION_CHECK_INTERVAL', 1.0))  # seconds
+
+# Records fetched per round trip when streaming match listings as NDJSON
+MATCH_STREAM_BATCH_SIZE = int(os.environ.get('MATCH_STREAM_BATCH_SIZE', 1000))
+# Largest match listing page served as one JSON array - bigger (or unlimited) listings have to stream
+MATCH_PAGE_MAX_SIZE = int(os.environ.get('MATCH_PAGE_MAX_SIZE', 1000))
+
+# Most players one /api/analytics/players request may ask for
+ANALYTICS_BATCH_MAX_PLAYERS = int(os.environ.get('ANALYTICS_BATCH_MAX_PLAYERS', 100))
 
 # Define Models
 class Player(BaseModel):
@@ -122,6 +185,7 @@ class MatchData(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     player_name: str
     match_id: str
+    team: str = "Mumbai Indians"  # tracked squad the record belongs to
     team1: str
     team2: str
     venue: str
@@ -136,6 +200,9 @@ class MatchData(BaseModel):
     fielding_stats: Optional[Dict[str, Any]] = None
     match_result: Optional[str] = None
     total_deliveries_involved: Optional[int] = None
+    player_id: Optional[str] = None  # Cricsheet registry person ID
+    player_team: Optional[str] = None  # team whose roster lists the player
+    ball_by_ball: Optional[List[Dict[str, Any]]] = None  # only with BALL_BY_BALL on
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
 class DataSyncStatus(BaseModel):
@@ -145,590 +212,2063 @@ class DataSyncStatus(BaseModel):
     total_matches: int = 0
     total_players: int = 0
     message: str = ""
+    # Background sync job progress (see SyncJob)
+    job_id: Optional[str] = None
+    stage: Optional[str] = None
+    current_archive: Optional[str] = None
+    archives_total: int = 0
+    archives_done: int = 0
+    files_processed: int = 0
+    files_skipped: int = 0
+    files_prefiltered: int = 0
+    files_from_cache: int = 0
+    files_duplicate: int = 0
+    files_resumed: int = 0
+    duplicates_by_archive: Dict[str, int] = {}
+    queue_depths: Dict[str, int] = {}
+    memory_in_use: int = 0
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    files_per_second: float = 0.0
+    eta_seconds: Optional[float] = None
+    params: Dict[str, Any] = {}
 
-def normalize_player_name(name: str) -> str:
-    """Normalize player name for better matching"""
-    if not name:
-        return ""
-    
-    # Remove common prefixes and suffixes
-    name = name.strip()
-    name = name.replace("(c)", "").replace("(wk)", "").replace("†", "").replace("*", "")
-    name = name.strip()
-    
-    return name
-
-def get_canonical_player_name(player_name: str, teams_in_match: set = None) -> str:
-    """Get the canonical Mumbai Indians player name from any variant"""
-    if not player_name:
-        return ""
-    
-    normalized = normalize_player_name(player_name)
-    
-    # Direct match in MI_PLAYERS
-    if normalized in MI_PLAYERS:
-        return normalized
-    
-    # Check alternatives - return the canonical name
-    for canonical_name, alternatives in PLAYER_ALTERNATIVES.items():
-        if normalized in alternatives or normalized == canonical_name:
-            return canonical_name
-    
-    # Only do fuzzy matching if Mumbai Indians is one of the teams in the match
-    if teams_in_match and ("Mumbai Indians" in teams_in_match):
-        # More restrictive fuzzy matching - require significant overlap
-        for mi_player in MI_PLAYERS:
-            # Split names and check if substantial parts match
-            normalized_parts = set(normalized.lower().split())
-            mi_player_parts = set(mi_player.lower().split())
-            
-            # Require at least 2 name parts to match, or full surname match
-            if len(normalized_parts.intersection(mi_player_parts)) >= 2:
-                return mi_player
-            
-            # Or check if it's a very close match (90%+ similarity)
-            from difflib import SequenceMatcher
-            similarity = SequenceMatcher(None, normalized.lower(), mi_player.lower()).ratio()
-            if similarity > 0.9:
-                return mi_player
+# Lowercased keyword copies of the filterable text fields, written with every record so
+# filters can use exact / prefix matches on an index instead of case-insensitive regexes
+KEYWORD_FIELDS = {
+    'player_name': 'player_key',
+    'format': 'format_key',
+    'tournament': 'tournament_key',
+    'season': 'season_key'
+}
+TEXT_MATCH_MODES = ("exact", "prefix", "regex")
+
+def keyword(value: Any) -> Optional[str]:
+    """Keyword form of a text field - whitespace collapsed and lowercased"""
+    if value is None:
+        return None
+    return " ".join(str(value).split()).lower()
+
+def keyword_fields(document: Dict[str, Any]) -> Dict[str, Optional[str]]:
+    """The KEYWORD_FIELDS values for whichever source fields document has"""
+    return {key: keyword(document[field]) for field, key in KEYWORD_FIELDS.items() if field in document}
+
+def text_filter(field: str, value: str, match: str = "exact") -> Dict[str, Any]:
+    """Query clause for a text filter - exact / prefix on the keyword field, or the legacy
+    unanchored case-insensitive regex on the field itself when match="regex" """
+    if match == "regex":
+        return {field: {"$regex": value, "$options": "i"}}
+    if match == "exact":
+        return {KEYWORD_FIELDS[field]: keyword(value)}
+    # An anchored, case-sensitive prefix regex is an index range scan
+    return {KEYWORD_FIELDS[field]: {"$regex": f"^{re.escape(keyword(value))}"}}
+
+def text_matches(text: Optional[str], value: str, match: str = "exact") -> bool:
+    """In-memory counterpart of text_filter"""
+    if text is None:
+        return False
+    if match == "regex":
+        return re.search(value, text, re.IGNORECASE) is not None
+    if match == "exact":
+        return keyword(text) == keyword(value)
+    return keyword(text).startswith(keyword(value))
+
+def check_text_match(match: str):
+    if match not in TEXT_MATCH_MODES:
+        raise HTTPException(status_code=400, detail=f"match must be one of {', '.join(TEXT_MATCH_MODES)}")
+
+# Match listings page through records newest first, _id breaking ties between same-day records
+MATCH_PAGE_SORT = [("date", -1), ("_id", -1)]
+
+def encode_match_cursor(document: Dict[str, Any]) -> str:
+    """Opaque cursor resuming a match listing after document"""
+    position = json.dumps([document.get("date"), str(document["_id"])], separators=(',', ':'))
+    return base64.urlsafe_b64encode(position.encode()).decode().rstrip("=")
+
+def match_cursor_filter(cursor: str) -> Dict[str, Any]:
+    """Query clause selecting the records that sort after the cursor's position in MATCH_PAGE_SORT"""
+    try:
+        date, doc_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        # Only plain values may reach the filter - a dict would be read as a query operator
+        if not isinstance(date, (str, type(None))) or not isinstance(doc_id, str):
+            raise ValueError("unexpected cursor value types")
+        doc_id = ObjectId(doc_id)
+    except (ValueError, TypeError, InvalidId):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if date is None:
+        # Null / missing dates come after every dated record in a descending sort
+        return {"date": None, "_id": {"$lt": doc_id}}
+    # $lt only compares strings with strings, so the undated records past the last dated one are added explicitly
+    return {"$or": [{"date": {"$lt": date}}, {"date": None}, {"date": date, "_id": {"$lt": doc_id}}]}
+
+def check_match_page(limit: int, cursor: Optional[str], stream: bool) -> Optional[Dict[str, Any]]:
+    """Validate match listing paging parameters, returning the cursor's query clause"""
+    if limit < 0:
+        raise HTTPException(status_code=400, detail="limit must not be negative")
+    if not stream and not 0 < limit <= MATCH_PAGE_MAX_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"limit must be between 1 and {MATCH_PAGE_MAX_SIZE} - use stream=true for more (limit=0 streams every record)"
+        )
+    return match_cursor_filter(cursor) if cursor else None
+
+async def list_match_records(query: Dict[str, Any], limit: int, after: Optional[Dict[str, Any]], stream: bool, response: Response):
+    """Serve a page of match records in MATCH_PAGE_SORT order
+    
+    after is the check_match_page clause of the cursor the page continues from.
+    When more records follow the page, the X-Next-Cursor header carries the cursor of the
+    next one - a page without it is the last. One record past the limit is read to tell.
+    stream=True returns NDJSON instead of a JSON array, reading from the database batch by
+    batch so any number of records (limit=0 for all) is sent in constant memory; when the
+    limit cuts it short, the last line is {"next_cursor": ...} instead of a record.
+    """
+    if after:
+        query = {"$and": [query, after]} if query else after
+    # One record past the page, only fetched to see whether there is a next page
+    fetch_limit = limit + 1 if limit else 0
+    
+    if stream:
+        async def lines():
+            count, last = 0, None
+            try:
+                async for doc in db.matches.find(query, limit=fetch_limit, batch_size=MATCH_STREAM_BATCH_SIZE).sort(MATCH_PAGE_SORT):
+                    if limit and count == limit:
+                        yield json.dumps({"next_cursor": encode_match_cursor(last)}) + "\n"
+                        break
+                    yield json.dumps(jsonable_encoder(MatchData(**doc))) + "\n"
+                    count, last = count + 1, doc
+            except Exception as e:
+                logging.error(f"Error streaming matches after {count} records: {e}")
+                raise
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+    
+    matches = await db.matches.find(query, limit=fetch_limit).sort(MATCH_PAGE_SORT).to_list(fetch_limit)
+    if len(matches) > limit:
+        matches = matches[:limit]
+        response.headers["X-Next-Cursor"] = encode_match_cursor(matches[-1])
+    return [MatchData(**match) for match in matches]
+
+async def delete_match_records_by_id(doc_ids: List[Any]) -> int:
+    """Delete match records by _id in one unordered bulk write (chunks of INSERT_BATCH_SIZE ids)"""
+    if not doc_ids:
+        return 0
+    operations = [
+        DeleteMany({"_id": {"$in": doc_ids[start:start + INSERT_BATCH_SIZE]}})
+        for start in range(0, len(doc_ids), INSERT_BATCH_SIZE)
+    ]
+    result = await db.matches.bulk_write(operations, ordered=False)
+    return result.deleted_count
+
+async def rename_players(renames: Dict[Tuple[str, str], str]) -> int:
+    """Rename players' records, {(team, original_name): canonical_name}, in one bulk write
+    
+    Records that would collide with an existing (match_id, team, canonical_name) record under
+    the unique index are dropped first. The collisions are found by a single aggregation that
+    groups the affected records on their post-rename key.
+    """
+    if not renames:
+        return 0
+    
+    names_by_team = defaultdict(set)
+    for (team, original_name), canonical_name in renames.items():
+        names_by_team[team].update((original_name, canonical_name))
+    renamed_to = {
+        "$switch": {
+            "branches": [
+                {"case": {"$and": [{"$eq": ["$team", team]}, {"$eq": ["$player_name", original_name]}]}, "then": canonical_name}
+                for (team, original_name), canonical_name in renames.items()
+            ],
+            "default": "$player_name"
+        }
+    }
+    pipeline = [
+        {"$match": {"$or": [{"team": team, "player_name": {"$in": sorted(names)}} for team, names in names_by_team.items()]}},
+        {"$project": {"match_id": 1, "team": 1, "player_name": 1, "canonical_name": renamed_to}},
+        {
+            "$group": {
+                "_id": {"match_id": "$match_id", "team": "$team", "player_name": "$canonical_name"},
+                "docs": {"$push": {"id": "$_id", "renamed": {"$ne": ["$player_name", "$canonical_name"]}}},
+                "count": {"$sum": 1}
+            }
+        },
+        {"$match": {"count": {"$gt": 1}}}
+    ]
+    colliding_ids = []
+    async for group in db.matches.aggregate(pipeline, allowDiskUse=True):
+        # Keep the record already under the canonical name (sorts first) and drop the renamed
+        # ones; plain duplicates of the canonical record are left to remove_duplicate_match_records
+        docs = sorted(group["docs"], key=lambda doc: doc["renamed"])
+        colliding_ids.extend(doc["id"] for doc in docs[1:] if doc["renamed"])
+    dropped = await delete_match_records_by_id(colliding_ids)
+    if dropped:
+        logging.info(f"Dropped {dropped} records that would collide with existing canonical records")
+    
+    result = await db.matches.bulk_write([
+        UpdateMany(
+            {"team": team, "player_name": original_name},
+            {"$set": {"player_name": canonical_name, "player_key": keyword(canonical_name)}}
+        )
+        for (team, original_name), canonical_name in renames.items()
+    ], ordered=False)
+    return result.modified_count
+
+async def rename_player_records(original_name: str, canonical_name: str, team: str = DEFAULT_SQUAD) -> int:
+    """Rename a player's records in a squad, dropping any that would collide with an existing
+    (match_id, team, canonical_name) record under the unique index"""
+    return await rename_players({(team, original_name): canonical_name})
+
+async def remove_duplicate_match_records() -> int:
+    """Remove duplicate match records (same match_id + team + player_name combination)
+    
+    Every duplicate group is found by one server-side aggregation - no cap on the number
+    of groups - and the surplus records are deleted in a single bulk write.
+    """
+    pipeline = [
+        {
+            "$group": {
+                "_id": {
+                    "match_id": "$match_id",
+                    "team": "$team",
+                    "player_name": "$player_name"
+                },
+                "doc_ids": {"$push": "$_id"},
+                "count": {"$sum": 1}
+            }
+        },
+        {
+            "$match": {
+                "count": {"$gt": 1}
+            }
+        }
+    ]
     
-    return normalized  # Return as-is if no match found
+    docs_to_remove = []
+    duplicate_groups = 0
+    async for duplicate_group in db.matches.aggregate(pipeline, allowDiskUse=True):
+        # Keep the first document, remove the rest
+        docs_to_remove.extend(duplicate_group["doc_ids"][1:])
+        duplicate_groups += 1
+    
+    duplicate_removals = await delete_match_records_by_id(docs_to_remove)
+    if duplicate_removals:
+        logging.info(f"Removed {duplicate_removals} duplicate records from {duplicate_groups} (match, team, player) groups")
+    return duplicate_removals
 
-async def cleanup_duplicate_players():
-    """Remove duplicate player entries and standardize player names"""
+async def cleanup_duplicate_players() -> Dict[str, Any]:
+    """Remove duplicate player entries and standardize player names
+    
+    Returns the renamed / duplicates_removed counts, their sum as updated, and the
+    seconds spent in each step under timings.
+    """
     try:
-        updated_count = 0
-        
-        # Get all unique player names that need standardization
-        all_players = await db.matches.distinct("player_name")
-        
-        for original_name in all_players:
-            # For cleanup, we can't know the teams, so pass None (will skip fuzzy matching)
-            canonical_name = get_canonical_player_name(original_name, None)
-            
-            if canonical_name != original_name:
-                # Update all records with this player name
-                result = await db.matches.update_many(
-                    {"player_name": original_name},
-                    {"$set": {"player_name": canonical_name}}
-                )
-                updated_count += result.modified_count
-                logging.info(f"Updated {result.modified_count} records: {original_name} -> {canonical_name}")
+        started = time.perf_counter()
         
-        # Remove duplicate match records (same match_id + player_name combination)
-        # This is more complex, so we'll use aggregation to identify and remove duplicates
+        # Every (team, player_name) pair in one aggregation instead of a distinct per squad
+        renames = {}
         pipeline = [
-            {
-                "$group": {
-                    "_id": {
-                        "match_id": "$match_id",
-                        "player_name": "$player_name"
-                    },
-                    "doc_ids": {"$push": "$_id"},
-                    "count": {"$sum": 1}
-                }
-            },
-            {
-                "$match": {
-                    "count": {"$gt": 1}
-                }
-            }
+            {"$match": {"team": {"$in": list(squad_resolvers)}}},
+            {"$group": {"_id": {"team": "$team", "player_name": "$player_name"}}}
         ]
+        async for group in db.matches.aggregate(pipeline, allowDiskUse=True):
+            team, original_name = group["_id"]["team"], group["_id"]["player_name"]
+            # For cleanup, we can't know the teams, so pass None (will skip fuzzy matching)
+            canonical_name = squad_resolvers[team].canonical(original_name, None)
+            if canonical_name != original_name:
+                renames[(team, original_name)] = canonical_name
+                logging.info(f"Renaming {team} records: {original_name} -> {canonical_name}")
+        scanned = time.perf_counter()
         
-        duplicates = await db.matches.aggregate(pipeline).to_list(1000)
-        duplicate_removals = 0
+        updated_count = await rename_players(renames)
+        renamed = time.perf_counter()
         
-        for duplicate_group in duplicates:
-            # Keep the first document, remove the rest
-            docs_to_remove = duplicate_group["doc_ids"][1:]  # Skip first, remove rest
-            if docs_to_remove:
-                result = await db.matches.delete_many({"_id": {"$in": docs_to_remove}})
-                duplicate_removals += result.deleted_count
-                logging.info(f"Removed {result.deleted_count} duplicate records for match {duplicate_group['_id']['match_id']} - player {duplicate_group['_id']['player_name']}")
+        # The unique (match_id, team, player_name) index prevents new duplicates; this only
+        # matters for data written before the index existed
+        duplicate_removals = await remove_duplicate_match_records()
+        finished = time.perf_counter()
         
-        logging.info(f"Cleanup completed: {updated_count} names standardized, {duplicate_removals} duplicates removed")
-        return updated_count + duplicate_removals
+        timings = {
+            'scan_seconds': round(scanned - started, 3),
+            'rename_seconds': round(renamed - scanned, 3),
+            'dedup_seconds': round(finished - renamed, 3),
+            'total_seconds': round(finished - started, 3)
+        }
+        logging.info(f"Cleanup completed: {updated_count} names standardized, {duplicate_removals} duplicates removed in {timings['total_seconds']}s {timings}")
+        return {
+            'renamed': updated_count,
+            'duplicates_removed': duplicate_removals,
+            'updated': updated_count + duplicate_removals,
+            'timings': timings
+        }
         
     except Exception as e:
         logging.error(f"Error during cleanup: {e}")
         raise e
 
-async def cleanup_rg_sharma():
-    """Update 'RG Sharma' to its canonical name 'Rohit Sharma'"""
+class CorrectionRules:
+    """Declarative data fixes for match records (see CORRECTION_RULES)
+    
+    Rules run in order on each record and see the changes made by earlier rules; a delete
+    ends the evaluation. A rule only counts as a hit when it changes or drops the record.
+    Hits of records corrected on the way into the database accumulate in hits.
+    """
+    OPERATORS = {"$in", "$nin", "$ne"}
+    
+    def __init__(self, rules: List[Dict[str, Any]]):
+        self.rules = []
+        for idx, rule in enumerate(rules):
+            name = rule.get('name') or f"rule-{idx + 1}"
+            action = rule.get('action')
+            if action == 'rename':
+                where = {'player_name': rule['from']}
+                if rule.get('team'):
+                    where['team'] = rule['team']
+                changes = {'player_name': rule['to']}
+            elif action == 'reassign':
+                where, changes = dict(rule.get('where', {})), dict(rule.get('set', {}))
+            elif action == 'delete':
+                where, changes = dict(rule.get('where', {})), None
+            else:
+                raise ValueError(f"Correction rule {name}: unknown action {action!r}")
+            
+            if not where:
+                raise ValueError(f"Correction rule {name}: an empty where would match every record")
+            for field, condition in where.items():
+                if isinstance(condition, dict) and not set(condition) <= self.OPERATORS:
+                    raise ValueError(f"Correction rule {name}: unsupported operator in {field}: {condition}")
+            self.rules.append({'name': name, 'action': action, 'where': where, 'set': changes})
+        
+        self.hits = {rule['name']: 0 for rule in self.rules}
+    
+    @staticmethod
+    def _matches(record: Dict[str, Any], where: Dict[str, Any]) -> bool:
+        for field, condition in where.items():
+            value = record.get(field)
+            if not isinstance(condition, dict):
+                if value != condition:
+                    return False
+                continue
+            for operator, operand in condition.items():
+                if operator == "$in" and value not in operand:
+                    return False
+                if operator == "$nin" and value in operand:
+                    return False
+                if operator == "$ne" and value == operand:
+                    return False
+        return True
+    
+    def query(self) -> Optional[Dict[str, Any]]:
+        """MongoDB filter for every stored record that some rule may touch"""
+        if not self.rules:
+            return None
+        return {"$or": [rule['where'] for rule in self.rules]}
+    
+    def fields(self) -> set:
+        """Record fields the rules read or write"""
+        fields = {'match_id', 'team', 'player_name'}
+        for rule in self.rules:
+            fields.update(rule['where'])
+            fields.update(rule['set'] or {})
+        return fields
+    
+    def evaluate(self, record: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], List[str]]:
+        """Return (changes, names of the rules that hit) - changes is None when the record is dropped"""
+        changes = {}
+        fired = []
+        for rule in self.rules:
+            current = {**record, **changes}
+            if not self._matches(current, rule['where']):
+                continue
+            if rule['set'] is None:
+                fired.append(rule['name'])
+                return None, fired
+            if any(current.get(field) != value for field, value in rule['set'].items()):
+                fired.append(rule['name'])
+                changes.update(rule['set'])
+        return changes, fired
+    
+    def apply(self, records: List[Dict]) -> List[Dict]:
+        """Correct records before they are written, leaving out dropped ones"""
+        corrected = []
+        for record in records:
+            changes, fired = self.evaluate(record)
+            for name in fired:
+                self.hits[name] += 1
+            if changes is None:
+                continue
+            corrected.append({**record, **changes} if changes else record)
+        return corrected
+    
+    def stats(self) -> Dict[str, Any]:
+        return {'rules': self.rules, 'ingest_hits': dict(self.hits)}
+
+correction_rules = CorrectionRules(load_correction_rules())
+
+async def write_corrections(operations: List[Any], doc_ids: List[Any]):
+    """Write one batch of corrections; operations[i] targets the record doc_ids[i]"""
     try:
-        original_name = "RG Sharma"
-        canonical_name = get_canonical_player_name(original_name, teams_in_match=None)
-        updated_count = 0
-
-        if canonical_name != original_name:
-            result = await db.matches.update_many(
-                {"player_name": original_name},
-                {"$set": {"player_name": canonical_name}}
-            )
-            updated_count = result.modified_count
-            logging.info(f"Updated {result.modified_count} records: {original_name} -> {canonical_name}")
+        await db.matches.bulk_write(operations, ordered=False)
+    except BulkWriteError as e:
+        errors = e.details.get('writeErrors', [])
+        if any(error.get('code') != 11000 for error in errors):
+            raise
+        # The corrected (match_id, team, player_name) already exists - keep that record
+        await delete_match_records_by_id([doc_ids[error['index']] for error in errors])
+
+async def apply_correction_rules() -> Dict[str, int]:
+    """Apply the correction rules to the stored records in a single pass
+    
+    One $or query streams every record some rule may touch, and the corrections are written
+    in unordered bulk writes of INSERT_BATCH_SIZE. Returns the hit count of each rule.
+    """
+    hits = {rule['name']: 0 for rule in correction_rules.rules}
+    query = correction_rules.query()
+    if query is None:
+        return hits
+    
+    started = time.perf_counter()
+    operations, doc_ids = [], []
+    projection = {field: 1 for field in correction_rules.fields()}
+    async for doc in db.matches.find(query, projection):
+        changes, fired = correction_rules.evaluate(doc)
+        if not fired:
+            continue
+        for name in fired:
+            hits[name] += 1
+        if changes is None:
+            operations.append(DeleteOne({"_id": doc["_id"]}))
         else:
-            logging.info("No update needed. Canonical name is same as original.")
-                                 
+            operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": {**changes, **keyword_fields(changes)}}))
+        doc_ids.append(doc["_id"])
         
-        # Remove duplicate match records (same match_id + player_name combination)
-        # This is more complex, so we'll use aggregation to identify and remove duplicates
+        if len(operations) >= INSERT_BATCH_SIZE:
+            await write_corrections(operations, doc_ids)
+            operations, doc_ids = [], []
+    if operations:
+        await write_corrections(operations, doc_ids)
+    
+    logging.info(f"Applied correction rules in {time.perf_counter() - started:.3f}s: {hits}")
+    return hits
+
+async def ensure_indexes():
+    """Create the match indexes - the unique (match_id, team, player_name) one clearing legacy duplicates first if needed"""
+    # Records from before multi-squad tracking belong to the MI squad
+    await db.matches.update_many({"team": {"$exists": False}}, {"$set": {"team": DEFAULT_SQUAD}})
+    
+    index_keys = [("match_id", 1), ("team", 1), ("player_name", 1)]
+    try:
+        await db.matches.create_index(index_keys, unique=True, name="match_team_player_unique")
+    except OperationFailure as e:
+        logging.warning(f"Could not create unique match index ({e}); removing duplicate records and retrying")
+        await remove_duplicate_match_records()
+        await db.matches.create_index(index_keys, unique=True, name="match_team_player_unique")
+    
+    await backfill_keyword_fields()
+    # Filter access paths - text filters match the keyword fields, results are sorted by date
+    # (match listings by date and _id, so they page through an index range)
+    await db.matches.create_index([("date", -1), ("_id", -1)], name="date_id")
+    await db.matches.create_index([("player_key", 1), ("date", -1), ("_id", -1)], name="player_key_date_id")
+    await db.matches.create_index([("format_key", 1), ("date", -1)], name="format_key_date")
+    await db.matches.create_index([("tournament_key", 1), ("season_key", 1), ("date", -1)], name="tournament_key_season_key_date")
+    # Unfiltered analytics reads a squad's player_stats by recency
+    await db.player_stats.create_index([("team", 1), ("last_date", -1)], name="team_last_date")
+
+def plan_stages(plan: Any) -> Iterator[Dict[str, Any]]:
+    """Every stage of an explain() query plan, however the server nests them"""
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            yield plan
+        for value in plan.values():
+            yield from plan_stages(value)
+    elif isinstance(plan, list):
+        for value in plan:
+            yield from plan_stages(value)
+
+def bounded_index_scan(explained: Dict[str, Any], key_fields: List[str]) -> Optional[str]:
+    """Name of the index the winning plan seeks on for key_fields, or None
+    
+    Only an IXSCAN whose key pattern starts with key_fields and that bounds every one
+    of them counts - a filter the index can't seek on still shows up as an IXSCAN of,
+    say, all of date_id, just with [MinKey, MaxKey] bounds.
+    """
+    for stage in plan_stages(explained.get("queryPlanner", {}).get("winningPlan", {})):
+        if stage["stage"] != "IXSCAN":
+            continue
+        bounds = stage.get("indexBounds", {})
+        if list(stage.get("keyPattern", {}))[:len(key_fields)] == key_fields and all(
+            bounds.get(field) and not set(bounds[field]) & {"[MinKey, MaxKey]", "[MaxKey, MinKey]"}
+            for field in key_fields
+        ):
+            return stage["indexName"]
+    return None
+
+# Text filters with an index of their own (see ensure_indexes) - season is only indexed after tournament
+INDEXED_TEXT_FILTERS = {
+    "player_name": ["player_name"],
+    "format": ["format"],
+    "tournament": ["tournament"],
+    "tournament+season": ["tournament", "season"]
+}
+
+def sorts_in_memory(explained: Dict[str, Any]) -> bool:
+    """Whether the winning plan has a blocking SORT stage instead of reading an index in order"""
+    return any(stage["stage"] == "SORT" for stage in plan_stages(explained.get("queryPlanner", {}).get("winningPlan", {})))
+
+async def explain_text_filters() -> Dict[str, Optional[str]]:
+    """Index each exact / prefix text filter seeks on (see bounded_index_scan), None when it has to scan
+    
+    "player_name listing" is the default (exact) player filter in MATCH_PAGE_SORT order,
+    which also has to come off the index without an in-memory sort.
+    The filter values come from a stored record, so the plans are those of real queries.
+    """
+    sample = await db.matches.find_one({}) or {}
+    plans = {}
+    for name, fields in INDEXED_TEXT_FILTERS.items():
+        for match in ("exact", "prefix"):
+            query = {}
+            for field in fields:
+                query.update(text_filter(field, sample.get(field) or "a", match))
+            explained = await db.matches.find(query).explain()
+            plans[f"{name} {match}"] = bounded_index_scan(explained, [KEYWORD_FIELDS[field] for field in fields])
+    
+    explained = await db.matches.find(text_filter("player_name", sample.get("player_name") or "a")).sort(MATCH_PAGE_SORT).explain()
+    plans["player_name listing"] = None if sorts_in_memory(explained) else bounded_index_scan(explained, ["player_key"])
+    return plans
+
+async def backfill_keyword_fields() -> int:
+    """Write the keyword fields of records stored before they existed"""
+    operations = []
+    updated = 0
+    async for doc in db.matches.find({"player_key": {"$exists": False}}, {field: 1 for field in KEYWORD_FIELDS}):
+        operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": keyword_fields(doc)}))
+        if len(operations) >= INSERT_BATCH_SIZE:
+            updated += (await db.matches.bulk_write(operations, ordered=False)).modified_count
+            operations = []
+    if operations:
+        updated += (await db.matches.bulk_write(operations, ordered=False)).modified_count
+    if updated:
+        logging.info(f"Backfilled keyword fields of {updated} match records")
+    return updated
+
+def squad_registry_key(team: str, person_id: str) -> str:
+    return f"{team}:{person_id}"
+
+async def load_squad_person_ids() -> int:
+    """Load the squads' registry IDs from db.squad_registry into the resolvers and prefilter"""
+    person_ids = defaultdict(dict)
+    async for doc in db.squad_registry.find({}):
+        person_ids[doc['team']][doc['person_id']] = doc['player_name']
+    set_squad_person_ids(person_ids)
+    return sum(len(resolver.person_ids) for resolver in squad_resolvers.values())
+
+async def learn_squad_person_ids() -> int:
+    """Record registry IDs of squad players seen on their squad team's own rosters
+    
+    Only roster entries of the squad's team are trusted, so a namesake on the other side
+    never binds. Existing entries (including manual pins) are left alone. Returns the
+    number of newly learned IDs.
+    """
+    learned = 0
+    now = datetime.utcnow()
+    for team in squad_resolvers:
         pipeline = [
-            {
-                "$group": {
-                    "_id": {
-                        "match_id": "$match_id",
-                        "player_name": "$player_name"
-                    },
-                    "doc_ids": {"$push": "$_id"},
-                    "count": {"$sum": 1}
-                }
-            },
-            {
-                "$match": {
-                    "count": {"$gt": 1}
-                }
-            }
+            {"$match": {"team": team, "player_team": team, "player_id": {"$ne": None}}},
+            {"$group": {"_id": "$player_id", "player_name": {"$first": "$player_name"}}}
         ]
+        async for doc in db.matches.aggregate(pipeline):
+            result = await db.squad_registry.update_one(
+                {"_id": squad_registry_key(team, doc['_id'])},
+                {"$setOnInsert": {
+                    "team": team, "person_id": doc['_id'], "player_name": doc['player_name'],
+                    "source": "learned", "updated_at": now
+                }},
+                upsert=True
+            )
+            if result.upserted_id is not None:
+                learned += 1
+    await load_squad_person_ids()
+    return learned
+
+def get_process_pool(workers: int) -> ProcessPoolExecutor:
+    """Lazily create the shared process pool used for parallel match parsing
+    
+    It is first needed from a parse thread of the running server, so workers are started
+    by a forkserver (spawn where there is none) rather than by forking this multi-threaded
+    process. Their entry point, _process_match_chunk, lives in match_parser, which is all
+    they import.
+    """
+    global _process_pool, _process_pool_workers
+    if _process_pool is None or _process_pool_workers != workers:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=True)
+        start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        _process_pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(start_method))
+        _process_pool_workers = workers
+    return _process_pool
+
+def _iter_chunks(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def iter_match_records(
+    json_files: Iterable[Any],
+    workers: Optional[int] = None,
+    summaries: Optional[Dict[str, Dict]] = None,
+    on_processed: Optional[Callable[[Optional[str]], None]] = None
+) -> Iterator[List[Dict]]:
+    """Yield the MI player records of each match as it is processed
+    
+    Accepts any iterable of match dicts or raw JSON bytes, so a generator can feed matches
+    one at a time. With workers > 1 matches are fanned out to a process pool in chunks of
+    PARSE_CHUNK_SIZE and merged back in input order. When summaries (a dict or SummaryWriter) is given, the match
+    summary of every keyed item is stored in it under its member key (for ArchiveCache).
+    on_processed is called with the member key of each item, in input order, just before
+    its records (if any) are yielded - sync checkpoints use it as a watermark.
+    """
+    if workers is None:
+        workers = SYNC_WORKERS
+    
+    processed_matches = set()  # Track unique matches to avoid duplicates
+    files_seen = 0
+    records_seen = 0
+    
+    logging.info(f"Starting comprehensive analysis of JSON files with {workers} worker(s)...")
+    
+    def keep_summary(member_key, summary):
+        if summaries is not None and member_key is not None:
+            summaries[member_key] = summary
+    
+    if workers <= 1:
+        for idx, item in enumerate(json_files):
+            files_seen += 1
+            try:
+                if idx % 100 == 0:
+                    logging.info(f"Processing file {idx+1}")
+                
+                _, records, member_key, summary = _process_item(item, idx, processed_matches)
+                keep_summary(member_key, summary)
+                
+            except Exception as e:
+                logging.error(f"Error processing JSON file {idx}: {e}")
+                continue
+            
+            if on_processed is not None:
+                on_processed(member_key)
+            if records:
+                records_seen += len(records)
+                yield records
+    else:
+        pool = get_process_pool(workers)
+        pending = deque()
+        
+        def merge(future):
+            # Chunks are merged in submission order, so output is deterministic
+            for unique_match_id, records, member_key, summary in future.result():
+                keep_summary(member_key, summary)
+                if on_processed is not None:
+                    on_processed(member_key)
+                if unique_match_id in processed_matches:
+                    continue
+                processed_matches.add(unique_match_id)
+                if records:
+                    yield records
+        
+        for chunk in _iter_chunks(json_files, PARSE_CHUNK_SIZE):
+            pending.append(pool.submit(_process_match_chunk, chunk, files_seen, squad_person_ids()))
+            files_seen += len(chunk)
+            
+            # Bound the number of in-flight chunks so memory stays flat
+            if len(pending) >= workers * 2:
+                for records in merge(pending.popleft()):
+                    records_seen += len(records)
+                    yield records
+        
+        while pending:
+            for records in merge(pending.popleft()):
+                records_seen += len(records)
+                yield records
+    
+    logging.info(f"Comprehensive analysis completed: {records_seen} match records extracted from {files_seen} files")
+
+def process_cricket_data(
+    json_files: Iterable[Any],
+    workers: Optional[int] = None,
+    summaries: Optional[Dict[str, Dict]] = None
+) -> List[Dict]:
+    """Comprehensive cricket data processing - extract ALL datapoints for MI players across ALL formats
+    
+    List-returning wrapper around iter_match_records.
+    """
+    all_matches = []
+    for records in iter_match_records(json_files, workers, summaries):
+        all_matches.extend(records)
+    return all_matches
+
+
+def get_http_session() -> requests.Session:
+    """Shared session with a connection pool sized for concurrent archive downloads"""
+    global _http_session
+    if _http_session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=SYNC_DOWNLOAD_CONCURRENCY, pool_maxsize=SYNC_DOWNLOAD_CONCURRENCY)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        _http_session = session
+    return _http_session
+
+def download_archive(url: str, validators: Optional[Dict[str, str]] = None) -> Tuple[int, Optional[tempfile.SpooledTemporaryFile], Dict[str, str]]:
+    """Stream a Cricsheet archive into a spooled temp file (kept in memory up to SPOOL_MAX_MEMORY, then on disk)
+    
+    When validators (etag / last_modified from a previous sync) are given the request is
+    conditional, and an unchanged archive comes back as (304, None, validators).
+    """
+    headers = {}
+    if validators:
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+    
+    with get_http_session().get(url, headers=headers, stream=True, timeout=600) as response:  # 10 minute timeout for large files
+        if response.status_code == 304:
+            logging.info(f"Archive not modified since last sync: {url}")
+            return 304, None, validators
         
-        duplicates = await db.matches.aggregate(pipeline).to_list(1000)
-        duplicate_removals = 0
+        if response.status_code != 200:
+            logging.warning(f"Failed to download {url}: {response.status_code}")
+            return response.status_code, None, {}
         
-        for duplicate_group in duplicates:
-            # Keep the first document, remove the rest
-            docs_to_remove = duplicate_group["doc_ids"][1:]  # Skip first, remove rest
-            if docs_to_remove:
-                result = await db.matches.delete_many({"_id": {"$in": docs_to_remove}})
-                duplicate_removals += result.deleted_count
-                logging.info(f"Removed {result.deleted_count} duplicate records for match {duplicate_group['_id']['match_id']} - player {duplicate_group['_id']['player_name']}")
+        new_validators = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified')
+        }
         
-        logging.info(f"Cleanup completed: {updated_count} names standardized, {duplicate_removals} duplicates removed")
-        return updated_count + duplicate_removals
+        archive = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+        try:
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                if chunk:
+                    archive.write(chunk)
+        except Exception:
+            archive.close()
+            raise
         
-    except Exception as e:
-        logging.error(f"Error during cleanup: {e}")
-        raise e
+        archive.seek(0)
+        return 200, archive, new_validators
+
+class ArchiveCache:
+    """Content-addressed on-disk cache of Cricsheet archives and parsed match summaries
+    
+    Layout under root:
+        archives/<sha256>.zip        - downloaded archive, keyed by content hash
+        summaries/<sha256>.msgpack   - the match summaries of that archive, one msgpack object each
+        summaries/<sha256>.index     - {member_key: (offset, length)} of those summaries
+        index.json                   - archive URL -> current content hash
+    
+    Summaries are squad-independent (see summarize_match), so a change to the squad
+    config can be re-derived from the cache without network access. They are written and
+    looked up one member at a time (SummaryWriter / CachedSummaries), so only the offset
+    index of an archive is held in memory.
+    """
+    
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.archive_dir = self.root / "archives"
+        self.summary_dir = self.root / "summaries"
+        self.index_path = self.root / "index.json"
+        self._lock = threading.Lock()
+    
+    def _read_index(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.index_path) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+    
+    def _write_index(self, index: Dict[str, Dict[str, Any]]):
+        tmp_path = self.index_path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(index, f, indent=1)
+        os.replace(tmp_path, self.index_path)
+    
+    def urls(self) -> List[str]:
+        return list(self._read_index())
+    
+    def archive_path(self, sha: str) -> Path:
+        return self.archive_dir / f"{sha}.zip"
+    
+    def summary_path(self, sha: str) -> Path:
+        return self.summary_dir / f"{sha}.msgpack"
+    
+    def summary_index_path(self, sha: str) -> Path:
+        return self.summary_dir / f"{sha}.index"
+    
+    def store_archive(self, url: str, archive) -> Tuple[str, Optional[str]]:
+        """Copy a downloaded archive into the cache, hashing it on the way
+        
+        Returns (sha, previous_sha) where previous_sha is the hash last cached for url.
+        The archive is rewound afterwards so it can still be parsed.
+        """
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        fd, tmp_name = tempfile.mkstemp(dir=self.archive_dir, suffix='.part')
+        try:
+            with os.fdopen(fd, 'wb') as out:
+                archive.seek(0)
+                for chunk in iter(lambda: archive.read(DOWNLOAD_CHUNK_SIZE), b''):
+                    digest.update(chunk)
+                    out.write(chunk)
+            sha = digest.hexdigest()
+            if self.archive_path(sha).exists():
+                os.remove(tmp_name)
+            else:
+                os.replace(tmp_name, self.archive_path(sha))
+        except Exception:
+            if os.path.exists(tmp_name):
+                os.remove(tmp_name)
+            raise
+        finally:
+            archive.seek(0)
+        
+        with self._lock:
+            index = self._read_index()
+            previous_sha = index.get(url, {}).get('sha')
+            index[url] = {'sha': sha, 'cached_at': datetime.utcnow().isoformat()}
+            self._write_index(index)
+        return sha, previous_sha
+    
+    def open_archive(self, url: str) -> Tuple[Optional[str], Optional[Any]]:
+        """Open the cached copy of an archive - (sha, file) or (None, None) when not cached"""
+        sha = self._read_index().get(url, {}).get('sha')
+        if sha is None or not self.archive_path(sha).exists():
+            return None, None
+        return sha, open(self.archive_path(sha), 'rb')
+    
+    def open_summaries(self, sha: str, previous_sha: Optional[str] = None) -> 'CachedSummaries':
+        """Open the match summaries cached for an archive
+        
+        Summaries of an earlier version of the same archive are included - member keys
+        carry the member's CRC, so only unchanged matches are reused.
+        """
+        candidates = [candidate for candidate in dict.fromkeys((previous_sha, sha)) if candidate]
+        return CachedSummaries([(self.summary_path(sha), self.summary_index_path(sha)) for sha in candidates])
+    
+    def summary_writer(self, sha: str) -> 'SummaryWriter':
+        self.summary_dir.mkdir(parents=True, exist_ok=True)
+        return SummaryWriter(self.summary_path(sha), self.summary_index_path(sha))
+    
+    def prune(self) -> int:
+        """Delete cached archives and summaries no longer referenced by the index"""
+        with self._lock:
+            live = {entry.get('sha') for entry in self._read_index().values()}
+        removed = 0
+        for directory in (self.archive_dir, self.summary_dir):
+            if not directory.exists():
+                continue
+            for path in directory.iterdir():
+                if path.stem not in live and path.suffix != '.part':
+                    path.unlink()
+                    removed += 1
+        return removed
+    
+    def clear(self):
+        with self._lock:
+            shutil.rmtree(self.root, ignore_errors=True)
+
+class CachedSummaries:
+    """Read-only view of cached match summaries - each get reads one summary from disk
+    
+    Files are (data, index) pairs as written by SummaryWriter; later pairs win for member
+    keys they share. Unreadable or incomplete pairs are skipped.
+    """
+    
+    def __init__(self, paths: List[Tuple[Path, Path]]):
+        self._files = []
+        self._locations: Dict[str, Tuple[int, int, int]] = {}  # member_key -> (file, offset, length)
+        for data_path, index_path in paths:
+            try:
+                with open(index_path, 'rb') as f:
+                    index = msgpack.unpack(f, raw=False)
+                data_file = open(data_path, 'rb')
+            except FileNotFoundError:
+                continue
+            except Exception as e:
+                logging.warning(f"Ignoring unreadable summary cache {data_path.stem}: {e}")
+                continue
+            file_number = len(self._files)
+            self._files.append(data_file)
+            for member_key, (offset, length) in index.items():
+                self._locations[member_key] = (file_number, offset, length)
+    
+    def __contains__(self, member_key: str) -> bool:
+        return member_key in self._locations
+    
+    def get(self, member_key: str) -> Optional[Dict]:
+        location = self._locations.get(member_key)
+        if location is None:
+            return None
+        file_number, offset, length = location
+        data_file = self._files[file_number]
+        try:
+            data_file.seek(offset)
+            return msgpack.unpackb(data_file.read(length), raw=False)
+        except Exception as e:
+            logging.warning(f"Ignoring unreadable cached summary {member_key}: {e}")
+            return None
+    
+    def close(self):
+        for data_file in self._files:
+            data_file.close()
+        self._files = []
+        self._locations = {}
+
+class SummaryWriter:
+    """Streams the match summaries of one archive to disk as they are parsed
+    
+    Summaries are appended to a .part file as they are stored; commit writes the offset
+    index and moves both into place, discard throws them away.
+    """
+    
+    def __init__(self, data_path: Path, index_path: Path):
+        self.data_path = data_path
+        self.index_path = index_path
+        self._tmp_data_path = data_path.with_name(data_path.name + '.part')
+        self._tmp_index_path = index_path.with_name(index_path.name + '.part')
+        self._file = open(self._tmp_data_path, 'wb')
+        self._index: Dict[str, Tuple[int, int]] = {}
+    
+    def __contains__(self, member_key: str) -> bool:
+        return member_key in self._index
+    
+    def __setitem__(self, member_key: str, summary: Dict):
+        data = msgpack.packb(summary, use_bin_type=True)
+        self._index[member_key] = (self._file.tell(), len(data))
+        self._file.write(data)
+    
+    def commit(self):
+        self._file.close()
+        with open(self._tmp_index_path, 'wb') as f:
+            msgpack.pack(self._index, f, use_bin_type=True)
+        # Without its index a data file is ignored, so never pair the new data with the old index
+        if self.index_path.exists():
+            self.index_path.unlink()
+        os.replace(self._tmp_data_path, self.data_path)
+        os.replace(self._tmp_index_path, self.index_path)
+    
+    def discard(self):
+        self._file.close()
+        for path in (self._tmp_data_path, self._tmp_index_path):
+            if path.exists():
+                path.unlink()
+
+archive_cache = ArchiveCache(CACHE_DIR) if CACHE_ENABLED else None
+
+def _member_key(info: zipfile.ZipInfo) -> str:
+    """Cache key for a ZIP member - file name plus CRC and size, so edited matches miss"""
+    return f"{os.path.basename(info.filename)}:{info.CRC:08x}:{info.file_size}"
+
+def _member_file_name(member_key: str) -> str:
+    return member_key.rsplit(':', 2)[0]
+
+def iter_archive_members(
+    archive,
+    source: str = "",
+    counters: Optional[Dict[str, int]] = None,
+    skip_files: Optional[set] = None,
+    cancel_event: Optional[threading.Event] = None,
+    cached_summaries: Optional[CachedSummaries] = None,
+    seen_files: Optional[set] = None,
+    resume_after: Optional[str] = None
+) -> Iterator[Tuple[str, Any]]:
+    """Yield (member_key, raw JSON) for the members of a ZIP archive one at a time
+    
+    Decoding is left to process_cricket_data so it can happen inside pool workers.
+    Members whose file name is in skip_files (already ingested) are not read at all.
+    Members found in cached_summaries are yielded as their cached summary without being
+    read. Members whose file name is already in seen_files (the same match in an
+    overlapping archive earlier in the sync) are skipped. The caller adds the names of yielded members to seen_files
+    once their records are safely written, so a member that fails doesn't hide its copy in
+    a later archive. With PREFILTER_MATCHES on, members that cannot involve the squad are
+    not yielded (and are added to seen_files right away).
+    resume_after is the member key a checkpointed sync last committed in this archive; it
+    and every member before it are counted as files_resumed and not read again (ignored
+    if the archive no longer has that member).
+    Setting cancel_event stops the iteration at the next member.
+    """
+    if counters is None:
+        counters = {}
+    
+    with zipfile.ZipFile(archive) as zip_file:
+        # Process ALL JSON files - NO LIMIT
+        json_files = [info for info in zip_file.infolist() if info.filename.endswith('.json')]
+        logging.info(f"Found {len(json_files)} JSON files in {source}")
+        
+        if resume_after is not None:
+            member_keys = [_member_key(info) for info in json_files]
+            if resume_after in member_keys:
+                resumed = json_files[:member_keys.index(resume_after) + 1]
+                json_files = json_files[len(resumed):]
+                counters['files_resumed'] = counters.get('files_resumed', 0) + len(resumed)
+                # Committed by the interrupted run - but kept out of the ingested manifest, as
+                # which of them were prefiltered or failed to decode there isn't known
+                if seen_files is not None:
+                    seen_files.update(os.path.basename(info.filename) for info in resumed)
+                logging.info(f"Resuming {source} after {len(resumed)} committed members")
+            else:
+                logging.warning(f"Checkpointed member {resume_after} is no longer in {source}; parsing it in full")
+        
+        for json_file in json_files:
+            if cancel_event is not None and cancel_event.is_set():
+                logging.info(f"Stopped reading {source}: sync cancelled")
+                break
+            
+            file_name = os.path.basename(json_file.filename)
+            if skip_files is not None and file_name in skip_files:
+                counters['files_skipped'] = counters.get('files_skipped', 0) + 1
+                continue
+            
+            # Cricsheet file names are match IDs, shared by every archive a match appears in
+            if seen_files is not None and file_name in seen_files:
+                counters['files_duplicate'] = counters.get('files_duplicate', 0) + 1
+                continue
+            
+            member_key = _member_key(json_file)
+            summary = cached_summaries.get(member_key) if cached_summaries is not None else None
+            if summary is not None and (
+                summary.get('summary_version') != SUMMARY_VERSION or (BALL_BY_BALL and 'balls' not in summary)
+            ):
+                summary = None  # stale layout, or cached before ball-by-ball mode was switched on
+            raw_match = None
+            if summary is None:
+                try:
+                    with zip_file.open(json_file) as file:
+                        raw_match = file.read()
+                except Exception as e:
+                    logging.error(f"Error processing {json_file.filename}: {e}")
+                    continue
+            
+            counters['files_processed'] = counters.get('files_processed', 0) + 1
+            
+            # Log progress every 500 files
+            if counters['files_processed'] % 500 == 0:
+                logging.info(f"Processed {counters['files_processed']} JSON files so far...")
+            
+            if summary is not None:
+                counters['files_from_cache'] = counters.get('files_from_cache', 0) + 1
+                yield member_key, summary
+                continue
+            
+            if PREFILTER_MATCHES and not may_involve_squad(raw_match):
+                counters['files_prefiltered'] = counters.get('files_prefiltered', 0) + 1
+                if seen_files is not None:
+                    seen_files.add(file_name)
+                continue
+            
+            yield member_key, raw_match
+
+def parse_archive(
+    archive,
+    source: str,
+    counters: Dict[str, int],
+    skip_files: Optional[set],
+    emit: Callable[[List[Dict], Optional[str]], None],
+    cancel_event: Optional[threading.Event] = None,
+    archive_sha: Optional[str] = None,
+    seen_files: Optional[set] = None,
+    resume_after: Optional[str] = None,
+    processed_files: Optional[set] = None
+) -> int:
+    """Blocking archive parse - run through asyncio.to_thread so the event loop stays free
+    
+    Records are handed to emit in batches of INSERT_BATCH_SIZE as matches are parsed, so
+    the caller can write them while the rest of the archive is still being read. Returns
+    the number of records emitted.
+    
+    Each batch comes with the member key of the last match it covers, a checkpoint the
+    caller can commit once the batch is written and later pass back as resume_after.
+    After CHECKPOINT_INTERVAL matches without a full batch, the partial (possibly empty)
+    batch is emitted anyway so the checkpoint keeps moving through squad-free stretches.
+    
+    Members already in seen_files are skipped (see iter_archive_members). The names of the
+    members whose summary was produced here are added to processed_files. Once their records
+    are written, the caller moves them into seen_files and the ingested manifest. Prefiltered
+    members and members that fail to decode are not added, so later syncs read them again.
+    
+    With the archive cache enabled, a freshly downloaded archive is stored first (pass
+    archive_sha when parsing an already-cached copy), cached match summaries are reused
+    and the summaries of this parse are streamed back to the cache as they are made.
+    """
+    # Matches are read one at a time from the spooled archive and
+    # decoded by iter_match_records (in pool workers when SYNC_WORKERS > 1)
+    with archive:
+        previous_sha = None
+        cached_summaries = None
+        summaries = None
+        if archive_cache is not None:
+            if archive_sha is None:
+                archive_sha, previous_sha = archive_cache.store_archive(source, archive)
+            cached_summaries = archive_cache.open_summaries(archive_sha, previous_sha)
+            summaries = archive_cache.summary_writer(archive_sha)
+        
+        total_records = 0
+        batch = []
+        last_member = None
+        members_since_emit = 0
+        
+        def flush():
+            nonlocal total_records, batch, members_since_emit
+            total_records += len(batch)
+            emit(batch, last_member)
+            batch = []
+            members_since_emit = 0
+        
+        def member_processed(member_key):
+            # Called before the member's records arrive, so a flush here only covers earlier members
+            nonlocal last_member, members_since_emit
+            if members_since_emit >= CHECKPOINT_INTERVAL:
+                flush()
+            last_member = member_key
+            members_since_emit += 1
+            if processed_files is not None:
+                processed_files.add(_member_file_name(member_key))
+        
+        try:
+            for records in iter_match_records(
+                iter_archive_members(
+                    archive, source, counters, skip_files=skip_files, cancel_event=cancel_event, cached_summaries=cached_summaries, seen_files=seen_files,
+                    resume_after=resume_after
+                ),
+                summaries=summaries,
+                on_processed=member_processed
+            ):
+                batch.extend(records)
+                if len(batch) >= INSERT_BATCH_SIZE:
+                    flush()
+            if batch:
+                flush()
+            
+            if archive_cache is not None and (cancel_event is None or not cancel_event.is_set()):
+                # Keep summaries of members skipped this time (already ingested) that are still in the archive
+                archive.seek(0)
+                with zipfile.ZipFile(archive) as zip_file:
+                    for info in zip_file.infolist():
+                        member_key = _member_key(info)
+                        if member_key not in summaries and member_key in cached_summaries:
+                            summary = cached_summaries.get(member_key)
+                            if summary is not None:
+                                summaries[member_key] = summary
+                summaries.commit()
+                if previous_sha and previous_sha != archive_sha:
+                    archive_cache.prune()
+        finally:
+            if summaries is not None:
+                summaries.discard()
+            if cached_summaries is not None:
+                cached_summaries.close()
+        return total_records
+
+async def load_archive_validators() -> Dict[str, Dict[str, str]]:
+    """Load the ETag / Last-Modified recorded for each archive by previous syncs"""
+    validators = {}
+    async for doc in db.archive_state.find({}):
+        validators[doc['_id']] = {'etag': doc.get('etag'), 'last_modified': doc.get('last_modified')}
+    return validators
+
+async def save_archive_validators(url: str, validators: Dict[str, str]):
+    await db.archive_state.replace_one(
+        {"_id": url},
+        {"_id": url, **validators, "checked_at": datetime.utcnow()},
+        upsert=True
+    )
+
+async def load_ingested_files() -> set:
+    """Load the manifest of Cricsheet member files that have already been ingested"""
+    return {doc['_id'] async for doc in db.ingested_files.find({}, {"_id": 1})}
+
+async def save_ingested_files(archive_name: str, file_names: List[str]):
+    """Record member files as ingested (idempotent - existing entries are left alone)"""
+    now = datetime.utcnow()
+    for start in range(0, len(file_names), INSERT_BATCH_SIZE):
+        operations = [
+            UpdateOne({"_id": name}, {"$setOnInsert": {"archive": archive_name, "ingested_at": now}}, upsert=True)
+            for name in file_names[start:start + INSERT_BATCH_SIZE]
+        ]
+        await db.ingested_files.bulk_write(operations, ordered=False)
+
+async def start_sync_checkpoint(checkpoint_id: str, params: Dict[str, Any]):
+    """Open the checkpoint of a fresh sync - it supersedes any interrupted one"""
+    now = datetime.utcnow()
+    await db.sync_checkpoints.delete_many({"_id": {"$ne": checkpoint_id}})
+    await db.sync_checkpoints.replace_one(
+        {"_id": checkpoint_id},
+        {
+            "_id": checkpoint_id, "job_id": checkpoint_id, "params": params, "status": "running",
+            "completed_archives": [], "current_archive": None, "current_member": None,
+            "started_at": now, "updated_at": now
+        },
+        upsert=True
+    )
+
+async def load_sync_checkpoint() -> Optional[Dict[str, Any]]:
+    """Load the checkpoint of the last sync if it did not complete"""
+    return await db.sync_checkpoints.find_one({"status": {"$ne": "completed"}}, sort=[("started_at", -1)])
+
+async def update_sync_checkpoint(checkpoint_id: str, completed_archive: Optional[str] = None, **fields):
+    """Commit sync progress - fields are $set, completed_archive is added to completed_archives"""
+    update = {"$set": {**fields, "updated_at": datetime.utcnow()}}
+    if completed_archive is not None:
+        update["$addToSet"] = {"completed_archives": completed_archive}
+    await db.sync_checkpoints.update_one({"_id": checkpoint_id}, update)
+
+async def save_match_records(
+    records: List[Dict],
+    batch_size: int = INSERT_BATCH_SIZE,
+    touched_players: Optional[set] = None,
+    corrected: bool = False
+) -> Dict[str, int]:
+    """Upsert processed match records on (match_id, team, player_name) in fixed-size unordered chunks
+    
+    Re-syncing the same matches updates records in place instead of duplicating them.
+    The correction rules are applied first (unless the caller already did - corrected=True),
+    so records they drop are never written.
+    The (team, player_name) pairs written are added to touched_players (for refresh_player_stats).
+    Returns the inserted / updated / unchanged totals.
+    """
+    if not corrected:
+        records = correction_rules.apply(records)
+    if touched_players is not None:
+        touched_players.update((record['team'], record['player_name']) for record in records)
+    totals = {'inserted': 0, 'updated': 0, 'unchanged': 0}
+    for start in range(0, len(records), batch_size):
+        operations = []
+        for record in records[start:start + batch_size]:
+            document = MatchData(**record).dict()
+            document.update(keyword_fields(document))
+            # id / created_at belong to the first write only
+            on_insert = {'id': document.pop('id'), 'created_at': document.pop('created_at')}
+            operations.append(UpdateOne(
+                {'match_id': document['match_id'], 'team': document['team'], 'player_name': document['player_name']},
+                {'$set': document, '$setOnInsert': on_insert},
+                upsert=True
+            ))
+        
+        result = await db.matches.bulk_write(operations, ordered=False)
+        chunk_counts = {
+            'inserted': result.upserted_count,
+            'updated': result.modified_count,
+            'unchanged': result.matched_count - result.modified_count
+        }
+        logging.info(f"Upserted chunk of {len(operations)} records: {chunk_counts}")
+        for key, value in chunk_counts.items():
+            totals[key] += value
+    return totals
+
+def player_analytics_stages() -> List[Dict[str, Any]]:
+    """Aggregation stages folding match records into one document per squad player, most recently active first
+    
+    best_figures and recent_form use $topN, so no stage holds more than a player's top
+    few innings; shape the output with player_analytics_from_group.
+    """
+    has_batting = {"$eq": [{"$type": "$batting_stats"}, "object"]}
+    has_bowling = {"$eq": [{"$type": "$bowling_stats"}, "object"]}
+    
+    def stat(field: str) -> Dict[str, Any]:
+        return {"$ifNull": [f"${field}", 0]}
+    
+    def count_if(*conditions) -> Dict[str, Any]:
+        return {"$sum": {"$cond": [{"$and": list(conditions)}, 1, 0]}}
+    
+    return [
+        {
+            "$project": {
+                "team": 1,
+                "player_name": 1,
+                "date": {"$ifNull": ["$date", ""]},
+                "format": {"$ifNull": ["$format", "Unknown"]},
+                "tournament": {"$ifNull": ["$tournament", "Unknown"]},
+                "season": {"$ifNull": ["$season", "Unknown"]},
+                "venue": {"$ifNull": ["$venue", "Unknown"]},
+                "has_batting": has_batting,
+                "runs": stat("batting_stats.runs"),
+                "balls": stat("batting_stats.balls"),
+                "fours": stat("batting_stats.fours"),
+                "sixes": stat("batting_stats.sixes"),
+                "batting_dots": stat("batting_stats.dots"),
+                "has_bowling": has_bowling,
+                "runs_conceded": stat("bowling_stats.runs_conceded"),
+                "balls_bowled": stat("bowling_stats.balls_bowled"),
+                "wickets": stat("bowling_stats.wickets"),
+                "bowling_dots": stat("bowling_stats.dots"),
+                # A 0/0 spell never holds on to best figures (see best_figures below)
+                "zero_zero": {"$and": [
+                    {"$eq": [stat("bowling_stats.wickets"), 0]}, {"$eq": [stat("bowling_stats.runs_conceded"), 0]}
+                ]},
+                "catches": stat("fielding_stats.catches"),
+                "run_outs": stat("fielding_stats.run_outs"),
+                "stumpings": stat("fielding_stats.stumpings"),
+                "other_fielding": stat("fielding_stats.other_fielding"),
+                "total_dismissals": stat("fielding_stats.total_dismissals"),
+                "form": {
+                    "date": "$date",
+                    "tournament": "$tournament",
+                    "batting_runs": {"$cond": [has_batting, stat("batting_stats.runs"), None]},
+                    "bowling_wickets": {"$cond": [has_bowling, stat("bowling_stats.wickets"), None]},
+                    "match_result": "$match_result"
+                }
+            }
+        },
+        {
+            "$group": {
+                "_id": {"team": "$team", "player_name": "$player_name"},
+                "total_matches": {"$sum": 1},
+                "first_date": {"$min": "$date"},
+                "last_date": {"$max": "$date"},
+                "formats": {"$addToSet": "$format"},
+                "tournaments": {"$addToSet": "$tournament"},
+                "seasons": {"$addToSet": "$season"},
+                "venues": {"$addToSet": "$venue"},
+                "batting_innings": count_if("$has_batting"),
+                "runs": {"$sum": "$runs"},
+                "balls": {"$sum": "$balls"},
+                "fours": {"$sum": "$fours"},
+                "sixes": {"$sum": "$sixes"},
+                "batting_dots": {"$sum": "$batting_dots"},
+                "highest_score": {"$max": "$runs"},
+                "ducks": count_if("$has_batting", {"$eq": ["$runs", 0]}, {"$gt": ["$balls", 0]}),
+                "centuries": count_if("$has_batting", {"$gte": ["$runs", 100]}),
+                "half_centuries": count_if("$has_batting", {"$gte": ["$runs", 50]}, {"$lt": ["$runs", 100]}),
+                "bowling_innings": count_if("$has_bowling"),
+                "runs_conceded": {"$sum": "$runs_conceded"},
+                "balls_bowled": {"$sum": "$balls_bowled"},
+                "wickets": {"$sum": "$wickets"},
+                "bowling_dots": {"$sum": "$bowling_dots"},
+                "five_wickets": count_if("$has_bowling", {"$gte": ["$wickets", 5]}),
+                "four_wickets": count_if("$has_bowling", {"$gte": ["$wickets", 4]}, {"$lt": ["$wickets", 5]}),
+                # Most wickets, the most recent spell on ties
+                "best_figures": {"$topN": {
+                    "n": 1,
+                    "sortBy": {"has_bowling": -1, "wickets": -1, "zero_zero": 1, "date": -1},
+                    "output": ["$has_bowling", "$wickets", "$runs_conceded"]
+                }},
+                "catches": {"$sum": "$catches"},
+                "run_outs": {"$sum": "$run_outs"},
+                "stumpings": {"$sum": "$stumpings"},
+                "other_fielding": {"$sum": "$other_fielding"},
+                "total_dismissals": {"$sum": "$total_dismissals"},
+                # Last 5 matches performance
+                "recent_form": {"$topN": {"n": 5, "sortBy": {"date": -1}, "output": "$form"}}
+            }
+        },
+        {"$sort": {"last_date": -1, "_id.team": 1, "_id.player_name": 1}}
+    ]
+
+def player_analytics_from_group(group: Dict[str, Any]) -> Dict[str, Any]:
+    """Shape a player document from player_analytics_stages like the /api/analytics player entries"""
+    has_bowling, best_wickets, best_runs = group['best_figures'][0]
+    analytics = {
+        'player_name': group['_id']['player_name'],
+        'team': group['_id']['team'],
+        'total_matches': group['total_matches'],
+        'batting': {
+            'innings': group['batting_innings'],
+            'runs': group['runs'],
+            'balls': group['balls'],
+            'fours': group['fours'],
+            'sixes': group['sixes'],
+            'dots': group['batting_dots'],
+            'highest_score': group['highest_score'],
+            'not_outs': 0,
+            'centuries': group['centuries'],
+            'half_centuries': group['half_centuries'],
+            'ducks': group['ducks']
+        },
+        'bowling': {
+            'innings': group['bowling_innings'],
+            'runs_conceded': group['runs_conceded'],
+            'balls_bowled': group['balls_bowled'],
+            'wickets': group['wickets'],
+            'dots': group['bowling_dots'],
+            'best_figures': f"{best_wickets}/{best_runs}" if has_bowling else '0/0',
+            'five_wickets': group['five_wickets'],
+            'four_wickets': group['four_wickets']
+        },
+        'fielding': {
+            'catches': group['catches'],
+            'run_outs': group['run_outs'],
+            'stumpings': group['stumpings'],
+            'other_fielding': group['other_fielding'],
+            'total_dismissals': group['total_dismissals']
+        },
+        'formats': group['formats'],
+        'tournaments': group['tournaments'],
+        'seasons': group['seasons'],
+        'venues': group['venues'],
+        'recent_form': [
+            {key: form.get(key) for key in ('date', 'tournament', 'batting_runs', 'bowling_wickets', 'match_result')}
+            for form in group['recent_form']
+        ]
+    }
+    finalize_player_analytics(analytics)
+    return analytics
+
+async def aggregate_player_analytics(query: Dict[str, Any]) -> Dict[str, Any]:
+    """Compute the /api/analytics response for the records matching query in one aggregation
+    
+    A $facet runs the per-player stages and the summary over the same $match, so the
+    result is complete for any number of records and nothing is iterated in Python
+    beyond one document per player.
+    """
+    pipeline = [
+        {"$match": query},
+        {
+            "$facet": {
+                "players": player_analytics_stages(),
+                "summary": [{
+                    "$group": {
+                        "_id": None,
+                        "total_matches": {"$sum": 1},
+                        "formats": {"$addToSet": {"$ifNull": ["$format", "Unknown"]}},
+                        "tournaments": {"$addToSet": {"$ifNull": ["$tournament", "Unknown"]}},
+                        "from": {"$min": {"$ifNull": ["$date", ""]}},
+                        "to": {"$max": {"$ifNull": ["$date", ""]}}
+                    }
+                }]
+            }
+        }
+    ]
+    result = (await db.matches.aggregate(pipeline, allowDiskUse=True).to_list(1))[0]
+    if not result['summary']:
+        return {"players": [], "summary": {}}
+    
+    totals = result['summary'][0]
+    players = [player_analytics_from_group(group) for group in result['players']]
+    summary = {
+        'total_matches': totals['total_matches'],
+        'unique_players': len(players),
+        'formats_covered': len(totals['formats']),
+        'tournaments_covered': len(totals['tournaments']),
+        'date_range': {
+            'from': totals['from'],
+            'to': totals['to']
+        }
+    }
+    return {
+        'players': players,
+        'summary': summary
+    }
+
+def finalize_player_analytics(analytics: Dict[str, Any]):
+    """Convert the sets to lists and derive averages and rates, in place"""
+    # Convert sets to lists for JSON serialization
+    analytics['formats'] = list(analytics['formats'])
+    analytics['tournaments'] = list(analytics['tournaments'])
+    analytics['seasons'] = list(analytics['seasons'])
+    analytics['venues'] = list(analytics['venues'])
+    
+    # Batting averages
+    batting = analytics['batting']
+    if batting['innings'] > 0:
+        effective_innings = batting['innings'] - batting['not_outs']
+        batting['average'] = round(batting['runs'] / effective_innings, 2) if effective_innings > 0 else 0.0
+        batting['strike_rate'] = round((batting['runs'] / batting['balls']) * 100, 2) if batting['balls'] > 0 else 0.0
+        batting['boundary_percentage'] = round(((batting['fours'] + batting['sixes']) / batting['balls']) * 100, 2) if batting['balls'] > 0 else 0.0
+    else:
+        batting['average'] = 0.0
+        batting['strike_rate'] = 0.0
+        batting['boundary_percentage'] = 0.0
+    
+    # Bowling averages
+    bowling = analytics['bowling']
+    if bowling['innings'] > 0:
+        bowling['average'] = round(bowling['runs_conceded'] / bowling['wickets'], 2) if bowling['wickets'] > 0 else 0.0
+        bowling['economy'] = round((bowling['runs_conceded'] / (bowling['balls_bowled'] / 6)), 2) if bowling['balls_bowled'] > 0 else 0.0
+        bowling['strike_rate'] = round(bowling['balls_bowled'] / bowling['wickets'], 2) if bowling['wickets'] > 0 else 0.0
+        bowling['dot_ball_percentage'] = round((bowling['dots'] / bowling['balls_bowled']) * 100, 2) if bowling['balls_bowled'] > 0 else 0.0
+        bowling['overs'] = f"{bowling['balls_bowled'] // 6}.{bowling['balls_bowled'] % 6}"
+    else:
+        bowling['average'] = 0.0
+        bowling['economy'] = 0.0
+        bowling['strike_rate'] = 0.0
+        bowling['dot_ball_percentage'] = 0.0
+        bowling['overs'] = "0.0"
+
+def player_stats_key(team: str, player_name: str) -> str:
+    return f"{team}:{player_name}"
+
+async def refresh_player_stats(players: Optional[Iterable[Tuple[str, str]]] = None) -> int:
+    """Recompute the materialized player_stats documents of the given (team, player_name) pairs (all when None)
+    
+    Each document holds a squad player's career analytics as returned by unfiltered
+    /api/analytics for that squad, plus the dates of their first and last match, computed by
+    player_analytics_stages over the player's records in the squad. Players left without
+    records lose their document. Returns the number of players refreshed.
+    """
+    query = {}
+    if players is not None:
+        players = sorted(set(players))
+        if not players:
+            return 0
+        names_by_team = defaultdict(set)
+        for team, player_name in players:
+            names_by_team[team].add(keyword(player_name))
+        query = {"$or": [
+            {"team": team, "player_key": {"$in": sorted(names)}} for team, names in sorted(names_by_team.items())
+        ]}
+    
+    now = datetime.utcnow()
+    operations = []
+    refreshed = []
+    async for group in db.matches.aggregate([{"$match": query}, *player_analytics_stages()], allowDiskUse=True):
+        document = {
+            "_id": player_stats_key(group["_id"]["team"], group["_id"]["player_name"]),
+            **player_analytics_from_group(group),
+            'first_date': group['first_date'],
+            'last_date': group['last_date'],
+            'updated_at': now
+        }
+        operations.append(ReplaceOne({"_id": document["_id"]}, document, upsert=True))
+        refreshed.append(document["_id"])
+    
+    if operations:
+        await db.player_stats.bulk_write(operations, ordered=False)
+    
+    stale = {"_id": {"$nin": refreshed}}
+    if players is not None:
+        stale["_id"]["$in"] = [player_stats_key(team, player_name) for team, player_name in players]
+    await db.player_stats.delete_many(stale)
+    return len(operations)
+
+async def load_materialized_analytics(team: str) -> Optional[Dict[str, Any]]:
+    """Unfiltered /api/analytics response for a squad from player_stats - None until it has been built"""
+    players = []
+    formats, tournaments = set(), set()
+    first_dates, last_dates = [], []
+    total_matches = 0
+    async for doc in db.player_stats.find({"team": team}, {"_id": 0, "updated_at": 0}).sort("last_date", -1):
+        first_dates.append(doc.pop('first_date'))
+        last_dates.append(doc.pop('last_date'))
+        total_matches += doc['total_matches']
+        formats.update(doc['formats'])
+        tournaments.update(doc['tournaments'])
+        players.append(doc)
+    if not players:
+        return None
+    
+    summary = {
+        'total_matches': total_matches,
+        'unique_players': len(players),
+        'formats_covered': len(formats),
+        'tournaments_covered': len(tournaments),
+        'date_range': {
+            'from': min(first_dates),
+            'to': max(last_dates)
+        }
+    }
+    return {
+        'players': players,
+        'summary': summary
+    }
+
+def analytics_query(
+    team: Optional[str] = None,
+    player: Optional[str] = None,
+    format: Optional[str] = None,
+    tournament: Optional[str] = None,
+    season: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    match: str = "exact"
+) -> Dict[str, Any]:
+    """Match records query for the /api/analytics filters"""
+    query = {}
+    
+    if team:
+        query["team"] = team
+    if player:
+        query.update(text_filter("player_name", player, match))
+    if format:
+        query.update(text_filter("format", format, match))
+    if tournament:
+        query.update(text_filter("tournament", tournament, match))
+    if season:
+        query.update(text_filter("season", season, match))
+    
+    # Date filtering with improved date parsing
+    if date_from or date_to:
+        date_query = {}
+        if date_from:
+            date_query["$gte"] = date_from
+        if date_to:
+            date_query["$lte"] = date_to
+        query["date"] = date_query
+    
+    return query
+
+async def batch_player_analytics(
+    team: str,
+    player_names: List[str],
+    query: Dict[str, Any]
+) -> Dict[str, Optional[Dict[str, Any]]]:
+    """Analytics of each named player of a squad over the records matching query, keyed by the requested name
+    
+    Names compare case-insensitively (player_key). Without filters the analytics come from
+    player_stats; otherwise one aggregation over the players' records computes them all.
+    Players without matching records map to None.
+    """
+    by_key = {}
+    if not query:
+        stats_keys = [player_stats_key(team, name) for name in player_names]
+        async for doc in db.player_stats.find({"_id": {"$in": stats_keys}}, {"_id": 0, "first_date": 0, "last_date": 0, "updated_at": 0}):
+            by_key[keyword(doc['player_name'])] = doc
+    
+    # Names not served by player_stats (all of them when filtered) - one pass over their records
+    pending = sorted({keyword(name) for name in player_names} - set(by_key))
+    if pending:
+        pipeline = [{"$match": {**query, "team": team, "player_key": {"$in": pending}}}, *player_analytics_stages()]
+        async for group in db.matches.aggregate(pipeline, allowDiskUse=True):
+            analytics = player_analytics_from_group(group)
+            by_key[keyword(analytics['player_name'])] = analytics
+    
+    return {name: by_key.get(keyword(name)) for name in player_names}
+
+class MemoryBudget:
+    """Byte budget for data held between sync pipeline stages - acquire waits while it is spent"""
+    
+    def __init__(self, limit: int):
+        self.limit = max(1, limit)
+        self.in_use = 0
+        self._released = asyncio.Event()
+    
+    def available(self, size: int) -> bool:
+        return self.in_use + min(size, self.limit) <= self.limit
+    
+    async def acquire(self, size: int) -> int:
+        # An item larger than the whole budget waits for an empty budget instead of forever
+        size = min(size, self.limit)
+        while self.in_use + size > self.limit:
+            self._released.clear()
+            await self._released.wait()
+        self.in_use += size
+        return size
+    
+    def release(self, size: int):
+        self.in_use -= size
+        self._released.set()
+
+class SyncJob:
+    """A full-sync run with live progress counters and cooperative cancellation"""
+    
+    def __init__(self, **params):
+        self.id = str(uuid.uuid4())
+        self.params = params
+        self.status = "queued"
+        self.stage = "queued"
+        self.message = ""
+        self.current_archive: Optional[str] = None
+        self.archives_total = 0
+        self.archives_done = 0
+        self.total_matches = 0
+        self.total_players = 0
+        self.counters = {
+            'files_processed': 0, 'files_skipped': 0, 'files_prefiltered': 0, 'files_from_cache': 0, 'files_duplicate': 0,
+            'files_resumed': 0
+        }
+        self.duplicates_by_archive: Dict[str, int] = {}
+        self.started_at = datetime.utcnow()
+        self.finished_at: Optional[datetime] = None
+        # Checked by the parse thread between ZIP members
+        self.cancel_event = threading.Event()
+        self.task: Optional[asyncio.Task] = None
+        # Pipeline queues and memory budgets, reported in snapshots while the sync runs
+        self.queues: Dict[str, asyncio.Queue] = {}
+        self.budgets: List[MemoryBudget] = []
+    
+    @property
+    def active(self) -> bool:
+        return self.status in ("queued", "running")
+    
+    def set_stage(self, stage: str, archive: Optional[str] = None):
+        self.status = "running"
+        self.stage = stage
+        if archive is not None:
+            self.current_archive = archive
+    
+    def finish(self, status: str, message: str):
+        self.status = status
+        self.stage = status
+        self.message = message
+        self.current_archive = None
+        self.finished_at = datetime.utcnow()
+    
+    def snapshot(self) -> DataSyncStatus:
+        now = self.finished_at or datetime.utcnow()
+        elapsed = (now - self.started_at).total_seconds()
+        files_processed = self.counters['files_processed']
+        
+        # Archive sizes vary a lot, so this is a rough archive-rate estimate
+        eta_seconds = None
+        if self.active and self.archives_done:
+            eta_seconds = round(elapsed / self.archives_done * (self.archives_total - self.archives_done), 1)
+        
+        return DataSyncStatus(
+            status=self.status,
+            last_sync=now,
+            total_matches=self.total_matches,
+            total_players=self.total_players,
+            message=self.message,
+            job_id=self.id,
+            stage=self.stage,
+            current_archive=self.current_archive,
+            archives_total=self.archives_total,
+            archives_done=self.archives_done,
+            files_processed=files_processed,
+            files_skipped=self.counters['files_skipped'],
+            files_prefiltered=self.counters['files_prefiltered'],
+            files_from_cache=self.counters['files_from_cache'],
+            files_duplicate=self.counters['files_duplicate'],
+            files_resumed=self.counters['files_resumed'],
+            duplicates_by_archive=self.duplicates_by_archive,
+            queue_depths={name: queue.qsize() for name, queue in self.queues.items()},
+            memory_in_use=sum(budget.in_use for budget in self.budgets),
+            started_at=self.started_at,
+            finished_at=self.finished_at,
+            files_per_second=round(files_processed / elapsed, 2) if elapsed > 0 else 0.0,
+            eta_seconds=eta_seconds,
+            params=self.params
+        )
+    
+    async def save_progress(self):
+        await db.sync_status.replace_one({}, self.snapshot().dict(), upsert=True)
+
+# In-memory registry of recent sync jobs; at most one is active at a time
+sync_jobs: Dict[str, SyncJob] = {}
+SYNC_JOB_HISTORY = 20
+
+async def run_sync_job(job: SyncJob):
+    """Background task body for a sync job"""
+    try:
+        result = await download_and_process_cricsheet_data(job=job, **job.params)
+        if not result.get("success") and job.active:
+            job.finish("error", result.get("message", "Sync failed"))
+            await job.save_progress()
+    except asyncio.CancelledError:
+        job.finish("cancelled", f"Sync cancelled after {job.archives_done}/{job.archives_total} archives")
+        await job.save_progress()
+    except Exception as e:
+        logging.error(f"Error in sync job {job.id}: {e}")
+        job.finish("error", f"Error: {str(e)}")
+        await job.save_progress()
 
-def is_mi_player(player_name: str) -> bool:
-    """Check if a player is in Mumbai Indians squad (strict matching only)"""
-    normalized = normalize_player_name(player_name)
+def start_sync_job(**params) -> Tuple[SyncJob, bool]:
+    """Start a background sync, or coalesce into the one already running
     
-    # Direct match
-    if normalized in MI_PLAYERS:
-        return True
+    Returns (job, coalesced).
+    """
+    for job in sync_jobs.values():
+        if job.active:
+            return job, True
     
-    # Check alternatives - ONLY exact matches in the alternatives list
-    for mi_player, alternatives in PLAYER_ALTERNATIVES.items():
-        if normalized in alternatives or normalized == mi_player:
-            return True
+    job = SyncJob(**params)
+    sync_jobs[job.id] = job
+    while len(sync_jobs) > SYNC_JOB_HISTORY:
+        sync_jobs.pop(next(iter(sync_jobs)))
     
-    # NO fuzzy matching - only exact matches to prevent false positives
-    return False
+    job.task = asyncio.create_task(run_sync_job(job))
+    return job, False
 
-def process_cricket_data(json_files: List[Dict]) -> List[Dict]:
-    """Comprehensive cricket data processing - extract ALL datapoints for MI players across ALL formats"""
-    all_matches = []
-    processed_matches = set()  # Track unique matches to avoid duplicates
+async def download_and_process_cricsheet_data(
+    incremental: bool = False,
+    recent_days: Optional[int] = None,
+    from_cache: bool = False,
+    job: Optional[SyncJob] = None,
+    resume: bool = False
+):
+    """Download and process ALL comprehensive Cricsheet data - extract EVERYTHING
     
-    logging.info(f"Starting comprehensive analysis of {len(json_files)} JSON files...")
+    incremental=True skips archives that are unchanged since the last sync (conditional
+    requests on the stored ETag / Last-Modified) and member files already in the ingested
+    manifest. recent_days (2, 7 or 30) fetches only Cricsheet's recently-added archive.
+    from_cache=True re-derives every record from the local archive cache without network
+    access (after a squad config change) and drops records of players no longer in the squad.
+    Progress is reported through job (a throwaway SyncJob when called directly).
     
-    for idx, json_data in enumerate(json_files):
-        try:
-            if idx % 100 == 0:
-                logging.info(f"Processing file {idx+1}/{len(json_files)}")
-            
-            # Step 1: Extract basic match info first
-            info_data = json_data.get('info', {})
-            
-            # Extract comprehensive match information
-            match_info = {
-                'match_id': info_data.get('match_id', f"match_{idx}"),
-                'dates': info_data.get('dates', ['Unknown']),
-                'teams': info_data.get('teams', ['Team1', 'Team2']),
-                'venue': info_data.get('venue', 'Unknown'),
-                'city': info_data.get('city', 'Unknown'),
-                'match_type': info_data.get('match_type', 'Unknown'),
-                'season': info_data.get('season', 'Unknown'),
-                'gender': info_data.get('gender', 'male'),
-                'outcome': info_data.get('outcome', {}),
-                'players': info_data.get('players', {}),
-                'event': info_data.get('event', {})
-            }
-            
-            # Create unique match identifier
-            date_str = match_info['dates'][0] if isinstance(match_info['dates'], list) and match_info['dates'] else 'Unknown'
-            team1 = match_info['teams'][0] if isinstance(match_info['teams'], list) and len(match_info['teams']) > 0 else 'Team1'
-            team2 = match_info['teams'][1] if isinstance(match_info['teams'], list) and len(match_info['teams']) > 1 else 'Team2'
-            
-            unique_match_id = f"{date_str}_{team1}_{team2}_{match_info['venue']}"
-            
-            # Skip if already processed
-            if unique_match_id in processed_matches:
-                continue
-            processed_matches.add(unique_match_id)
-            
-            # Step 2: Check if ANY Mumbai Indians players are in this match
-            mi_players_in_match = set()
-            teams_in_match = {team1, team2}
-            
-            # Check team rosters first
-            if isinstance(match_info['players'], dict):
-                for team, player_list in match_info['players'].items():
-                    if isinstance(player_list, list):
-                        for player in player_list:
-                            if isinstance(player, str) and is_mi_player(player.strip()):
-                                canonical_name = get_canonical_player_name(player.strip(), teams_in_match)
-                                mi_players_in_match.add(canonical_name)
-            
-            # If no MI players found in team rosters, check delivery-level data
-            if not mi_players_in_match:
-                # Quick scan of delivery data to find MI players
-                if 'innings' in json_data and isinstance(json_data['innings'], list):
-                    for inning in json_data['innings']:
-                        if isinstance(inning, dict) and 'overs' in inning:
-                            overs_data = inning.get('overs', [])
-                            if isinstance(overs_data, list):
-                                for over_data in overs_data[:5]:  # Sample first 5 overs for quick check
-                                    if isinstance(over_data, dict) and 'deliveries' in over_data:
-                                        deliveries = over_data.get('deliveries', [])
-                                        if isinstance(deliveries, list):
-                                            for delivery in deliveries[:6]:  # Sample first 6 deliveries
-                                                if isinstance(delivery, dict):
-                                                    batter = delivery.get('batter', '')
-                                                    bowler = delivery.get('bowler', '')
-                                                    
-                                                    if batter and is_mi_player(str(batter).strip()):
-                                                        canonical_name = get_canonical_player_name(str(batter).strip(), teams_in_match)
-                                                        mi_players_in_match.add(canonical_name)
-                                                    if bowler and is_mi_player(str(bowler).strip()):
-                                                        canonical_name = get_canonical_player_name(str(bowler).strip(), teams_in_match)
-                                                        mi_players_in_match.add(canonical_name)
-                                                    
-                                                    if mi_players_in_match:  # Found MI players, can proceed
-                                                        break
-                                                if mi_players_in_match:
-                                                    break
-                                        if mi_players_in_match:
-                                            break
-                                if mi_players_in_match:
-                                    break
-                        if mi_players_in_match:
-                            break
-            
-            # If still no MI players found, skip this match
-            if not mi_players_in_match:
-                continue
-                
-            logging.info(f"Found MI players in match {unique_match_id}: {mi_players_in_match}")
-            
-            # Step 3: Process innings data for detailed statistics
-            if 'innings' not in json_data or not json_data['innings']:
-                # Even without detailed innings data, create basic match record
-                for player_name in mi_players_in_match:
-                    match_record = {
-                        'player_name': player_name,
-                        'match_id': unique_match_id,
-                        'team1': team1,
-                        'team2': team2,
-                        'venue': match_info['venue'],
-                        'city': match_info['city'],
-                        'date': date_str,
-                        'format': match_info['match_type'],
-                        'tournament': match_info['event'].get('name', 'Unknown') if isinstance(match_info['event'], dict) else 'Unknown',
-                        'season': match_info['season'],
-                        'gender': match_info['gender'],
-                        'batting_stats': None,
-                        'bowling_stats': None,
-                        'fielding_stats': None,
-                        'match_result': match_info['outcome'].get('winner', 'Unknown') if isinstance(match_info['outcome'], dict) else 'Unknown',
-                        'total_deliveries_involved': 0
-                    }
-                    all_matches.append(match_record)
-                continue
-                
-            innings_data = json_data['innings']
-            if not isinstance(innings_data, list):
-                continue
-            
-            # Step 4: Collect all delivery-level data for MI players
-            player_delivery_data = {}
-            
-            # Initialize data structure for each MI player
-            for player in mi_players_in_match:
-                player_delivery_data[player] = {
-                    'batting_deliveries': [],
-                    'bowling_deliveries': [],
-                    'fielding_deliveries': [],
-                    'total_deliveries': 0
-                }
+    Progress is checkpointed in sync_checkpoints as it is written: each archive once all of
+    its records are saved, and the last committed member within the archive being written.
+    resume=True continues the last sync that did not complete, with its original parameters -
+    completed archives are not downloaded again and the partial one restarts after its
+    last committed member.
+    """
+    if job is None:
+        job = SyncJob(incremental=incremental, recent_days=recent_days, from_cache=from_cache, resume=resume)
+    
+    checkpoint_id = None
+    checkpoint_status = "interrupted"
+    try:
+        checkpoint = None
+        if resume:
+            checkpoint = await load_sync_checkpoint()
+            if checkpoint is None:
+                return {"success": False, "message": "No interrupted sync to resume"}
+            incremental = checkpoint['params'].get('incremental', False)
+            recent_days = checkpoint['params'].get('recent_days')
+            from_cache = checkpoint['params'].get('from_cache', False)
+        
+        if from_cache:
+            if archive_cache is None:
+                return {"success": False, "message": "Archive cache is disabled (CRICSHEET_CACHE=0)"}
+            urls = archive_cache.urls()
+            incremental = False
+        elif recent_days:
+            urls = [f"{CRICSHEET_BASE_URL}/{RECENTLY_ADDED_ARCHIVE.format(days=recent_days)}"]
+        else:
+            urls = [f"{CRICSHEET_BASE_URL}/{name}" for name in CRICSHEET_ARCHIVES]
+        
+        job.archives_total = len(urls)
+        if checkpoint is not None:
+            checkpoint_id = checkpoint['_id']
+            completed_archives = set(checkpoint.get('completed_archives', []))
+            resume_archive, resume_member = checkpoint.get('current_archive'), checkpoint.get('current_member')
+            job.archives_done = sum(1 for url in urls if url in completed_archives)
+            urls = [url for url in urls if url not in completed_archives]
+            await update_sync_checkpoint(checkpoint_id, status="running", job_id=job.id)
+            logging.info(f"Resuming sync {checkpoint_id}: {job.archives_done}/{job.archives_total} archives already committed")
+        else:
+            checkpoint_id = job.id
+            resume_archive = resume_member = None
+            await start_sync_checkpoint(checkpoint_id, {
+                'incremental': incremental, 'recent_days': recent_days, 'from_cache': from_cache
+            })
+        await load_squad_person_ids()
+        job.set_stage("starting")
+        await job.save_progress()
+        
+        # Validators are sent even for archives missing from the archive cache - on an ephemeral
+        # disk the cache starts empty, and an unchanged archive fills it in once it changes
+        stored_validators = await load_archive_validators() if incremental else {}
+        ingested_files = await load_ingested_files() if incremental else None
+        not_modified = 0
+        
+        successful_downloads = 0
+        # Archives that failed to download, parse or write - left for a resume to retry
+        failed_archives = []
+        counters = job.counters
+        # Member file names whose records are written so far in this sync - overlapping archives
+        # repeat matches. The writer adds an archive's names at its end-of-archive marker and
+        # drops them if the archive failed, so its matches are still picked up from any later
+        # archive that repeats them.
+        seen_files = set()
+        loop = asyncio.get_running_loop()
+        
+        # Three overlapping stages joined by bounded queues: downloads run ahead into
+        # `downloaded`, the parse thread streams record batches into `parsed`, and the
+        # writer upserts them. Archives (SPOOL_MAX_MEMORY each while held) and queued
+        # records draw on separate halves of SYNC_MEMORY_BUDGET, so neither can starve the other.
+        downloaded = asyncio.Queue(maxsize=SYNC_DOWNLOAD_CONCURRENCY)
+        parsed = asyncio.Queue(maxsize=SYNC_WRITE_QUEUE_SIZE)
+        archive_budget = MemoryBudget(SYNC_MEMORY_BUDGET // 2)
+        record_budget = MemoryBudget(SYNC_MEMORY_BUDGET // 2)
+        job.queues = {'downloaded': downloaded, 'parsed': parsed}
+        job.budgets = [archive_budget, record_budget]
+        
+        async def download_stage():
+            # Keep up to SYNC_DOWNLOAD_CONCURRENCY downloads in flight (in threads, over the
+            # pooled session) and hand them on in URL order
+            downloads = deque()
+            url_iter = iter(urls)
             
-            # Process each inning
-            for inning_idx, inning in enumerate(innings_data):
-                if not isinstance(inning, dict) or 'overs' not in inning:
-                    continue
+            while True:
+                while len(downloads) < SYNC_DOWNLOAD_CONCURRENCY:
+                    if downloads and not archive_budget.available(SPOOL_MAX_MEMORY):
+                        break
+                    next_url = next(url_iter, None)
+                    if next_url is None:
+                        break
+                    reserved = await archive_budget.acquire(SPOOL_MAX_MEMORY)
+                    if from_cache:
+                        fetch = asyncio.to_thread(archive_cache.open_archive, next_url)
+                    else:
+                        logging.info(f"Downloading data from {next_url}")
+                        fetch = asyncio.to_thread(download_archive, next_url, stored_validators.get(next_url))
+                    downloads.append((next_url, reserved, asyncio.create_task(fetch)))
                 
-                inning_team = inning.get('team', 'Unknown')
-                overs_data = inning.get('overs', [])
+                if not downloads:
+                    break
                 
-                if not isinstance(overs_data, list):
-                    continue
+                url, reserved, download = downloads.popleft()
+                archive_sha = None
+                try:
+                    if from_cache:
+                        archive_sha, archive = await download
+                        status_code, validators = (200 if archive else 404), None
+                    else:
+                        status_code, archive, validators = await download
+                except asyncio.CancelledError:
+                    for _, pending_reserved, pending_download in downloads:
+                        pending_download.cancel()
+                    raise
+                except Exception as e:
+                    logging.error(f"Error downloading {url}: {e}")
+                    status_code, archive, validators = None, None, None
                 
-                # Process each over and delivery
-                for over_idx, over_data in enumerate(overs_data):
-                    if not isinstance(over_data, dict) or 'deliveries' not in over_data:
-                        continue
-                    
-                    over_number = over_data.get('over', over_idx)
-                    deliveries = over_data.get('deliveries', [])
-                    
-                    if not isinstance(deliveries, list):
-                        continue
-                    
-                    # Process each delivery
-                    for delivery_idx, delivery in enumerate(deliveries):
-                        if not isinstance(delivery, dict):
-                            continue
+                await downloaded.put((url, reserved, status_code, archive, validators, archive_sha))
+            
+            await downloaded.put(None)
+        
+        async def queue_records(url: str, batch: List[Dict], member_key: Optional[str]):
+            reserved = await record_budget.acquire(len(batch) * RECORD_MEMORY_ESTIMATE)
+            await parsed.put((url, batch, (reserved, member_key)))
+        
+        def emit_records(url: str, batch: List[Dict], member_key: Optional[str]):
+            # Called from the parse thread - blocks while the writer is behind (backpressure)
+            future = asyncio.run_coroutine_threadsafe(queue_records(url, batch, member_key), loop)
+            while True:
+                try:
+                    return future.result(timeout=0.5)
+                except FutureTimeoutError:
+                    if job.cancel_event.is_set():
+                        future.cancel()
+                        return
+        
+        async def parse_stage():
+            nonlocal not_modified, successful_downloads
+            while True:
+                item = await downloaded.get()
+                if item is None:
+                    break
+                url, reserved, status_code, archive, validators, archive_sha = item
+                finished = None
+                # Names of the members parsed from this archive - deduplicated against and
+                # recorded as ingested once written
+                processed_files = set()
+                try:
+                    if status_code == 304:
+                        not_modified += 1
+                        finished = (processed_files, validators)
+                    elif archive is not None:
+                        successful_downloads += 1
+                        files_before = counters['files_processed']
+                        prefiltered_before = counters['files_prefiltered']
+                        duplicates_before = counters['files_duplicate']
                         
-                        # Extract delivery-level information
-                        batter = delivery.get('batter', '')
-                        bowler = delivery.get('bowler', '')
-                        non_striker = delivery.get('non_striker', '')
-                        runs = delivery.get('runs', {})
-                        wickets = delivery.get('wickets', [])
+                        job.set_stage("parsing", url)
+                        record_count = await asyncio.to_thread(
+                            parse_archive, archive, url, counters, ingested_files,
+                            lambda batch, member_key: emit_records(url, batch, member_key),
+                            job.cancel_event, archive_sha, seen_files,
+                            resume_member if url == resume_archive else None, processed_files
+                        )
+                        if job.cancel_event.is_set():
+                            # The archive was only partially read - don't record it as ingested
+                            raise asyncio.CancelledError()
                         
-                        # Process for each MI player
-                        for player in mi_players_in_match:
-                            # Check batting
-                            if batter and get_canonical_player_name(str(batter).strip(), teams_in_match) == player:
-                                player_delivery_data[player]['batting_deliveries'].append({
-                                    'runs_batter': runs.get('batter', 0) if isinstance(runs, dict) else 0,
-                                    'runs_total': runs.get('total', 0) if isinstance(runs, dict) else 0,
-                                    'over': over_number,
-                                    'delivery': delivery_idx + 1
-                                })
-                                player_delivery_data[player]['total_deliveries'] += 1
-                            
-                            # Check bowling
-                            if bowler and get_canonical_player_name(str(bowler).strip(), teams_in_match) == player:
-                                player_delivery_data[player]['bowling_deliveries'].append({
-                                    'runs_conceded': runs.get('total', 0) if isinstance(runs, dict) else 0,
-                                    'wickets': len(wickets) if isinstance(wickets, list) else 0,
-                                    'wicket_details': wickets if isinstance(wickets, list) else [],
-                                    'over': over_number,
-                                    'delivery': delivery_idx + 1
-                                })
-                                player_delivery_data[player]['total_deliveries'] += 1
-                            
-                            # Check fielding (in wickets)
-                            if isinstance(wickets, list):
-                                for wicket in wickets:
-                                    if isinstance(wicket, dict):
-                                        fielders = wicket.get('fielders', [])
-                                        if isinstance(fielders, list):
-                                            for fielder in fielders:
-                                                if isinstance(fielder, dict):
-                                                    fielder_name = fielder.get('name', '')
-                                                    if fielder_name and get_canonical_player_name(str(fielder_name).strip(), teams_in_match) == player:
-                                                        player_delivery_data[player]['fielding_deliveries'].append({
-                                                            'dismissal_type': wicket.get('kind', 'unknown'),
-                                                            'over': over_number,
-                                                            'delivery': delivery_idx + 1
-                                                        })
-                                                        canonical_batter = get_canonical_player_name(str(batter).strip(), teams_in_match) if batter else ""
-                                                        canonical_bowler = get_canonical_player_name(str(bowler).strip(), teams_in_match) if bowler else ""
-                                                        if player not in [canonical_batter, canonical_bowler]:
-                                                            player_delivery_data[player]['total_deliveries'] += 1
-            
-            # Step 5: Create comprehensive match records
-            for player, data in player_delivery_data.items():
-                # Calculate batting stats
-                batting_stats = None
-                if data['batting_deliveries']:
-                    total_runs = sum(d['runs_batter'] for d in data['batting_deliveries'])
-                    total_balls = len(data['batting_deliveries'])
-                    fours = len([d for d in data['batting_deliveries'] if d['runs_batter'] == 4])
-                    sixes = len([d for d in data['batting_deliveries'] if d['runs_batter'] == 6])
-                    dots = len([d for d in data['batting_deliveries'] if d['runs_batter'] == 0])
-                    
-                    batting_stats = {
-                        'runs': total_runs,
-                        'balls': total_balls,
-                        'fours': fours,
-                        'sixes': sixes,
-                        'dots': dots,
-                        'strike_rate': round((total_runs / total_balls * 100), 2) if total_balls > 0 else 0.0
-                    }
+                        duplicates = counters['files_duplicate'] - duplicates_before
+                        if duplicates:
+                            job.duplicates_by_archive[url.rsplit('/', 1)[-1]] = duplicates
+                        
+                        logging.info(f"Successfully processed {counters['files_processed'] - files_before} matches from {url} ({counters['files_prefiltered'] - prefiltered_before} skipped by prefilter, {duplicates} already seen in earlier archives, {record_count} records)")
+                        finished = (processed_files, validators)
+                except Exception as e:
+                    logging.error(f"Error processing {url}: {e}")
+                finally:
+                    archive_budget.release(reserved)
                 
-                # Calculate bowling stats
-                bowling_stats = None
-                if data['bowling_deliveries']:
-                    runs_conceded = sum(d['runs_conceded'] for d in data['bowling_deliveries'])
-                    balls_bowled = len(data['bowling_deliveries'])
-                    wickets = sum(d['wickets'] for d in data['bowling_deliveries'])
-                    dots = len([d for d in data['bowling_deliveries'] if d['runs_conceded'] == 0])
-                    
-                    bowling_stats = {
-                        'runs_conceded': runs_conceded,
-                        'balls_bowled': balls_bowled,
-                        'wickets': wickets,
-                        'dots': dots,
-                        'economy': round((runs_conceded / (balls_bowled / 6)), 2) if balls_bowled > 0 else 0.0,
-                        'overs': f"{balls_bowled // 6}.{balls_bowled % 6}",
-                        'strike_rate': round((balls_bowled / wickets), 2) if wickets > 0 else 0.0
-                    }
+                # End-of-archive marker - the writer records progress once everything before it is written
+                await parsed.put((url, None, finished))
+            
+            job.set_stage("writing")
+            await parsed.put(None)
+        
+        async def write_stage():
+            failed_urls = set()
+            # Players whose records changed since the last refresh of their player_stats
+            touched_players = set()
+            while True:
+                item = await parsed.get()
+                if item is None:
+                    break
+                url, batch, extra = item
+                if batch is not None:
+                    reserved, member_key = extra
+                    try:
+                        if batch:
+                            saved = await save_match_records(batch, touched_players=touched_players)
+                            logging.info(f"Saved {len(batch)} matches to database: {saved}")
+                        # Everything up to member_key in this archive is now committed
+                        if member_key is not None and url not in failed_urls:
+                            await update_sync_checkpoint(checkpoint_id, current_archive=url, current_member=member_key)
+                    except Exception as e:
+                        logging.error(f"Error saving records from {url}: {e}")
+                        failed_urls.add(url)
+                    finally:
+                        record_budget.release(reserved)
+                    continue
                 
-                # Calculate fielding stats - CORRECTED for proper Cricsheet dismissal types
-                fielding_stats = None
-                if data['fielding_deliveries']:
-                    dismissals = data['fielding_deliveries']
-                    
-                    # Correct parsing based on actual Cricsheet dismissal types
-                    catches = len([d for d in dismissals if d['dismissal_type'].lower() == 'caught'])
-                    run_outs = len([d for d in dismissals if d['dismissal_type'].lower() == 'run out'])
-                    stumpings = len([d for d in dismissals if d['dismissal_type'].lower() == 'stumped'])
-                    
-                    # Other fielding-related dismissals
-                    other_fielding = len([d for d in dismissals if d['dismissal_type'].lower() in ['hit wicket', 'obstructing the field']])
-                    
-                    fielding_stats = {
-                        'catches': catches,
-                        'run_outs': run_outs, 
-                        'stumpings': stumpings,
-                        'other_fielding': other_fielding,
-                        'total_dismissals': len(dismissals)
-                    }
-                    
-                    # Debug output for verification
-                    if catches > 0 or run_outs > 0 or stumpings > 0:
-                        print(f"FIELDING STATS for {player}: Catches={catches}, Run outs={run_outs}, Stumpings={stumpings}, Total={len(dismissals)}")
+                if touched_players:
+                    try:
+                        refreshed = await refresh_player_stats(touched_players)
+                        logging.info(f"Refreshed player stats of {refreshed} players after {url}")
+                        await bump_data_generation()
+                    except Exception as e:
+                        logging.error(f"Error refreshing player stats after {url}: {e}")
+                    touched_players.clear()
                 
-                # Create comprehensive match record
-                match_record = {
-                    'player_name': player,
-                    'match_id': unique_match_id,
-                    'team1': team1,
-                    'team2': team2,
-                    'venue': match_info['venue'],
-                    'city': match_info['city'],
-                    'date': date_str,
-                    'format': match_info['match_type'],
-                    'tournament': match_info['event'].get('name', 'Unknown') if isinstance(match_info['event'], dict) else 'Unknown',
-                    'season': match_info['season'],
-                    'gender': match_info['gender'],
-                    'batting_stats': batting_stats,
-                    'bowling_stats': bowling_stats,
-                    'fielding_stats': fielding_stats,
-                    'match_result': match_info['outcome'].get('winner', 'Unknown') if isinstance(match_info['outcome'], dict) else 'Unknown',
-                    'total_deliveries_involved': data['total_deliveries']
-                }
+                if extra is None or url in failed_urls:
+                    # The archive's parsed names are dropped, so later archives still pick up their copies
+                    failed_archives.append(url)
+                else:
+                    seen_files.update(extra[0])
                 
-                all_matches.append(match_record)
-            
-        except Exception as e:
-            logging.error(f"Error processing JSON file {idx}: {e}")
-            continue
-    
-    logging.info(f"Comprehensive analysis completed: {len(all_matches)} match records extracted from {len(json_files)} files")
-    return all_matches
-
-async def download_and_process_cricsheet_data():
-    """Download and process ALL comprehensive Cricsheet data - extract EVERYTHING"""
-    try:
-        # Comprehensive URLs for ALL cricket formats
-        urls = [
-            # Year-based data (most comprehensive) - PRIORITY
-            "https://cricsheet.org/downloads/2025_male_json.zip",
-            "https://cricsheet.org/downloads/2024_male_json.zip",
-            
-            # Format-specific data for comprehensive coverage
-            "https://cricsheet.org/downloads/tests_male_json.zip",        # Test matches
-            "https://cricsheet.org/downloads/odis_male_json.zip",         # ODI matches  
-            "https://cricsheet.org/downloads/t20s_male_json.zip",         # T20 Internationals
-            "https://cricsheet.org/downloads/it20s_male_json.zip",        # Non-official T20Is
-            
-            # Major tournaments and leagues
-            "https://cricsheet.org/downloads/ipl_male_json.zip",          # Indian Premier League
-            "https://cricsheet.org/downloads/bbl_male_json.zip",          # Big Bash League
-            "https://cricsheet.org/downloads/cpl_male_json.zip",          # Caribbean Premier League
-            "https://cricsheet.org/downloads/psl_male_json.zip",          # Pakistan Super League
-            "https://cricsheet.org/downloads/bpl_male_json.zip",          # Bangladesh Premier League
-            "https://cricsheet.org/downloads/lpl_male_json.zip",          # Lanka Premier League
-            "https://cricsheet.org/downloads/sat_male_json.zip",          # SA20
-            "https://cricsheet.org/downloads/mlc_male_json.zip",          # Major League Cricket
-            "https://cricsheet.org/downloads/ilt_male_json.zip",          # International League T20
-            
-            # Domestic competitions  
-            "https://cricsheet.org/downloads/ntb_male_json.zip",          # T20 Blast (England)
-            "https://cricsheet.org/downloads/rlc_male_json.zip",          # One-Day Cup (England)
-            "https://cricsheet.org/downloads/cch_male_json.zip",          # County Championship
-            "https://cricsheet.org/downloads/ssh_male_json.zip",          # Sheffield Shield (Australia)
-            "https://cricsheet.org/downloads/ssm_male_json.zip",          # Super Smash (New Zealand)
-            "https://cricsheet.org/downloads/sma_male_json.zip",          # Syed Mushtaq Ali Trophy (India)
-        ]
+                try:
+                    # Only record progress once the archive's records are safely written
+                    if extra is not None and url not in failed_urls:
+                        processed_files, validators = extra
+                        if processed_files:
+                            await save_ingested_files(url.rsplit('/', 1)[-1], sorted(processed_files))
+                            if ingested_files is not None:
+                                ingested_files.update(processed_files)
+                        if validators is not None:
+                            await save_archive_validators(url, validators)
+                        await update_sync_checkpoint(
+                            checkpoint_id, completed_archive=url, current_archive=None, current_member=None
+                        )
+                except Exception as e:
+                    logging.error(f"Error recording progress for {url}: {e}")
+                finally:
+                    job.archives_done += 1
+                    await job.save_progress()
         
-        all_cricket_data = []
-        successful_downloads = 0
-        total_files_processed = 0
+        job.set_stage("downloading")
+        stages = [asyncio.create_task(stage()) for stage in (download_stage, parse_stage, write_stage)]
+        try:
+            await asyncio.gather(*stages)
+        except BaseException:
+            # Stop the parse thread at its next member and tear down the other stages
+            job.cancel_event.set()
+            for stage in stages:
+                stage.cancel()
+            await asyncio.gather(*stages, return_exceptions=True)
+            raise
+        finally:
+            job.queues = {}
         
-        for url in urls:
-            try:
-                logging.info(f"Downloading data from {url}")
-                response = requests.get(url, timeout=600)  # 10 minute timeout for large files
-                
-                if response.status_code == 200:
-                    successful_downloads += 1
-                    # Extract ZIP file
-                    with zipfile.ZipFile(BytesIO(response.content)) as zip_file:
-                        # Process ALL JSON files - NO LIMIT
-                        json_files = [f for f in zip_file.namelist() if f.endswith('.json')]
-                        logging.info(f"Found {len(json_files)} JSON files in {url}")
-                        
-                        # Process ALL files, not just a sample
-                        for json_file in json_files:
-                            try:
-                                with zip_file.open(json_file) as file:
-                                    cricket_match = json.load(file)
-                                    all_cricket_data.append(cricket_match)
-                                    total_files_processed += 1
-                                    
-                                    # Log progress every 500 files
-                                    if total_files_processed % 500 == 0:
-                                        logging.info(f"Processed {total_files_processed} JSON files so far...")
-                                        
-                            except Exception as e:
-                                logging.error(f"Error processing {json_file}: {e}")
-                                continue
-                                
-                    logging.info(f"Successfully processed {len(json_files)} matches from {url}")
-                    
-                    # Process data in batches to avoid memory issues
-                    if len(all_cricket_data) > 1000:
-                        logging.info(f"Processing batch of {len(all_cricket_data)} matches...")
-                        batch_matches = process_cricket_data(all_cricket_data)
-                        
-                        if batch_matches:
-                            # Save batch to database
-                            await db.matches.insert_many([MatchData(**record).dict() for record in batch_matches])
-                            logging.info(f"Saved {len(batch_matches)} matches to database")
-                        
-                        # Clear batch from memory
-                        all_cricket_data = []
-                        
-                else:
-                    logging.warning(f"Failed to download {url}: {response.status_code}")
-                    
-            except Exception as e:
-                logging.error(f"Error downloading {url}: {e}")
-                continue
+        job.set_stage("finalizing")
+        total_files_processed = counters['files_processed']
         
-        # Process remaining data
-        if all_cricket_data:
-            logging.info(f"Processing final batch of {len(all_cricket_data)} cricket matches")
-            final_batch_matches = process_cricket_data(all_cricket_data)
-            
-            if final_batch_matches:
-                await db.matches.insert_many([MatchData(**record).dict() for record in final_batch_matches])
-                logging.info(f"Saved final batch of {len(final_batch_matches)} matches to database")
+        if from_cache:
+            # Records of players (or squads) dropped from the squad config would otherwise linger
+            stale = await db.matches.delete_many({"$or": [
+                {"team": {"$nin": list(SQUADS)}},
+                *({"team": team, "player_name": {"$nin": squad['players']}} for team, squad in SQUADS.items())
+            ]})
+            logging.info(f"Removed {stale.deleted_count} records of players no longer in the squad")
+            await refresh_player_stats()
+        
+        learned_ids = await learn_squad_person_ids()
+        logging.info(f"Learned {learned_ids} new squad registry IDs ({sum(len(ids) for ids in squad_person_ids().values())} known)")
         
         # Get final statistics
         total_matches = await db.matches.count_documents({})
@@ -737,22 +2277,277 @@ async def download_and_process_cricsheet_data():
         unique_formats = set(await db.matches.distinct("format"))
         
         # Update sync status
-        sync_status = DataSyncStatus(
-            status="completed",
-            last_sync=datetime.utcnow(),
-            total_matches=total_matches,
-            total_players=unique_players,
-            message=f"Successfully processed ALL data: {total_matches} matches across {unique_tournaments} tournaments and {len(unique_formats)} formats from {successful_downloads} datasets. Processed {total_files_processed} JSON files."
+        job.total_matches = total_matches
+        job.total_players = unique_players
+        if failed_archives:
+            # The checkpoint stays interrupted so a resume retries just the failed archives
+            failed_names = ", ".join(url.rsplit('/', 1)[-1] for url in failed_archives)
+            job.finish(
+                "partial",
+                f"Sync incomplete: {len(failed_archives)} of {job.archives_total} archives failed ({failed_names}). {total_matches} matches stored, {total_files_processed} JSON files processed. Resume with /sync-data-full?resume=true to retry them."
+            )
+            await db.sync_status.delete_many({})
+            await db.sync_status.insert_one(job.snapshot().dict())
+            logging.warning(f"DATA SYNC INCOMPLETE: {len(failed_archives)} archives failed: {failed_names}")
+            return {
+                "success": False,
+                "message": job.message,
+                "failed_archives": failed_archives
+            }
+        
+        job.finish(
+            "completed",
+            f"Successfully processed ALL data: {total_matches} matches across {unique_tournaments} tournaments and {len(unique_formats)} formats from {successful_downloads} datasets ({not_modified} unchanged). Processed {total_files_processed} JSON files ({counters['files_prefiltered']} without squad players skipped before decoding), skipped {counters['files_skipped']} already ingested and {counters['files_duplicate']} duplicated across archives, {counters['files_from_cache']} re-derived from cached summaries."
         )
         await db.sync_status.delete_many({})
-        await db.sync_status.insert_one(sync_status.dict())
+        await db.sync_status.insert_one(job.snapshot().dict())
         
         logging.info(f"COMPREHENSIVE DATA SYNC COMPLETED: {total_matches} matches, {unique_players} players, {unique_tournaments} tournaments from {total_files_processed} files")
+        for team, resolver in squad_resolvers.items():
+            logging.info(f"Player name resolver stats for {team}: {resolver.stats()}")
+        checkpoint_status = "completed"
         return {"success": True, "message": f"Processed ALL available data: {total_matches} matches from {total_files_processed} JSON files across ALL formats"}
             
     except Exception as e:
         logging.error(f"Error in comprehensive data sync: {e}")
         return {"success": False, "message": f"Error: {str(e)}"}
+    finally:
+        if checkpoint_id is not None:
+            try:
+                await update_sync_checkpoint(checkpoint_id, status=checkpoint_status)
+                await bump_data_generation()
+            except Exception as e:
+                logging.error(f"Error finishing sync checkpoint {checkpoint_id}: {e}")
+
+def iter_local_matches(
+    path: Path,
+    counters: Dict[str, int],
+    seen_files: set
+) -> Iterator[Tuple[Optional[str], bytes]]:
+    """Yield (member_key, raw JSON) for a local Cricsheet ZIP archive or single JSON file
+    
+    Same rules as a sync: matches already seen in this run are skipped and the squad
+    prefilter applies.
+    """
+    counters['bytes_read'] = counters.get('bytes_read', 0) + path.stat().st_size
+    if path.suffix == '.zip':
+        with open(path, 'rb') as archive:
+            for member_key, payload in iter_archive_members(archive, str(path), counters, seen_files=seen_files):
+                seen_files.add(_member_file_name(member_key))
+                yield member_key, payload
+        return
+    
+    if path.name in seen_files:
+        counters['files_duplicate'] = counters.get('files_duplicate', 0) + 1
+        return
+    seen_files.add(path.name)
+    raw_match = path.read_bytes()
+    counters['files_processed'] = counters.get('files_processed', 0) + 1
+    if PREFILTER_MATCHES and not may_involve_squad(raw_match):
+        counters['files_prefiltered'] = counters.get('files_prefiltered', 0) + 1
+        return
+    yield None, raw_match
+
+async def ingest_local_files(
+    paths: List[Path],
+    workers: int = SYNC_WORKERS,
+    batch_size: int = INSERT_BATCH_SIZE,
+    dry_run: bool = False
+) -> Dict[str, Any]:
+    """Ingest local Cricsheet ZIP / JSON files straight into MongoDB - no network access
+    
+    Runs the same processing as a sync (prefilter, cross-archive dedup, process pool when
+    workers > 1, correction rules). With dry_run the records are counted but nothing touches MongoDB.
+    Returns counters and timings for the throughput summary.
+    """
+    counters = {
+        'files_processed': 0, 'files_skipped': 0, 'files_prefiltered': 0, 'files_duplicate': 0, 'bytes_read': 0
+    }
+    totals = {'records': 0, 'inserted': 0, 'updated': 0, 'unchanged': 0}
+    seen_files = set()
+    touched_players = set()
+    
+    if not dry_run:
+        await ensure_indexes()
+        await load_squad_person_ids()
+    
+    started = time.perf_counter()
+    parse_seconds = 0.0
+    write_seconds = 0.0
+    for path in paths:
+        parse_started = time.perf_counter()
+        try:
+            records = await asyncio.to_thread(
+                process_cricket_data, iter_local_matches(path, counters, seen_files), workers
+            )
+        except Exception as e:
+            logging.error(f"Error processing {path}: {e}")
+            continue
+        parse_seconds += time.perf_counter() - parse_started
+        # Corrected before counting, so a dry run reports what a real run writes
+        records = correction_rules.apply(records)
+        totals['records'] += len(records)
+        
+        if records and not dry_run:
+            write_started = time.perf_counter()
+            saved = await save_match_records(records, batch_size, touched_players, corrected=True)
+            write_seconds += time.perf_counter() - write_started
+            for key, value in saved.items():
+                totals[key] += value
+        logging.info(f"Ingested {path}: {len(records)} records")
+    
+    if not dry_run:
+        await refresh_player_stats(touched_players)
+        await bump_data_generation()
+        await learn_squad_person_ids()
+    
+    return {
+        **counters,
+        **totals,
+        'elapsed_seconds': time.perf_counter() - started,
+        'parse_seconds': parse_seconds,
+        'write_seconds': write_seconds
+    }
+
+class ResponseCache:
+    """LRU cache of serialized API responses, valid for one data generation
+    
+    The generation is a counter in db.data_generation that bump_data_generation increments
+    whenever records change; it is re-read at most every DATA_GENERATION_CHECK_INTERVAL
+    seconds, so bumps made by other processes (CLI ingest, other workers) are picked up too.
+    A new generation drops every entry. Entries are evicted least recently used first once
+    their bodies pass max_bytes, and concurrent misses on one key share a single computation.
+    """
+    
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.generation: Optional[int] = None
+        self.generation_checked = 0.0
+        self.size = 0
+        self._entries: OrderedDict = OrderedDict()  # key -> (body, etag)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+    
+    def set_generation(self, generation: int):
+        if generation != self.generation:
+            self.generation = generation
+            self._entries.clear()
+            self.size = 0
+        self.generation_checked = time.monotonic()
+    
+    async def current_generation(self) -> int:
+        if self.generation is None or time.monotonic() - self.generation_checked >= DATA_GENERATION_CHECK_INTERVAL:
+            doc = await db.data_generation.find_one({"_id": "matches"})
+            self.set_generation(doc["generation"] if doc else 0)
+        return self.generation
+    
+    def _store(self, key: str, body: bytes, etag: str):
+        if len(body) > self.max_bytes:
+            return
+        self._entries[key] = (body, etag)
+        self.size += len(body)
+        while self.size > self.max_bytes:
+            _, (evicted, _) = self._entries.popitem(last=False)
+            self.size -= len(evicted)
+            self.evictions += 1
+    
+    async def get(self, key: str, compute: Callable[[], Any]) -> Tuple[bytes, str]:
+        """Return (JSON body, ETag) for key, awaiting compute() to build it on a miss"""
+        generation = await self.current_generation()
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+        
+        flight_key = f"{generation}:{key}"
+        inflight = self._inflight.get(flight_key)
+        if inflight is not None:
+            self.coalesced += 1
+            return await asyncio.shield(inflight)
+        
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[flight_key] = future
+        try:
+            body = json.dumps(jsonable_encoder(await compute()), separators=(',', ':')).encode()
+            entry = (body, f'"{hashlib.sha1(body).hexdigest()}"')
+            # Don't keep a result computed across a generation bump
+            if self.generation == generation:
+                self._store(key, *entry)
+            future.set_result(entry)
+            return entry
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # retrieved - waiters re-raise it, nobody else has to
+            raise
+        finally:
+            del self._inflight[flight_key]
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'generation': self.generation,
+            'entries': len(self._entries),
+            'bytes': self.size,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'coalesced': self.coalesced,
+            'evictions': self.evictions
+        }
+
+response_cache = ResponseCache(RESPONSE_CACHE_MAX_BYTES)
+
+async def bump_data_generation() -> int:
+    """Mark the match data as changed, invalidating every cached response"""
+    doc = await db.data_generation.find_one_and_update(
+        {"_id": "matches"},
+        {"$inc": {"generation": 1}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+    response_cache.set_generation(doc["generation"])
+    return doc["generation"]
+
+# Text filter parameters - compared case-insensitively unless match=regex, so they key the cache in keyword form
+CACHE_TEXT_PARAMS = {"player", "format", "tournament", "season"}
+
+def cached_endpoint(name: str):
+    """Serve a read endpoint through response_cache, with ETag / If-None-Match support
+    
+    The cache key is the endpoint name plus its normalized query parameters.
+    """
+    def decorator(endpoint):
+        signature = inspect.signature(endpoint)
+        
+        @functools.wraps(endpoint)
+        async def wrapper(request: Request, **params):
+            normalized = {}
+            for param, value in sorted(params.items()):
+                if value is None:
+                    continue
+                if isinstance(value, str):
+                    value = keyword(value) if param in CACHE_TEXT_PARAMS and params.get("match") != "regex" else value.strip()
+                elif isinstance(value, list):
+                    value = [item.strip() if isinstance(item, str) else item for item in value]
+                normalized[param] = value
+            key = f"{name}?{json.dumps(normalized, sort_keys=True)}"
+            
+            body, etag = await response_cache.get(key, lambda: endpoint(**params))
+            headers = {"ETag": etag, "Cache-Control": "no-cache"}
+            if etag in [tag.strip() for tag in request.headers.get("if-none-match", "").split(",")]:
+                return Response(status_code=304, headers=headers)
+            return Response(content=body, media_type="application/json", headers=headers)
+        
+        wrapper.__signature__ = signature.replace(parameters=[
+            inspect.Parameter("request", inspect.Parameter.POSITIONAL_OR_KEYWORD, annotation=Request),
+            *signature.parameters.values()
+        ])
+        return wrapper
+    return decorator
 
 # API Routes
 @api_router.get("/")
@@ -774,17 +2569,15 @@ async def sync_cricket_data():
         
         # Step 1: Clean up existing duplicates and standardize names
         logging.info("Step 1: Cleaning up duplicate players...")
-        updated_matches = await cleanup_duplicate_players()
-        
-        # Step 2: Remove incorrect Rohit Sharma matches (Singapore/Bahrain etc.)
-        logging.info("Step 2: Cleaning up incorrect Rohit Sharma matches...")
-        incorrect_rohit_matches = await db.matches.delete_many({
-            "player_name": "Rohit Sharma",
-            "$and": [
-                {"team1": {"$nin": ["Mumbai Indians", "India"]}},
-                {"team2": {"$nin": ["Mumbai Indians", "India"]}}
-            ]
-        })
+        cleanup = await cleanup_duplicate_players()
+        updated_matches = cleanup['updated']
+        
+        # Step 2: Apply the correction rules (aliases, Rohit Sharma namesakes etc.)
+        logging.info("Step 2: Applying correction rules...")
+        correction_hits = await apply_correction_rules()
+        corrected = sum(correction_hits.values())
+        await refresh_player_stats()
+        await bump_data_generation()
         
         # Get final statistics
         total_matches = await db.matches.count_documents({})
@@ -794,13 +2587,14 @@ async def sync_cricket_data():
         final_sync_status = DataSyncStatus(
             status="completed",
             last_sync=datetime.utcnow(),
-            message=f"Data cleanup completed! {updated_matches} records updated, {incorrect_rohit_matches.deleted_count} incorrect matches removed. Database contains {total_matches} matches for {unique_players} players."
+            message=f"Data cleanup completed! {updated_matches} records updated, {corrected} records corrected by rules. Database contains {total_matches} matches for {unique_players} players."
         )
         await db.sync_status.replace_one({}, final_sync_status.dict(), upsert=True)
         
         return {
             "success": True,
-            "message": f"Data sync completed successfully! Updated {updated_matches} records, removed {incorrect_rohit_matches.deleted_count} incorrect matches.",
+            "message": f"Data sync completed successfully! Updated {updated_matches} records, corrected {corrected} records by rules.",
+            "correction_hits": correction_hits,
             "total_matches": total_matches,
             "unique_players": unique_players
         }
@@ -818,20 +2612,101 @@ async def sync_cricket_data():
         raise HTTPException(status_code=500, detail=str(e))
 
 @api_router.post("/sync-data-full")
-async def sync_cricket_data_full():
-    """Full data synchronization - download latest Cricsheet data"""
+async def sync_cricket_data_full(incremental: bool = False, recent_days: Optional[int] = None, resume: bool = False):
+    """Full data synchronization - download latest Cricsheet data in a background job
+    
+    Returns the job ID immediately; poll /api/sync-jobs/{job_id} for progress. A request
+    made while a sync is already running is coalesced into that job. Pass
+    incremental=true to only parse new or changed matches, and recent_days=2|7|30
+    to top up from Cricsheet's recently-added archive instead of the full list.
+    resume=true continues the last interrupted sync from its checkpoint (the other
+    parameters are taken from that sync).
+    """
+    if recent_days is not None and recent_days not in (2, 7, 30):
+        raise HTTPException(status_code=400, detail="recent_days must be 2, 7 or 30")
+    if resume and await load_sync_checkpoint() is None:
+        raise HTTPException(status_code=404, detail="No interrupted sync to resume")
     try:
-        result = await download_and_process_cricsheet_data()
-        return result
+        if resume:
+            job, coalesced = start_sync_job(resume=True)
+        else:
+            job, coalesced = start_sync_job(incremental=incremental, recent_days=recent_days)
+        return {
+            "success": True,
+            "job_id": job.id,
+            "coalesced": coalesced,
+            "message": "Joined the sync already in progress" if coalesced else "Sync started in the background",
+            "status": job.snapshot()
+        }
     except Exception as e:
         logging.error(f"Error in full data sync: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@api_router.post("/sync-data-rederive")
+async def sync_cricket_data_rederive():
+    """Re-derive all match records from the local archive cache after a squad config change
+    
+    Runs as a background sync job without network access; cached match summaries are
+    reused so only matches that were never summarized get decoded.
+    """
+    if archive_cache is None:
+        raise HTTPException(status_code=400, detail="Archive cache is disabled (CRICSHEET_CACHE=0)")
+    try:
+        job, coalesced = start_sync_job(from_cache=True)
+        return {
+            "success": True,
+            "job_id": job.id,
+            "coalesced": coalesced,
+            "message": "Joined the sync already in progress" if coalesced else "Re-derive started in the background",
+            "status": job.snapshot()
+        }
+    except Exception as e:
+        logging.error(f"Error starting re-derive: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@api_router.get("/sync-jobs")
+async def list_sync_jobs():
+    """Get recent sync jobs, newest first"""
+    return [job.snapshot() for job in reversed(list(sync_jobs.values()))]
+
+@api_router.get("/sync-jobs/{job_id}")
+async def get_sync_job(job_id: str):
+    """Get stage, progress, throughput and ETA for a sync job"""
+    job = sync_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Sync job not found")
+    return job.snapshot()
+
+@api_router.get("/sync-checkpoint")
+async def get_sync_checkpoint():
+    """Get the checkpoint of the last sync that did not complete, if any"""
+    checkpoint = await load_sync_checkpoint()
+    if checkpoint is None:
+        raise HTTPException(status_code=404, detail="No interrupted sync")
+    return checkpoint
+
+@api_router.post("/sync-jobs/{job_id}/cancel")
+async def cancel_sync_job(job_id: str):
+    """Cancel a running sync job"""
+    job = sync_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Sync job not found")
+    if not job.active:
+        return {"success": False, "message": f"Sync job is already {job.status}", "status": job.snapshot()}
+    
+    job.cancel_event.set()
+    if job.task is not None:
+        job.task.cancel()
+    return {"success": True, "message": "Cancellation requested", "status": job.snapshot()}
+
 @api_router.post("/cleanup-duplicates")
 async def cleanup_duplicate_players_endpoint():
     """Manually trigger duplicate player cleanup"""
     try:
-        updated_count = await cleanup_duplicate_players()
+        cleanup = await cleanup_duplicate_players()
+        updated_count = cleanup['updated']
+        await refresh_player_stats()
+        await bump_data_generation()
         
         # Get updated statistics
         total_matches = await db.matches.count_documents({})
@@ -839,8 +2714,11 @@ async def cleanup_duplicate_players_endpoint():
         
         return {
             "success": True,
-            "message": f"Cleanup completed! Updated {updated_count} records. Current: {total_matches} matches, {unique_players} unique players",
+            "message": f"Cleanup completed in {cleanup['timings']['total_seconds']}s! Updated {updated_count} records. Current: {total_matches} matches, {unique_players} unique players",
             "updated_records": updated_count,
+            "renamed_records": cleanup['renamed'],
+            "duplicates_removed": cleanup['duplicates_removed'],
+            "timings": cleanup['timings'],
             "total_matches": total_matches,
             "unique_players": unique_players
         }
@@ -849,12 +2727,21 @@ async def cleanup_duplicate_players_endpoint():
         logging.error(f"Error in cleanup endpoint: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@api_router.get("/squads")
+async def get_squads():
+    """Get the tracked squads and their configured player counts"""
+    return [{"team": team, "players": len(squad['players'])} for team, squad in SQUADS.items()]
+
 @api_router.get("/players")
-async def get_players():
-    """Get all Mumbai Indians players with canonical names"""
+@cached_endpoint("players")
+async def get_players(team: str = DEFAULT_SQUAD):
+    """Get all players of a tracked squad (Mumbai Indians by default) with canonical names"""
+    if team not in SQUADS:
+        raise HTTPException(status_code=404, detail=f"{team} is not a tracked squad")
     try:
         # Get unique players from matches with match counts
         pipeline = [
+            {"$match": {"team": team}},
             {"$group": {"_id": "$player_name", "match_count": {"$sum": 1}}},
             {"$sort": {"match_count": -1}}
         ]
@@ -869,22 +2756,22 @@ async def get_players():
             if stat["_id"] not in existing_names:
                 player = Player(
                     name=stat["_id"],
-                    team="Mumbai Indians",
+                    team=team,
                     active=True
                 )
                 players.append(player)
                 existing_names.add(stat["_id"])
         
-        # Add players without match data (from MI_PLAYERS list)
-        for mi_player in MI_PLAYERS:
-            if mi_player not in existing_names:
+        # Add players without match data (from the squad config)
+        for squad_player in SQUADS[team]['players']:
+            if squad_player not in existing_names:
                 player = Player(
-                    name=mi_player,
-                    team="Mumbai Indians", 
+                    name=squad_player,
+                    team=team, 
                     active=True
                 )
                 players.append(player)
-                existing_names.add(mi_player)
+                existing_names.add(squad_player)
         
         return players
         
@@ -893,31 +2780,59 @@ async def get_players():
         raise HTTPException(status_code=500, detail=str(e))
 
 @api_router.get("/players/{player_id}/matches")
-async def get_player_matches(player_id: str, limit: int = 50):
-    """Get matches for a specific player"""
+async def get_player_matches(
+    player_id: str,
+    response: Response,
+    limit: int = 50,
+    team: Optional[str] = None,
+    match: str = "exact",
+    cursor: Optional[str] = None,
+    stream: bool = False
+):
+    """Get matches for a specific player, newest first
+    
+    match picks how player_id is compared with player names: exact (default), prefix -
+    both case-insensitive and indexed - or regex. Only exact pages straight off the
+    (player_key, date, _id) index; prefix ranges over it and sorts in memory.
+    Page with cursor / X-Next-Cursor, or stream NDJSON with stream=true (see list_match_records).
+    """
+    check_text_match(match)
+    after = check_match_page(limit, cursor, stream)
     try:
         # Find player by name (using player_id as name for simplicity)
-        matches = await db.matches.find(
-            {"player_name": {"$regex": player_id, "$options": "i"}},
-            limit=limit
-        ).sort("date", -1).to_list(limit)
-        
-        return [MatchData(**match) for match in matches]
+        query = text_filter("player_name", player_id, match)
+        if team:
+            query["team"] = team
+        return await list_match_records(query, limit, after, stream, response)
         
     except Exception as e:
         logging.error(f"Error getting player matches: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @api_router.get("/matches")
-async def get_all_matches(limit: int = 100, player: Optional[str] = None):
-    """Get all matches with optional player filter"""
+async def get_all_matches(
+    response: Response,
+    limit: int = 100,
+    player: Optional[str] = None,
+    team: Optional[str] = None,
+    match: str = "exact",
+    cursor: Optional[str] = None,
+    stream: bool = False
+):
+    """Get all matches, newest first, with optional player and squad filters (match: exact / prefix / regex)
+    
+    Page with cursor / X-Next-Cursor, or stream NDJSON with stream=true (see list_match_records).
+    """
+    check_text_match(match)
+    after = check_match_page(limit, cursor, stream)
     try:
         query = {}
         if player:
-            query["player_name"] = {"$regex": player, "$options": "i"}
+            query.update(text_filter("player_name", player, match))
+        if team:
+            query["team"] = team
         
-        matches = await db.matches.find(query, limit=limit).sort("date", -1).to_list(limit)
-        return [MatchData(**match) for match in matches]
+        return await list_match_records(query, limit, after, stream, response)
         
     except Exception as e:
         logging.error(f"Error getting matches: {e}")
@@ -930,16 +2845,21 @@ async def get_unique_matches(
     format: Optional[str] = None,
     tournament: Optional[str] = None,
     date_from: Optional[str] = None,
-    date_to: Optional[str] = None
+    date_to: Optional[str] = None,
+    team: Optional[str] = None,
+    match: str = "exact"
 ):
-    """Get unique matches (one per game) with player performance data"""
+    """Get unique matches (one per game) with player performance data (match: exact / prefix / regex)"""
+    check_text_match(match)
     try:
         # Build base query for filtering
         base_query = {}
+        if team:
+            base_query["team"] = team
         if format:
-            base_query["format"] = {"$regex": format, "$options": "i"}
+            base_query.update(text_filter("format", format, match))
         if tournament:
-            base_query["tournament"] = {"$regex": tournament, "$options": "i"}
+            base_query.update(text_filter("tournament", tournament, match))
         if date_from or date_to:
             date_query = {}
             if date_from:
@@ -966,6 +2886,7 @@ async def get_unique_matches(
                     "players": {
                         "$push": {
                             "player_name": "$player_name",
+                            "team": "$team",
                             "batting_stats": "$batting_stats",
                             "bowling_stats": "$bowling_stats",
                             "fielding_stats": "$fielding_stats"
@@ -982,7 +2903,7 @@ async def get_unique_matches(
             pipeline.insert(0, {
                 "$match": {
                     **base_query,
-                    "player_name": {"$regex": player, "$options": "i"}
+                    **text_filter("player_name", player, match)
                 }
             })
         
@@ -990,23 +2911,23 @@ async def get_unique_matches(
         
         # Format the response
         formatted_matches = []
-        for match in unique_matches:
+        for doc in unique_matches:
             # Filter to only include MI players if player filter is applied
-            players_data = match.get('players', [])
+            players_data = doc.get('players', [])
             if player:
-                players_data = [p for p in players_data if player.lower() in p['player_name'].lower()]
+                players_data = [p for p in players_data if text_matches(p['player_name'], player, match)]
             
             formatted_match = {
-                "match_id": match["_id"],
-                "date": match["date"],
-                "team1": match["team1"],
-                "team2": match["team2"],
-                "venue": match["venue"],
-                "city": match["city"],
-                "format": match["format"],
-                "tournament": match["tournament"],
-                "season": match["season"],
-                "match_result": match["match_result"],
+                "match_id": doc["_id"],
+                "date": doc["date"],
+                "team1": doc["team1"],
+                "team2": doc["team2"],
+                "venue": doc["venue"],
+                "city": doc["city"],
+                "format": doc["format"],
+                "tournament": doc["tournament"],
+                "season": doc["season"],
+                "match_result": doc["match_result"],
                 "players_performance": players_data
             }
             formatted_matches.append(formatted_match)
@@ -1017,6 +2938,47 @@ async def get_unique_matches(
         logging.error(f"Error getting unique matches: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@api_router.get("/squad-registry")
+async def get_squad_registry(team: Optional[str] = None):
+    """Get the squads' Cricsheet registry IDs (learned at sync time or pinned)"""
+    try:
+        query = {"team": team} if team else {}
+        return await db.squad_registry.find(query).sort([("team", 1), ("player_name", 1)]).to_list(None)
+    except Exception as e:
+        logging.error(f"Error getting squad registry: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@api_router.put("/squad-registry/{person_id}")
+async def pin_squad_person_id(person_id: str, player_name: str, team: str = DEFAULT_SQUAD):
+    """Pin a Cricsheet registry ID to a squad player - takes effect from the next sync"""
+    if team not in SQUADS or player_name not in SQUADS[team]['players']:
+        raise HTTPException(status_code=400, detail=f"{player_name} is not in the {team} squad")
+    try:
+        key = squad_registry_key(team, person_id)
+        await db.squad_registry.replace_one(
+            {"_id": key},
+            {
+                "_id": key, "team": team, "person_id": person_id, "player_name": player_name,
+                "source": "pinned", "updated_at": datetime.utcnow()
+            },
+            upsert=True
+        )
+        await load_squad_person_ids()
+        return {"success": True, "person_ids": len(squad_resolvers[team].person_ids)}
+    except Exception as e:
+        logging.error(f"Error pinning squad registry ID: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@api_router.get("/resolver-stats")
+async def get_resolver_stats():
+    """Get player name resolver cache and fuzzy-index counters per squad (main process only)"""
+    return {team: resolver.stats() for team, resolver in squad_resolvers.items()}
+
+@api_router.get("/correction-rules")
+async def get_correction_rules():
+    """Get the correction rules and how often each has fired on records being written"""
+    return correction_rules.stats()
+
 @api_router.get("/sync-status")
 async def get_sync_status():
     """Get data synchronization status"""
@@ -1035,224 +2997,78 @@ async def get_sync_status():
         raise HTTPException(status_code=500, detail=str(e))
 
 @api_router.get("/analytics")
+@cached_endpoint("analytics")
 async def get_analytics_data(
     player: Optional[str] = None,
     format: Optional[str] = None,
     tournament: Optional[str] = None,
     season: Optional[str] = None,
     date_from: Optional[str] = None,
-    date_to: Optional[str] = None
+    date_to: Optional[str] = None,
+    team: str = DEFAULT_SQUAD,
+    match: str = "exact"
 ):
-    """Get comprehensive analytics data with advanced filtering"""
+    """Get comprehensive analytics data of a tracked squad (Mumbai Indians by default) with advanced filtering
+    
+    Text filters compare case-insensitively by exact value (the default) or prefix on
+    indexed keyword fields; match=regex restores unanchored regex matching.
+    
+    Without filters the per-player career analytics are read from the squad's player_stats
+    documents that syncs keep up to date; filtered requests are aggregated server-side
+    over every matching record of the squad (aggregate_player_analytics).
+    """
+    check_text_match(match)
+    if team not in SQUADS:
+        raise HTTPException(status_code=404, detail=f"{team} is not a tracked squad")
     try:
-        # Build query based on filters
-        query = {}
-        
-        if player:
-            query["player_name"] = {"$regex": player, "$options": "i"}
-        if format:
-            query["format"] = {"$regex": format, "$options": "i"}
-        if tournament:
-            query["tournament"] = {"$regex": tournament, "$options": "i"}
-        if season:
-            query["season"] = {"$regex": season, "$options": "i"}
-        
-        # Date filtering with improved date parsing
-        if date_from or date_to:
-            date_query = {}
-            if date_from:
-                date_query["$gte"] = date_from
-            if date_to:
-                date_query["$lte"] = date_to
-            query["date"] = date_query
-        
-        # Get matches with filters, sorted by date descending
-        matches = await db.matches.find(query).sort("date", -1).to_list(2000)  # Increased limit for comprehensive analysis
-        
-        if not matches:
-            return {"players": [], "summary": {}}
-        
-        # Group matches by player for analytics
-        player_analytics = {}
-        
-        for match in matches:
-            player_name = match['player_name']
-            
-            if player_name not in player_analytics:
-                player_analytics[player_name] = {
-                    'player_name': player_name,
-                    'total_matches': 0,
-                    'batting': {
-                        'innings': 0,
-                        'runs': 0,
-                        'balls': 0,
-                        'fours': 0,
-                        'sixes': 0,
-                        'dots': 0,
-                        'highest_score': 0,
-                        'not_outs': 0,
-                        'centuries': 0,
-                        'half_centuries': 0,
-                        'ducks': 0
-                    },
-                    'bowling': {
-                        'innings': 0,
-                        'runs_conceded': 0,
-                        'balls_bowled': 0,
-                        'wickets': 0,
-                        'dots': 0,
-                        'best_figures': '0/0',
-                        'five_wickets': 0,
-                        'four_wickets': 0
-                    },
-                    'fielding': {
-                        'catches': 0,
-                        'run_outs': 0,
-                        'stumpings': 0,
-                        'other_fielding': 0,
-                        'total_dismissals': 0
-                    },
-                    'formats': set(),
-                    'tournaments': set(),
-                    'seasons': set(),
-                    'venues': set(),
-                    'recent_form': []  # Last 5 matches performance
-                }
-            
-            analytics = player_analytics[player_name]
-            analytics['total_matches'] += 1
-            analytics['formats'].add(match.get('format', 'Unknown'))
-            analytics['tournaments'].add(match.get('tournament', 'Unknown'))
-            analytics['seasons'].add(match.get('season', 'Unknown'))
-            analytics['venues'].add(match.get('venue', 'Unknown'))
-            
-            # Batting analytics
-            batting_stats = match.get('batting_stats')
-            if batting_stats:
-                analytics['batting']['innings'] += 1
-                runs = batting_stats.get('runs', 0)
-                balls = batting_stats.get('balls', 0)
-                analytics['batting']['runs'] += runs
-                analytics['batting']['balls'] += balls
-                analytics['batting']['fours'] += batting_stats.get('fours', 0)
-                analytics['batting']['sixes'] += batting_stats.get('sixes', 0)
-                analytics['batting']['dots'] += batting_stats.get('dots', 0)
-                
-                if runs > analytics['batting']['highest_score']:
-                    analytics['batting']['highest_score'] = runs
-                
-                if runs == 0 and balls > 0:
-                    analytics['batting']['ducks'] += 1
-                elif runs >= 100:
-                    analytics['batting']['centuries'] += 1
-                elif runs >= 50:
-                    analytics['batting']['half_centuries'] += 1
-            
-            # Bowling analytics
-            bowling_stats = match.get('bowling_stats')
-            if bowling_stats:
-                analytics['bowling']['innings'] += 1
-                runs_conceded = bowling_stats.get('runs_conceded', 0)
-                balls_bowled = bowling_stats.get('balls_bowled', 0)
-                wickets = bowling_stats.get('wickets', 0)
-                
-                analytics['bowling']['runs_conceded'] += runs_conceded
-                analytics['bowling']['balls_bowled'] += balls_bowled
-                analytics['bowling']['wickets'] += wickets
-                analytics['bowling']['dots'] += bowling_stats.get('dots', 0)
-                
-                # Best bowling figures
-                current_best = analytics['bowling']['best_figures']
-                if current_best == '0/0' or wickets > int(current_best.split('/')[0]):
-                    analytics['bowling']['best_figures'] = f"{wickets}/{runs_conceded}"
-                
-                if wickets >= 5:
-                    analytics['bowling']['five_wickets'] += 1
-                elif wickets >= 4:
-                    analytics['bowling']['four_wickets'] += 1
-            
-            # Fielding analytics - Updated to include other_fielding
-            fielding_stats = match.get('fielding_stats')
-            if fielding_stats:
-                analytics['fielding']['catches'] += fielding_stats.get('catches', 0)
-                analytics['fielding']['run_outs'] += fielding_stats.get('run_outs', 0)
-                analytics['fielding']['stumpings'] += fielding_stats.get('stumpings', 0)
-                analytics['fielding']['other_fielding'] = analytics['fielding'].get('other_fielding', 0) + fielding_stats.get('other_fielding', 0)
-                analytics['fielding']['total_dismissals'] += fielding_stats.get('total_dismissals', 0)
-            
-            # Recent form (simplified) - only keep first 5 for each player
-            if len(analytics['recent_form']) < 5:
-                form_data = {
-                    'date': match.get('date'),
-                    'tournament': match.get('tournament'),
-                    'batting_runs': batting_stats.get('runs', 0) if batting_stats else None,
-                    'bowling_wickets': bowling_stats.get('wickets', 0) if bowling_stats else None,
-                    'match_result': match.get('match_result')
-                }
-                analytics['recent_form'].append(form_data)
-        
-        # Calculate derived statistics
-        for player_name, analytics in player_analytics.items():
-            # Convert sets to lists for JSON serialization
-            analytics['formats'] = list(analytics['formats'])
-            analytics['tournaments'] = list(analytics['tournaments'])
-            analytics['seasons'] = list(analytics['seasons'])
-            analytics['venues'] = list(analytics['venues'])
-            
-            # Batting averages
-            batting = analytics['batting']
-            if batting['innings'] > 0:
-                effective_innings = batting['innings'] - batting['not_outs']
-                batting['average'] = round(batting['runs'] / effective_innings, 2) if effective_innings > 0 else 0.0
-                batting['strike_rate'] = round((batting['runs'] / batting['balls']) * 100, 2) if batting['balls'] > 0 else 0.0
-                batting['boundary_percentage'] = round(((batting['fours'] + batting['sixes']) / batting['balls']) * 100, 2) if batting['balls'] > 0 else 0.0
-            else:
-                batting['average'] = 0.0
-                batting['strike_rate'] = 0.0
-                batting['boundary_percentage'] = 0.0
-            
-            # Bowling averages
-            bowling = analytics['bowling']
-            if bowling['innings'] > 0:
-                bowling['average'] = round(bowling['runs_conceded'] / bowling['wickets'], 2) if bowling['wickets'] > 0 else 0.0
-                bowling['economy'] = round((bowling['runs_conceded'] / (bowling['balls_bowled'] / 6)), 2) if bowling['balls_bowled'] > 0 else 0.0
-                bowling['strike_rate'] = round(bowling['balls_bowled'] / bowling['wickets'], 2) if bowling['wickets'] > 0 else 0.0
-                bowling['dot_ball_percentage'] = round((bowling['dots'] / bowling['balls_bowled']) * 100, 2) if bowling['balls_bowled'] > 0 else 0.0
-                bowling['overs'] = f"{bowling['balls_bowled'] // 6}.{bowling['balls_bowled'] % 6}"
-            else:
-                bowling['average'] = 0.0
-                bowling['economy'] = 0.0
-                bowling['strike_rate'] = 0.0
-                bowling['dot_ball_percentage'] = 0.0
-                bowling['overs'] = "0.0"
-        
-        # Generate summary statistics
-        total_matches = len(matches)
-        unique_players = len(player_analytics)
-        formats_covered = len(set([m.get('format', 'Unknown') for m in matches]))
-        tournaments_covered = len(set([m.get('tournament', 'Unknown') for m in matches]))
-        
-        summary = {
-            'total_matches': total_matches,
-            'unique_players': unique_players,
-            'formats_covered': formats_covered,
-            'tournaments_covered': tournaments_covered,
-            'date_range': {
-                'from': min([m.get('date', '') for m in matches]) if matches else '',
-                'to': max([m.get('date', '') for m in matches]) if matches else ''
-            }
-        }
+        if not any((player, format, tournament, season, date_from, date_to)):
+            materialized = await load_materialized_analytics(team)
+            if materialized is not None:
+                return materialized
         
-        return {
-            'players': list(player_analytics.values()),
-            'summary': summary
-        }
+        query = analytics_query(team, player, format, tournament, season, date_from, date_to, match)
+        return await aggregate_player_analytics(query)
         
     except Exception as e:
         logging.error(f"Error getting analytics data: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@api_router.get("/analytics/players")
+@cached_endpoint("analytics-players")
+async def get_players_analytics(
+    players: List[str] = Query([]),
+    format: Optional[str] = None,
+    tournament: Optional[str] = None,
+    season: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    team: str = DEFAULT_SQUAD,
+    match: str = "exact"
+):
+    """Get the analytics of several players of a tracked squad under shared filters in one request
+    
+    players repeats per canonical player name (?players=A&players=B); the response maps
+    each requested name to the same analytics /api/analytics lists for that player,
+    or null when no records match.
+    """
+    check_text_match(match)
+    if team not in SQUADS:
+        raise HTTPException(status_code=404, detail=f"{team} is not a tracked squad")
+    players = list(dict.fromkeys(name.strip() for name in players if name.strip()))
+    if not players:
+        raise HTTPException(status_code=400, detail="players must name at least one player")
+    if len(players) > ANALYTICS_BATCH_MAX_PLAYERS:
+        raise HTTPException(status_code=400, detail=f"At most {ANALYTICS_BATCH_MAX_PLAYERS} players per request")
+    try:
+        query = analytics_query(None, None, format, tournament, season, date_from, date_to, match)
+        return {"players": await batch_player_analytics(team, players, query)}
+        
+    except Exception as e:
+        logging.error(f"Error getting analytics of {len(players)} players: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @api_router.get("/analytics/filters")
+@cached_endpoint("analytics-filters")
 async def get_analytics_filters():
     """Get available filter options for analytics"""
     try:
@@ -1287,35 +3103,92 @@ async def get_analytics_filters():
         logging.error(f"Error getting analytics filters: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+async def compute_stats() -> Dict[str, Any]:
+    """Record / player counts for /stats"""
+    total_matches = await db.matches.count_documents({})
+    total_players = len(await db.matches.distinct("player_name"))
+    
+    # Recent matches
+    recent_matches = await db.matches.find().sort("date", -1).limit(5).to_list(5)
+    
+    return {
+        "total_matches": total_matches,
+        "total_players": total_players,
+        "recent_matches": len(recent_matches)
+    }
+
 @api_router.get("/stats")
 async def get_stats():
-    """Get overall statistics"""
+    """Get overall statistics
+    
+    The counts come from response_cache (one computation per data generation); last_updated
+    is stamped on every response, so it is not served through cached_endpoint.
+    """
     try:
-        total_matches = await db.matches.count_documents({})
-        total_players = len(await db.matches.distinct("player_name"))
-        
-        # Recent matches
-        recent_matches = await db.matches.find().sort("date", -1).limit(5).to_list(5)
-        
-        return {
-            "total_matches": total_matches,
-            "total_players": total_players,
-            "recent_matches": len(recent_matches),
-            "last_updated": datetime.utcnow()
-        }
+        body, _ = await response_cache.get("stats", compute_stats)
+        return {**json.loads(body), "last_updated": datetime.utcnow()}
     except Exception as e:
         logging.error(f"Error getting stats: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@api_router.get("/cache-stats")
+async def get_cache_stats():
+    """Get response cache size, hit / miss / coalesced counters and the data generation"""
+    return response_cache.stats()
+
+@api_router.get("/latency")
+async def get_latency():
+    """Get API request latency percentiles over the most recent requests"""
+    samples = sorted(request_latencies)
+    if not samples:
+        return {"count": 0, "p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+    
+    def percentile(fraction: float) -> float:
+        return round(samples[min(len(samples) - 1, int(fraction * len(samples)))] * 1000, 2)
+    
+    return {
+        "count": len(samples),
+        "p50_ms": percentile(0.50),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+        "max_ms": round(samples[-1] * 1000, 2)
+    }
+
 # Include the router in the main app
 app.include_router(api_router)
 
+# Serve index.html at root
+@app.get("/")
+async def serve_index():
+    return FileResponse(STATIC_DIR / "index.html")
+
+# Catch-all for React client-side routing - registered after the API router so it
+# doesn't shadow GET /api/* routes
+@app.get("/{full_path:path}")
+async def serve_static_or_index(full_path: str):
+    file_path = STATIC_DIR / full_path
+    if file_path.exists():
+        return FileResponse(file_path)
+    return FileResponse(STATIC_DIR / "index.html")
+
+# Rolling window of /api request durations (seconds) for /api/latency
+request_latencies = deque(maxlen=int(os.environ.get('LATENCY_WINDOW', 2000)))
+
+@app.middleware("http")
+async def record_request_latency(request, call_next):
+    started = time.perf_counter()
+    response = await call_next(request)
+    if request.url.path.startswith("/api/"):
+        request_latencies.append(time.perf_counter() - started)
+    return response
+
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
     allow_origins=["*"],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
 
 # Configure logging
@@ -1325,6 +3198,76 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def create_db_indexes():
+    try:
+        await ensure_indexes()
+        await load_squad_person_ids()
+        # One-off build of the materialized analytics for data synced before player_stats existed
+        if not await db.player_stats.count_documents({}, limit=1) and await db.matches.count_documents({}, limit=1):
+            logging.info(f"Built player stats for {await refresh_player_stats()} players")
+    except Exception as e:
+        logging.error(f"Error creating database indexes: {e}")
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    for job in sync_jobs.values():
+        if job.active:
+            job.cancel_event.set()
+            if job.task is not None:
+                job.task.cancel()
     client.close()
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+
+# Command-line entry point for offline maintenance: python app.py ingest <directory>
+cli = typer.Typer(help="Mumbai Indians Player Tracker maintenance commands")
+
+@cli.callback()
+def cli_main():
+    """Mumbai Indians Player Tracker maintenance commands"""
+
+@cli.command()
+def ingest(
+    directory: Path = typer.Argument(..., exists=True, file_okay=False, help="Directory of Cricsheet ZIP archives and/or JSON match files (searched recursively)"),
+    workers: int = typer.Option(SYNC_WORKERS, "--workers", "-w", min=1, help="Parse processes (1 = parse in-process)"),
+    batch_size: int = typer.Option(INSERT_BATCH_SIZE, "--batch-size", "-b", min=1, help="Records per MongoDB bulk write"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Parse and count only - don't connect to MongoDB"),
+):
+    """Bulk-ingest local Cricsheet files into MongoDB without network access"""
+    paths = sorted(path for path in directory.rglob("*") if path.is_file() and path.suffix in ('.zip', '.json'))
+    if not paths:
+        typer.echo(f"No .zip or .json files found in {directory}", err=True)
+        raise typer.Exit(code=1)
+    
+    typer.echo(f"Ingesting {len(paths)} files from {directory} ({workers} worker(s), batch size {batch_size}{', dry run' if dry_run else ''})")
+    try:
+        result = asyncio.run(ingest_local_files(paths, workers, batch_size, dry_run))
+    finally:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=True)
+    
+    elapsed = max(result['elapsed_seconds'], 1e-9)
+    typer.echo(f"Matches read:        {result['files_processed']} ({result['files_prefiltered']} without squad players, {result['files_duplicate']} duplicates skipped)")
+    typer.echo(f"Records:             {result['records']}" + ("" if dry_run else f" ({result['inserted']} inserted, {result['updated']} updated, {result['unchanged']} unchanged)"))
+    typer.echo(f"Elapsed:             {elapsed:.2f}s (parse {result['parse_seconds']:.2f}s, write {result['write_seconds']:.2f}s)")
+    typer.echo(f"Throughput:          {result['files_processed'] / elapsed:.1f} matches/s, {result['records'] / elapsed:.1f} records/s, {result['bytes_read'] / elapsed / (1024 * 1024):.2f} MB/s")
+
+@cli.command("explain-filters")
+def explain_filters():
+    """Check that the exact / prefix text filters seek on their own indexes (exits 1 when one doesn't)"""
+    async def explain():
+        try:
+            await ensure_indexes()
+            return await explain_text_filters()
+        finally:
+            client.close()
+    
+    plans = asyncio.run(explain())
+    for name, index_name in plans.items():
+        typer.echo(f"{name:<26} {'IXSCAN ' + index_name if index_name else 'no bounded index scan'}")
+    if not all(plans.values()):
+        raise typer.Exit(code=1)
+
+if __name__ == "__main__":
+    cli()
@@ -11,6 +11,24 @@ import { Users, BarChart3, Calendar, Zap, Download, Loader2, TrendingUp, Filter,
 
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
 const API = `${BACKEND_URL}/api`;
+// Players per /analytics/players request - the server's ANALYTICS_BATCH_MAX_PLAYERS default
+const ANALYTICS_BATCH_SIZE = 100;
+
+// Filtered analytics of every named player, split into requests of at most ANALYTICS_BATCH_SIZE players
+const fetchPlayersAnalytics = async (playerNames, filterParams) => {
+  const analytics = {};
+  for (let start = 0; start < playerNames.length; start += ANALYTICS_BATCH_SIZE) {
+    const playerParams = new URLSearchParams(filterParams);
+    playerNames.slice(start, start + ANALYTICS_BATCH_SIZE).forEach(name => playerParams.append('players', name));
+    
+    const response = await fetch(`${API}/analytics/players?${playerParams.toString()}`);
+    if (!response.ok) {
+      throw new Error(`Could not get filtered analytics (HTTP ${response.status})`);
+    }
+    Object.assign(analytics, (await response.json()).players);
+  }
+  return analytics;
+};
 
 function App() {
   const [players, setPlayers] = useState([]);
@@ -808,36 +826,31 @@ function App() {
       
       // ============ 2. INDIVIDUAL PLAYER SECTIONS ============
       
+      // If any filters are applied, fetch filtered analytics for all players in one request
+      const hasFilters = selectedFilters.format || selectedFilters.tournament || 
+                        selectedFilters.date_from || selectedFilters.date_to;
+      let filteredAnalytics = {};
+      
+      if (hasFilters && sortedPlayers.length > 0) {
+        const playerParams = new URLSearchParams();
+        if (selectedFilters.format) playerParams.append('format', selectedFilters.format);
+        if (selectedFilters.tournament) playerParams.append('tournament', selectedFilters.tournament);
+        if (selectedFilters.date_from) playerParams.append('date_from', selectedFilters.date_from);
+        if (selectedFilters.date_to) playerParams.append('date_to', selectedFilters.date_to);
+        
+        // A failed request fails the export rather than printing career stats as filtered ones
+        filteredAnalytics = await fetchPlayersAnalytics(sortedPlayers.map(player => player.player_name), playerParams);
+      }
+      
       for (let playerIndex = 0; playerIndex < sortedPlayers.length; playerIndex++) {
         const player = sortedPlayers[playerIndex];
         const playerOrder = getPlayerOrder(player.player_name);
         
         // Get filtered player data if filters are applied
         let filteredPlayerData = player;
-        
-        // If any filters are applied, fetch filtered analytics for this player
-        const hasFilters = selectedFilters.format || selectedFilters.tournament || 
-                          selectedFilters.date_from || selectedFilters.date_to;
-        
-        if (hasFilters) {
-          try {
-            const playerParams = new URLSearchParams();
-            playerParams.append('player', player.player_name);
-            if (selectedFilters.format) playerParams.append('format', selectedFilters.format);
-            if (selectedFilters.tournament) playerParams.append('tournament', selectedFilters.tournament);
-            if (selectedFilters.date_from) playerParams.append('date_from', selectedFilters.date_from);
-            if (selectedFilters.date_to) playerParams.append('date_to', selectedFilters.date_to);
-            
-            const analyticsResponse = await fetch(`${API}/analytics?${playerParams.toString()}`);
-            const filteredAnalytics = await analyticsResponse.json();
-            
-            if (filteredAnalytics.players && filteredAnalytics.players.length > 0) {
-              filteredPlayerData = filteredAnalytics.players[0]; // Get filtered stats
-              console.log(`Using filtered stats for ${player.player_name}`);
-            }
-          } catch (error) {
-            console.warn(`Could not get filtered analytics for ${player.player_name}, using original data`);
-          }
+        if (filteredAnalytics[player.player_name]) {
+          filteredPlayerData = filteredAnalytics[player.player_name]; // Get filtered stats
+          console.log(`Using filtered stats for ${player.player_name}`);
         }
         
         // Start new page for each player (except first)
@@ -1204,44 +1217,35 @@ function App() {
       XLSX.utils.book_append_sheet(workbook, summarySheet, 'Summary');
       
       // ============ 2. INDIVIDUAL PLAYER SHEETS ============
-      for (const player of sortedPlayers) {
-        const playerOrder = getPlayerOrder(player.player_name);
+      // Get filtered analytics for all players in one request using SAME logic as PDF export
+      const hasAnyFilters = selectedFilters.format || selectedFilters.tournament || 
+                           selectedFilters.date_from || selectedFilters.date_to ||
+                           playerSelectionFilters.format || playerSelectionFilters.tournament || 
+                           playerSelectionFilters.date_from || playerSelectionFilters.date_to;
+      let filteredAnalytics = {};
+      
+      if (hasAnyFilters && sortedPlayers.length > 0) {
+        const playerParams = new URLSearchParams();
         
-        // Get filtered player data using SAME logic as PDF export
-        let filteredPlayerData = player;
-        const hasAnyFilters = selectedFilters.format || selectedFilters.tournament || 
-                             selectedFilters.date_from || selectedFilters.date_to ||
-                             playerSelectionFilters.format || playerSelectionFilters.tournament || 
-                             playerSelectionFilters.date_from || playerSelectionFilters.date_to;
+        // Use player selection filters first, then fallback to analytics filters (SAME AS PDF)
+        if (playerSelectionFilters.format) playerParams.append('format', playerSelectionFilters.format);
+        else if (selectedFilters.format) playerParams.append('format', selectedFilters.format);
         
-        if (hasAnyFilters) {
-          try {
-            const playerParams = new URLSearchParams();
-            playerParams.append('player', player.player_name);
-            
-            // Use player selection filters first, then fallback to analytics filters (SAME AS PDF)
-            if (playerSelectionFilters.format) playerParams.append('format', playerSelectionFilters.format);
-            else if (selectedFilters.format) playerParams.append('format', selectedFilters.format);
-            
-            if (playerSelectionFilters.tournament) playerParams.append('tournament', playerSelectionFilters.tournament);
-            else if (selectedFilters.tournament) playerParams.append('tournament', selectedFilters.tournament);
-            
-            if (playerSelectionFilters.date_from) playerParams.append('date_from', playerSelectionFilters.date_from);
-            else if (selectedFilters.date_from) playerParams.append('date_from', selectedFilters.date_from);
-            
-            if (playerSelectionFilters.date_to) playerParams.append('date_to', playerSelectionFilters.date_to);
-            else if (selectedFilters.date_to) playerParams.append('date_to', selectedFilters.date_to);
-            
-            const analyticsResponse = await fetch(`${API}/analytics?${playerParams.toString()}`);
-            const filteredAnalytics = await analyticsResponse.json();
-            
-            if (filteredAnalytics.players && filteredAnalytics.players.length > 0) {
-              filteredPlayerData = filteredAnalytics.players[0];
-            }
-          } catch (error) {
-            console.warn(`Could not get filtered analytics for ${player.player_name}, using original data`);
-          }
-        }
+        if (playerSelectionFilters.tournament) playerParams.append('tournament', playerSelectionFilters.tournament);
+        else if (selectedFilters.tournament) playerParams.append('tournament', selectedFilters.tournament);
+        
+        if (playerSelectionFilters.date_from) playerParams.append('date_from', playerSelectionFilters.date_from);
+        else if (selectedFilters.date_from) playerParams.append('date_from', selectedFilters.date_from);
+        
+        if (playerSelectionFilters.date_to) playerParams.append('date_to', playerSelectionFilters.date_to);
+        else if (selectedFilters.date_to) playerParams.append('date_to', selectedFilters.date_to);
+        
+        filteredAnalytics = await fetchPlayersAnalytics(sortedPlayers.map(player => player.player_name), playerParams);
+      }
+      
+      for (const player of sortedPlayers) {
+        const playerOrder = getPlayerOrder(player.player_name);
+        const filteredPlayerData = filteredAnalytics[player.player_name] || player;
         
         // Get unique matches for this player using SAME filters as PDF export
         try {
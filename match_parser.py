@@ -0,0 +1,856 @@
+"""Squad config, player name resolution and Cricsheet match parsing
+
+Nothing here touches MongoDB or the web app, so the parse workers of the sync process
+pool import this module on its own instead of app.py.
+"""
+import json
+import logging
+import os
+import re
+from collections import defaultdict
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+# Same .env as app.py - the squad config below reads it
+load_dotenv(Path(__file__).parent / '.env')
+
+# Mumbai Indians 2025 squad
+MI_PLAYERS = [
+    # Retained players
+    "Jasprit Bumrah", "Suryakumar Yadav", "Hardik Pandya", "Rohit Sharma", "Tilak Varma",
+    # New acquisitions
+    "Trent Boult", "Deepak Chahar", "Will Jacks", "Naman Dhir", "Allah Ghazanfar",
+    "Mitchell Santner", "Ryan Rickelton", "Reece Topley", "Lizaad Williams", "Robin Minz",
+    "Karn Sharma", "Ashwani Kumar", "Shrijith Krishnan", "Raj Angad Bawa", "Satyanarayana Raju",
+    "Bevon Jacobs", "Arjun Tendulkar", "Vignesh Puthur", "Mujeeb Ur Rahman", "Corbin Bosch",
+    # Latest additions - 2025 season
+    "JM Bairstow", "RJ Gleeson", "Charith Asalanka"
+]
+
+# Alternative name mappings for player matching - COMPREHENSIVE MAPPING
+# No bare surnames: "Sharma" or "Kumar" alone names half a league, and alias hits on
+# the squad's rosters are what learn_squad_person_ids binds registry IDs from
+PLAYER_ALTERNATIVES = {
+    "Jasprit Bumrah": ["J Bumrah", "JJ Bumrah"],
+    "Suryakumar Yadav": ["SA Yadav"],
+    "Hardik Pandya": ["H Pandya", "HH Pandya"],
+    "Rohit Sharma": ["RG Sharma"],
+    "Tilak Varma": ["T Varma", "Tilak"],
+    "Trent Boult": ["TA Boult", "T Boult"],
+    "Deepak Chahar": ["D Chahar", "DL Chahar"],
+    "Will Jacks": ["WG Jacks", "W Jacks"],
+    "Mitchell Santner": ["MJ Santner", "M Santner"],
+    "Ryan Rickelton": ["R Rickelton", "RD Rickelton"],
+    "Reece Topley": ["RJW Topley", "R Topley"],
+    "Arjun Tendulkar": ["A Tendulkar"],
+    "Vignesh Puthur": ["V Puthur"],
+    "Satyanarayana Raju": ["PVSN Raju", "Satyanarayana"],
+    "Naman Dhir": ["N Dhir"],
+    "Allah Ghazanfar": ["A Ghazanfar"],
+    "Robin Minz": ["R Minz"],
+    "Karn Sharma": ["KV Sharma", "K Sharma"],
+    "Ashwani Kumar": ["A Kumar"],
+    "Shrijith Krishnan": ["S Krishnan"],
+    "Raj Angad Bawa": ["RA Bawa", "R Bawa"],
+    "Bevon Jacobs": ["B Jacobs"],
+    "Lizaad Williams": ["L Williams"],
+    "Mujeeb Ur Rahman": ["Mujeeb", "M Rahman", "Mujeeb Rahman"],
+    "Corbin Bosch": ["C Bosch"],
+    # Latest additions - 2025 season
+    "JM Bairstow": ["J Bairstow", "Jinny Bairstow"],
+    "RJ Gleeson": ["R Gleeson", "Richard Gleeson"],
+    "Charith Asalanka": ["C Asalanka", "KIC Asalanka"]
+}
+
+# Tracked squads - the MI squad above is always tracked, and SQUADS_FILE (JSON) can add more:
+# {"Chennai Super Kings": {"players": ["MS Dhoni", ...], "alternatives": {"MS Dhoni": ["Dhoni"]}}, ...}
+DEFAULT_SQUAD = "Mumbai Indians"
+SQUADS_FILE = os.environ.get('SQUADS_FILE')
+
+def load_squad_config() -> Dict[str, Dict[str, Any]]:
+    squads = {DEFAULT_SQUAD: {'players': MI_PLAYERS, 'alternatives': PLAYER_ALTERNATIVES}}
+    if SQUADS_FILE:
+        with open(SQUADS_FILE) as f:
+            for team, squad in json.load(f).items():
+                squads[team] = {
+                    'players': list(squad.get('players', [])),
+                    'alternatives': dict(squad.get('alternatives', {}))
+                }
+    return squads
+
+SQUADS = load_squad_config()
+
+# Opt-in: keep a per-ball log for each player on their match records (bigger records and summaries)
+BALL_BY_BALL = os.environ.get('BALL_BY_BALL', '0') == '1'
+
+def normalize_player_name(name: str) -> str:
+    """Normalize player name for better matching"""
+    if not name:
+        return ""
+    
+    # Remove common prefixes and suffixes
+    name = name.strip()
+    name = name.replace("(c)", "").replace("(wk)", "").replace("†", "").replace("*", "")
+    name = name.strip()
+    
+    return name
+
+def _trigrams(text: str) -> set:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+class PlayerNameResolver:
+    """Squad name resolver built once from the squad config
+    
+    Exact names and aliases resolve through a precomputed alias -> canonical map,
+    results are memoized per (name, teams context), and the fuzzy fallback only
+    scores squad names sharing a name token or character trigram with the input.
+    
+    When the squad's Cricsheet registry IDs are known (set_person_ids), identify()
+    resolves match participants by person ID first and only falls back to names
+    for players without a known ID.
+    """
+    MEMO_MAX_SIZE = 50000
+    FUZZY_THRESHOLD = 0.9
+    
+    def __init__(self, players: List[str], alternatives: Dict[str, List[str]], team: str = "Mumbai Indians"):
+        self.players = list(players)
+        self.team = team
+        
+        # Same precedence as the old linear scan: squad names first, then
+        # alternatives in config order (first canonical to claim an alias wins)
+        self.alias_map: Dict[str, str] = {}
+        for player in self.players:
+            self.alias_map.setdefault(player, player)
+        for canonical_name, alias_list in alternatives.items():
+            self.alias_map.setdefault(canonical_name, canonical_name)
+            for alias in alias_list:
+                self.alias_map.setdefault(alias, canonical_name)
+        
+        # Fuzzy index over the lowercased squad names
+        self._lowered = [player.lower() for player in self.players]
+        self._parts = [set(name.split()) for name in self._lowered]
+        self._min_length = min((len(name) for name in self._lowered), default=0)
+        self._token_index: Dict[str, set] = defaultdict(set)
+        self._trigram_index: Dict[str, set] = defaultdict(set)
+        for position, name in enumerate(self._lowered):
+            for part in self._parts[position]:
+                self._token_index[part].add(position)
+            for trigram in _trigrams(name):
+                self._trigram_index[trigram].add(position)
+        
+        self._memo: Dict[tuple, str] = {}
+        self._squad = set(self.alias_map.values())
+        self.set_person_ids({})
+        self.reset_stats()
+    
+    def set_person_ids(self, person_ids: Dict[str, str]):
+        """Install the squad's registry IDs (person ID -> squad name); IDs of non-squad names are ignored"""
+        self.person_ids = {person_id: name for person_id, name in person_ids.items() if name in self._squad}
+        self._players_with_ids = set(self.person_ids.values())
+    
+    def reset_stats(self):
+        self.memo_hits = 0
+        self.memo_misses = 0
+        self.alias_hits = 0
+        self.fuzzy_lookups = 0
+        self.fuzzy_candidates_scored = 0
+        self.fuzzy_matches = 0
+        self.id_hits = 0
+        self.id_rejections = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.memo_hits + self.memo_misses
+        return {
+            'memo_hits': self.memo_hits,
+            'memo_misses': self.memo_misses,
+            'memo_hit_rate': round(self.memo_hits / lookups, 4) if lookups else 0.0,
+            'memo_size': len(self._memo),
+            'alias_hits': self.alias_hits,
+            'fuzzy_lookups': self.fuzzy_lookups,
+            'fuzzy_candidates_scored': self.fuzzy_candidates_scored,
+            'fuzzy_matches': self.fuzzy_matches,
+            'person_ids': len(self.person_ids),
+            'id_hits': self.id_hits,
+            'id_rejections': self.id_rejections
+        }
+    
+    def is_member(self, player_name: str) -> bool:
+        """Strict squad membership - exact name or alias only"""
+        return normalize_player_name(player_name) in self.alias_map
+    
+    def canonical(self, player_name: str, teams_in_match=None) -> str:
+        if not player_name:
+            return ""
+        
+        allow_fuzzy = bool(teams_in_match) and self.team in teams_in_match
+        key = (player_name, allow_fuzzy)
+        cached = self._memo.get(key)
+        if cached is not None:
+            self.memo_hits += 1
+            return cached
+        
+        self.memo_misses += 1
+        result = self._resolve(player_name, allow_fuzzy)
+        if len(self._memo) >= self.MEMO_MAX_SIZE:
+            self._memo.clear()
+        self._memo[key] = result
+        return result
+    
+    def identify(self, player_name: str, person_id: Optional[str] = None, teams_in_match=None, strict: bool = False) -> Optional[str]:
+        """Squad name of a match participant, or None if they aren't in the squad
+        
+        A known registry ID decides on its own. Otherwise the name is resolved (exact
+        names and aliases only when strict, as for roster checks) - but a name that
+        resolves to a player whose ID is known, under a different ID, is someone else.
+        """
+        if person_id:
+            canonical_name = self.person_ids.get(person_id)
+            if canonical_name is not None:
+                self.id_hits += 1
+                return canonical_name
+        
+        if strict and not self.is_member(player_name):
+            return None
+        canonical_name = self.canonical(player_name, teams_in_match)
+        if canonical_name not in self._squad:
+            return None
+        if person_id and canonical_name in self._players_with_ids:
+            self.id_rejections += 1
+            return None
+        return canonical_name
+    
+    def _resolve(self, player_name: str, allow_fuzzy: bool) -> str:
+        normalized = normalize_player_name(player_name)
+        
+        canonical_name = self.alias_map.get(normalized)
+        if canonical_name is not None:
+            self.alias_hits += 1
+            return canonical_name
+        
+        # Only do fuzzy matching if the squad's team is one of the teams in the match
+        if allow_fuzzy:
+            match = self._fuzzy_match(normalized)
+            if match is not None:
+                return match
+        
+        return normalized  # Return as-is if no match found
+    
+    def _fuzzy_match(self, normalized: str) -> Optional[str]:
+        self.fuzzy_lookups += 1
+        lowered = normalized.lower()
+        parts = set(lowered.split())
+        
+        # A name can only match if it shares a token (>= 2 parts rule) or, for a
+        # >90% similarity, a common run of 3+ characters. That run is guaranteed
+        # once the two names total 8+ characters; shorter pairs are always scored.
+        candidates = set()
+        for part in parts:
+            candidates.update(self._token_index.get(part, ()))
+        for trigram in _trigrams(lowered):
+            candidates.update(self._trigram_index.get(trigram, ()))
+        if len(lowered) + self._min_length < 8:
+            candidates.update(
+                position for position, name in enumerate(self._lowered) if len(lowered) + len(name) < 8
+            )
+        
+        # Score in squad order so the first qualifying player wins, as before
+        for position in sorted(candidates):
+            self.fuzzy_candidates_scored += 1
+            
+            # Require at least 2 name parts to match
+            if len(parts.intersection(self._parts[position])) >= 2:
+                self.fuzzy_matches += 1
+                return self.players[position]
+            
+            # Or a very close match (90%+ similarity) - cheap upper bounds first
+            matcher = SequenceMatcher(None, lowered, self._lowered[position])
+            if (matcher.real_quick_ratio() > self.FUZZY_THRESHOLD
+                    and matcher.quick_ratio() > self.FUZZY_THRESHOLD
+                    and matcher.ratio() > self.FUZZY_THRESHOLD):
+                self.fuzzy_matches += 1
+                return self.players[position]
+        
+        return None
+
+# Built once at import from the squad config above - one resolver per tracked squad
+squad_resolvers: Dict[str, PlayerNameResolver] = {
+    team: PlayerNameResolver(squad['players'], squad['alternatives'], team) for team, squad in SQUADS.items()
+}
+player_resolver = squad_resolvers[DEFAULT_SQUAD]
+
+class SquadPrefilter:
+    """Raw-byte check for whether a match file can involve the squad at all
+    
+    Squad membership is an exact (normalized) name or alias match, and Cricsheet
+    writes every roster entry and delivery name as a JSON string, so a relevant
+    file must contain one of the aliases as a quoted string. Anything the byte
+    scan can't reason about - escape sequences, or the markers that
+    normalize_player_name strips - falls back to a full decode.
+    """
+    FALLBACK_MARKERS = (b'\\', b'\x00', b'(c)', b'(wk)', '†'.encode('utf-8'), b'*')
+    
+    def __init__(self, names: Iterable[str]):
+        needles = {name.encode('utf-8') for name in names if name}
+        self.pattern = re.compile(rb'"\s*' + self._trie_pattern(needles) + rb'\s*"')
+    
+    @staticmethod
+    def _trie_pattern(needles: Iterable[bytes]) -> bytes:
+        """Alternation factored by common prefixes, so a non-matching string fails within a byte or two"""
+        trie = {}
+        for needle in needles:
+            node = trie
+            for byte in needle:
+                node = node.setdefault(byte, {})
+            node[None] = {}
+        
+        def emit(node) -> bytes:
+            branches = [re.escape(bytes([byte])) + emit(child) for byte, child in sorted(
+                (byte, child) for byte, child in node.items() if byte is not None
+            )]
+            if not branches:
+                return b''
+            body = branches[0] if len(branches) == 1 else b'(?:' + b'|'.join(branches) + b')'
+            return b'(?:' + body + b')?' if None in node else body
+        
+        return b'(?:' + emit(trie) + b')'
+    
+    def may_involve_squad(self, raw: bytes) -> bool:
+        if self.pattern.search(raw):
+            return True
+        return any(marker in raw for marker in self.FALLBACK_MARKERS)
+
+def build_squad_prefilter() -> SquadPrefilter:
+    """One byte scan for every tracked squad's names, aliases and registry IDs"""
+    needles = []
+    for resolver in squad_resolvers.values():
+        needles.extend(resolver.alias_map)
+        # Registry IDs are quoted strings in the raw JSON too, so they extend the byte scan
+        needles.extend(resolver.person_ids)
+    return SquadPrefilter(needles)
+
+squad_prefilter = build_squad_prefilter()
+
+def may_involve_squad(raw_match: bytes) -> bool:
+    """Prefilter check against the current squad_prefilter (set_squad_person_ids replaces it)"""
+    return squad_prefilter.may_involve_squad(raw_match)
+
+def build_squad_index() -> Dict[str, set]:
+    """Squad names, aliases and registry IDs -> the tracked squads they belong to"""
+    index = defaultdict(set)
+    for team, resolver in squad_resolvers.items():
+        for key in list(resolver.alias_map) + list(resolver.person_ids):
+            index[key].add(team)
+    return dict(index)
+
+# Lets a match skip every squad none of its names or IDs belong to
+squad_index = build_squad_index()
+
+def squad_person_ids() -> Dict[str, Dict[str, str]]:
+    return {team: resolver.person_ids for team, resolver in squad_resolvers.items()}
+
+def set_squad_person_ids(person_ids: Dict[str, Dict[str, str]]):
+    """Switch the resolvers and prefilter to new squad registry IDs (team -> person ID -> name)"""
+    global squad_prefilter, squad_index
+    for team, resolver in squad_resolvers.items():
+        resolver.set_person_ids(person_ids.get(team, {}))
+    squad_prefilter = build_squad_prefilter()
+    squad_index = build_squad_index()
+
+def get_canonical_player_name(player_name: str, teams_in_match: set = None) -> str:
+    """Get the canonical Mumbai Indians player name from any variant"""
+    return player_resolver.canonical(player_name, teams_in_match)
+
+def is_mi_player(player_name: str) -> bool:
+    """Check if a player is in Mumbai Indians squad (strict matching only)"""
+    # NO fuzzy matching - only exact matches to prevent false positives
+    return player_resolver.is_member(player_name)
+
+SUMMARY_VERSION = 2  # bump when the summary layout changes - older cached summaries are re-parsed
+
+class BattingTally:
+    """Running batting totals for one name in a match, updated in place per delivery"""
+    __slots__ = ('runs', 'balls', 'fours', 'sixes', 'dots')
+    
+    def __init__(self):
+        self.runs = self.balls = self.fours = self.sixes = self.dots = 0
+    
+    def as_list(self) -> List[int]:
+        return [self.runs, self.balls, self.fours, self.sixes, self.dots]
+
+class BowlingTally:
+    """Running bowling totals for one name in a match, updated in place per delivery"""
+    __slots__ = ('runs_conceded', 'balls', 'wickets', 'dots')
+    
+    def __init__(self):
+        self.runs_conceded = self.balls = self.wickets = self.dots = 0
+    
+    def as_list(self) -> List[int]:
+        return [self.runs_conceded, self.balls, self.wickets, self.dots]
+
+def _tally_lists(tallies: Dict[Any, Any]) -> Dict[str, List[int]]:
+    """Convert per-name tallies to the compact list form stored in match summaries"""
+    lists = {}
+    for name, tally in tallies.items():
+        key = str(name)
+        if key in lists:
+            # Non-string names that stringify to an existing name are folded together
+            lists[key] = [a + b for a, b in zip(lists[key], tally.as_list())]
+        else:
+            lists[key] = tally.as_list()
+    return lists
+
+def summarize_match(json_data: Dict, idx: int = 0) -> Dict:
+    """Reduce a Cricsheet match to a compact, squad-independent summary
+    
+    The summary keeps the match info, rosters, registry, the quick-check delivery sample
+    and per-name delivery aggregates - everything derive_match_records needs - so it
+    can be cached and re-derived when the squad config changes.
+    """
+    # Step 1: Extract basic match info first
+    info_data = json_data.get('info', {})
+    
+    # Extract comprehensive match information
+    match_info = {
+        'dates': info_data.get('dates', ['Unknown']),
+        'teams': info_data.get('teams', ['Team1', 'Team2']),
+        'venue': info_data.get('venue', 'Unknown'),
+        'city': info_data.get('city', 'Unknown'),
+        'match_type': info_data.get('match_type', 'Unknown'),
+        'season': info_data.get('season', 'Unknown'),
+        'gender': info_data.get('gender', 'male'),
+        'outcome': info_data.get('outcome', {}),
+        'players': info_data.get('players', {}),
+        'registry': info_data.get('registry', {}),
+        'event': info_data.get('event', {})
+    }
+    
+    # Create unique match identifier
+    date_str = match_info['dates'][0] if isinstance(match_info['dates'], list) and match_info['dates'] else 'Unknown'
+    team1 = match_info['teams'][0] if isinstance(match_info['teams'], list) and len(match_info['teams']) > 0 else 'Team1'
+    team2 = match_info['teams'][1] if isinstance(match_info['teams'], list) and len(match_info['teams']) > 1 else 'Team2'
+    
+    summary = {
+        'summary_version': SUMMARY_VERSION,
+        'unique_match_id': f"{date_str}_{team1}_{team2}_{match_info['venue']}",
+        'match': {
+            'team1': team1,
+            'team2': team2,
+            'venue': match_info['venue'],
+            'city': match_info['city'],
+            'date': date_str,
+            'format': match_info['match_type'],
+            'tournament': match_info['event'].get('name', 'Unknown') if isinstance(match_info['event'], dict) else 'Unknown',
+            'season': match_info['season'],
+            'gender': match_info['gender'],
+            'match_result': match_info['outcome'].get('winner', 'Unknown') if isinstance(match_info['outcome'], dict) else 'Unknown'
+        },
+        'rosters': {},   # team -> roster names
+        'registry': {},
+        'sample': [],
+        'innings': 'ok',
+        'batting': {},   # name -> [runs, balls, fours, sixes, dots]
+        'bowling': {},   # name -> [runs_conceded, balls, wickets, dots]
+        'fielding': []   # [fielder, dismissal kind, batter, bowler] per fielder credited
+    }
+    
+    # Team rosters
+    if isinstance(match_info['players'], dict):
+        for team, player_list in match_info['players'].items():
+            if isinstance(player_list, list):
+                summary['rosters'][str(team)] = [player for player in player_list if isinstance(player, str)]
+    
+    registry_people = match_info['registry'].get('people') if isinstance(match_info['registry'], dict) else None
+    if isinstance(registry_people, dict):
+        summary['registry'] = {name: person_id for name, person_id in registry_people.items() if isinstance(person_id, str)}
+    
+    # Quick-check sample of delivery data, used when the rosters don't show squad players
+    innings_data = json_data.get('innings')
+    if isinstance(innings_data, list):
+        for inning in innings_data:
+            if isinstance(inning, dict) and 'overs' in inning:
+                overs_data = inning.get('overs', [])
+                if isinstance(overs_data, list):
+                    for over_data in overs_data[:5]:  # Sample first 5 overs for quick check
+                        if isinstance(over_data, dict) and 'deliveries' in over_data:
+                            deliveries = over_data.get('deliveries', [])
+                            if isinstance(deliveries, list):
+                                for delivery in deliveries[:6]:  # Sample first 6 deliveries
+                                    if isinstance(delivery, dict):
+                                        batter = delivery.get('batter', '')
+                                        bowler = delivery.get('bowler', '')
+                                        summary['sample'].append([str(batter) if batter else '', str(bowler) if bowler else ''])
+    
+    if 'innings' not in json_data or not json_data['innings']:
+        summary['innings'] = 'missing'
+        return summary
+    if not isinstance(innings_data, list):
+        summary['innings'] = 'invalid'
+        return summary
+    
+    # Step 4: Aggregate delivery-level data per name - one in-place tally update per delivery
+    batting = {}
+    bowling = {}
+    fielding = summary['fielding']
+    balls = [] if BALL_BY_BALL else None
+    
+    # Process each inning
+    for inning_idx, inning in enumerate(innings_data):
+        if not isinstance(inning, dict) or 'overs' not in inning:
+            continue
+        
+        overs_data = inning.get('overs', [])
+        
+        if not isinstance(overs_data, list):
+            continue
+        
+        # Process each over and delivery
+        for over_idx, over_data in enumerate(overs_data):
+            if not isinstance(over_data, dict) or 'deliveries' not in over_data:
+                continue
+            
+            deliveries = over_data.get('deliveries', [])
+            
+            if not isinstance(deliveries, list):
+                continue
+            
+            for delivery_idx, delivery in enumerate(deliveries):
+                if not isinstance(delivery, dict):
+                    continue
+                
+                # Extract delivery-level information
+                batter = delivery.get('batter', '')
+                bowler = delivery.get('bowler', '')
+                runs = delivery.get('runs', {})
+                wickets = delivery.get('wickets', [])
+                if isinstance(runs, dict):
+                    runs_batter = runs.get('batter', 0)
+                    runs_total = runs.get('total', 0)
+                else:
+                    runs_batter = runs_total = 0
+                wicket_count = len(wickets) if isinstance(wickets, list) else 0
+                
+                if batter:
+                    tally = batting.get(batter)
+                    if tally is None:
+                        tally = batting[batter] = BattingTally()
+                    tally.runs += runs_batter
+                    tally.balls += 1
+                    if runs_batter == 4:
+                        tally.fours += 1
+                    elif runs_batter == 6:
+                        tally.sixes += 1
+                    elif runs_batter == 0:
+                        tally.dots += 1
+                
+                if bowler:
+                    tally = bowling.get(bowler)
+                    if tally is None:
+                        tally = bowling[bowler] = BowlingTally()
+                    tally.runs_conceded += runs_total
+                    tally.balls += 1
+                    tally.wickets += wicket_count
+                    if runs_total == 0:
+                        tally.dots += 1
+                
+                if balls is not None:
+                    balls.append([
+                        inning_idx + 1, over_data.get('over', over_idx), delivery_idx + 1,
+                        str(batter) if batter else '', str(bowler) if bowler else '',
+                        runs_batter, runs_total, wicket_count
+                    ])
+                
+                # Fielding (in wickets)
+                if wicket_count:
+                    for wicket in wickets:
+                        if isinstance(wicket, dict):
+                            fielders = wicket.get('fielders', [])
+                            if isinstance(fielders, list):
+                                for fielder in fielders:
+                                    if isinstance(fielder, dict):
+                                        fielder_name = fielder.get('name', '')
+                                        if fielder_name:
+                                            fielding.append([
+                                                str(fielder_name),
+                                                wicket.get('kind', 'unknown'),
+                                                str(batter) if batter else '',
+                                                str(bowler) if bowler else ''
+                                            ])
+    
+    summary['batting'] = _tally_lists(batting)
+    summary['bowling'] = _tally_lists(bowling)
+    if balls is not None:
+        summary['balls'] = balls
+    
+    return summary
+
+def derive_match_records(summary: Dict, processed_matches: Optional[set] = None) -> Tuple[str, List[Dict]]:
+    """Build the match records of every tracked squad for a match summary
+    
+    One pass over the (already summarized) match serves all squads. Returns the unique
+    match id together with the match records, so callers (the serial loop or
+    process-pool workers) can dedup across matches.
+    """
+    unique_match_id = summary['unique_match_id']
+    
+    # Skip if already processed
+    if processed_matches is not None:
+        if unique_match_id in processed_matches:
+            return unique_match_id, []
+        processed_matches.add(unique_match_id)
+    
+    # Squad membership is strict (names, aliases, registry IDs), so one lookup per name
+    # narrows the squads down before any per-squad work
+    candidate_teams = set()
+    names = {name for roster in summary['rosters'].values() for name in roster}
+    names.update(name for pair in summary['sample'] for name in pair if name)
+    for name in names:
+        candidate_teams.update(squad_index.get(normalize_player_name(name), ()))
+    for person_id in summary['registry'].values():
+        candidate_teams.update(squad_index.get(person_id, ()))
+    
+    all_matches = []
+    for team, resolver in squad_resolvers.items():
+        if team in candidate_teams:
+            all_matches.extend(_derive_squad_records(summary, resolver))
+    return unique_match_id, all_matches
+
+def _derive_squad_records(summary: Dict, resolver: PlayerNameResolver) -> List[Dict]:
+    """Match records for one squad's players, with the squad's current config"""
+    unique_match_id = summary['unique_match_id']
+    match_fields = summary['match']
+    all_matches = []
+    
+    # Step 2: Check if ANY of the squad's players are in this match
+    mi_players_in_match = set()
+    teams_in_match = {match_fields['team1'], match_fields['team2']}
+    registry = summary['registry']
+    person_ids = {}    # squad name -> registry ID in this match
+    player_teams = {}  # squad name -> team whose roster lists them
+    
+    def identify(name: str, strict: bool = False) -> Optional[str]:
+        # Registry ID first (O(1) per name), squad names and aliases as the fallback
+        person_id = registry.get(name)
+        canonical_name = resolver.identify(name.strip(), person_id, teams_in_match, strict=strict)
+        if canonical_name is not None and person_id:
+            person_ids.setdefault(canonical_name, person_id)
+        return canonical_name
+    
+    # Check team rosters first
+    for team, roster in summary['rosters'].items():
+        for player in roster:
+            canonical_name = identify(player, strict=True)
+            if canonical_name is not None:
+                mi_players_in_match.add(canonical_name)
+                player_teams.setdefault(canonical_name, team)
+    
+    # Then everyone else in the registry (substitutes etc.) whose ID is a known squad ID
+    if not mi_players_in_match:
+        for name, person_id in registry.items():
+            if person_id in resolver.person_ids:
+                mi_players_in_match.add(identify(name))
+    
+    # If no MI players found yet, check the sampled delivery data
+    if not mi_players_in_match:
+        for batter, bowler in summary['sample']:
+            for name in (batter, bowler):
+                canonical_name = identify(name, strict=True) if name else None
+                if canonical_name is not None:
+                    mi_players_in_match.add(canonical_name)
+            
+            if mi_players_in_match:  # Found MI players, can proceed
+                break
+    
+    # If still no MI players found, skip this match
+    if not mi_players_in_match:
+        return []
+    
+    logging.info(f"Found {resolver.team} players in match {unique_match_id}: {mi_players_in_match}")
+    
+    # Step 3: Even without detailed innings data, create basic match records
+    if summary['innings'] == 'missing':
+        for player_name in sorted(mi_players_in_match):
+            all_matches.append({
+                'player_name': player_name,
+                'match_id': unique_match_id,
+                'team': resolver.team,
+                'player_id': person_ids.get(player_name),
+                'player_team': player_teams.get(player_name),
+                **match_fields,
+                'batting_stats': None,
+                'bowling_stats': None,
+                'fielding_stats': None,
+                'total_deliveries_involved': 0
+            })
+        return all_matches
+    
+    if summary['innings'] != 'ok':
+        return all_matches
+    
+    # Step 4: Route the per-name aggregates to the MI players they resolve to
+    resolved_names = {}
+    
+    def resolve(name: str) -> Optional[str]:
+        if not name:
+            return None
+        if name not in resolved_names:
+            resolved_names[name] = identify(name)
+        return resolved_names[name]
+    
+    player_data = {
+        player: {'batting': None, 'bowling': None, 'dismissals': [], 'total_deliveries': 0}
+        for player in mi_players_in_match
+    }
+    
+    for name, stats in summary['batting'].items():
+        data = player_data.get(resolve(name))
+        if data is not None:
+            data['batting'] = stats if data['batting'] is None else [a + b for a, b in zip(data['batting'], stats)]
+            data['total_deliveries'] += stats[1]
+    
+    for name, stats in summary['bowling'].items():
+        data = player_data.get(resolve(name))
+        if data is not None:
+            data['bowling'] = stats if data['bowling'] is None else [a + b for a, b in zip(data['bowling'], stats)]
+            data['total_deliveries'] += stats[1]
+    
+    for fielder, dismissal_type, batter, bowler in summary['fielding']:
+        canonical_fielder = resolve(fielder)
+        data = player_data.get(canonical_fielder)
+        if data is not None:
+            data['dismissals'].append(dismissal_type)
+            if canonical_fielder not in (resolve(batter), resolve(bowler)):
+                data['total_deliveries'] += 1
+    
+    # Step 5: Create comprehensive match records
+    for player in sorted(player_data):
+        data = player_data[player]
+        
+        # Calculate batting stats
+        batting_stats = None
+        if data['batting']:
+            total_runs, total_balls, fours, sixes, dots = data['batting']
+            batting_stats = {
+                'runs': total_runs,
+                'balls': total_balls,
+                'fours': fours,
+                'sixes': sixes,
+                'dots': dots,
+                'strike_rate': round((total_runs / total_balls * 100), 2) if total_balls > 0 else 0.0
+            }
+        
+        # Calculate bowling stats
+        bowling_stats = None
+        if data['bowling']:
+            runs_conceded, balls_bowled, wickets, dots = data['bowling']
+            bowling_stats = {
+                'runs_conceded': runs_conceded,
+                'balls_bowled': balls_bowled,
+                'wickets': wickets,
+                'dots': dots,
+                'economy': round((runs_conceded / (balls_bowled / 6)), 2) if balls_bowled > 0 else 0.0,
+                'overs': f"{balls_bowled // 6}.{balls_bowled % 6}",
+                'strike_rate': round((balls_bowled / wickets), 2) if wickets > 0 else 0.0
+            }
+        
+        # Calculate fielding stats - CORRECTED for proper Cricsheet dismissal types
+        fielding_stats = None
+        if data['dismissals']:
+            dismissals = [dismissal_type.lower() for dismissal_type in data['dismissals']]
+            
+            # Correct parsing based on actual Cricsheet dismissal types
+            catches = dismissals.count('caught')
+            run_outs = dismissals.count('run out')
+            stumpings = dismissals.count('stumped')
+            
+            # Other fielding-related dismissals
+            other_fielding = dismissals.count('hit wicket') + dismissals.count('obstructing the field')
+            
+            fielding_stats = {
+                'catches': catches,
+                'run_outs': run_outs, 
+                'stumpings': stumpings,
+                'other_fielding': other_fielding,
+                'total_dismissals': len(dismissals)
+            }
+            
+            # Debug output for verification
+            if catches > 0 or run_outs > 0 or stumpings > 0:
+                print(f"FIELDING STATS for {player}: Catches={catches}, Run outs={run_outs}, Stumpings={stumpings}, Total={len(dismissals)}")
+        
+        # Create comprehensive match record
+        match_record = {
+            'player_name': player,
+            'match_id': unique_match_id,
+            'team': resolver.team,
+            'player_id': person_ids.get(player),
+            'player_team': player_teams.get(player),
+            **match_fields,
+            'batting_stats': batting_stats,
+            'bowling_stats': bowling_stats,
+            'fielding_stats': fielding_stats,
+            'total_deliveries_involved': data['total_deliveries']
+        }
+        if 'balls' in summary:
+            match_record['ball_by_ball'] = [
+                {
+                    'inning': inning, 'over': over, 'delivery': ball,
+                    'role': 'batting' if resolve(batter) == player else 'bowling',
+                    'runs_batter': runs_batter, 'runs_total': runs_total, 'wickets': wickets
+                }
+                for inning, over, ball, batter, bowler, runs_batter, runs_total, wickets in summary['balls']
+                if player in (resolve(batter), resolve(bowler))
+            ]
+        all_matches.append(match_record)
+    
+    return all_matches
+
+def process_match(json_data: Dict, idx: int = 0, processed_matches: Optional[set] = None) -> Tuple[str, List[Dict]]:
+    """Extract ALL datapoints for MI players from a single match"""
+    return derive_match_records(summarize_match(json_data, idx), processed_matches)
+
+def _load_match(item: Any) -> Dict:
+    """Decode a raw ZIP member into a match dict (already decoded dicts pass through)"""
+    if isinstance(item, (bytes, bytearray)):
+        return json.loads(item)
+    return item
+
+def _process_item(item: Any, idx: int, processed_matches: set) -> Tuple[str, List[Dict], Optional[str], Dict]:
+    """Derive match records for one input item
+    
+    Items are raw JSON bytes or match dicts, or (member_key, payload) pairs from
+    iter_archive_members where the payload may be a cached match summary. Returns
+    (unique_match_id, records, member_key, summary).
+    """
+    member_key = None
+    if isinstance(item, tuple):
+        member_key, item = item
+    if isinstance(item, dict) and 'summary_version' in item:
+        summary = item
+    else:
+        summary = summarize_match(_load_match(item), idx)
+    unique_match_id, records = derive_match_records(summary, processed_matches)
+    return unique_match_id, records, member_key, summary
+
+def _process_match_chunk(
+    chunk: List[Any],
+    start_idx: int,
+    person_ids: Optional[Dict[str, Dict[str, str]]] = None
+) -> List[Tuple[str, List[Dict], Optional[str], Dict]]:
+    """Process-pool entry point - decode and process a chunk of matches in order
+    
+    person_ids carries the parent's squad registry IDs, which workers don't load themselves.
+    """
+    if person_ids is not None and person_ids != squad_person_ids():
+        set_squad_person_ids(person_ids)
+    results = []
+    processed_matches = set()
+    for offset, item in enumerate(chunk):
+        idx = start_idx + offset
+        try:
+            results.append(_process_item(item, idx, processed_matches))
+        except Exception as e:
+            logging.error(f"Error processing JSON file {idx}: {e}")
+    return results
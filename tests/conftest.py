@@ -0,0 +1,47 @@
+import asyncio
+import os
+import sys
+import uuid
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+# app.py reads these at import - every test installs its own scratch database as app.db
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "mi_tracker_test")
+
+import app  # noqa: E402
+
+
+@pytest.fixture
+def mock_db(monkeypatch):
+    """Fresh in-memory (mongomock) database installed as app.db"""
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    db = mongomock_motor.AsyncMongoMockClient()[f"mi_tracker_test_{uuid.uuid4().hex[:8]}"]
+    monkeypatch.setattr(app, "db", db)
+    return db
+
+
+@pytest.fixture
+def run_with_mongo(monkeypatch):
+    """Run an async test body against a throwaway database on the TEST_MONGO_URL server
+    
+    For what only a real server can show (explain() plans); skipped when TEST_MONGO_URL isn't set.
+    """
+    url = os.environ.get("TEST_MONGO_URL")
+    if not url:
+        pytest.skip("TEST_MONGO_URL is not set")
+    
+    def run(body):
+        async def main():
+            client = app.AsyncIOMotorClient(url)
+            db = client[f"mi_tracker_test_{uuid.uuid4().hex[:8]}"]
+            monkeypatch.setattr(app, "db", db)
+            try:
+                return await body(db)
+            finally:
+                await client.drop_database(db.name)
+                client.close()
+        return asyncio.run(main())
+    return run
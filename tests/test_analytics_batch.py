@@ -0,0 +1,30 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+import app
+
+SQUAD = ["Rohit Sharma", "Jasprit Bumrah", "Hardik Pandya", "Suryakumar Yadav", "Tilak Varma"]
+
+
+def test_batches_over_the_limit_are_rejected(mock_db, monkeypatch):
+    monkeypatch.setattr(app, "ANALYTICS_BATCH_MAX_PLAYERS", 4)
+    response = TestClient(app.app).get("/api/analytics/players", params={"players": SQUAD})
+    assert response.status_code == 400
+    assert "At most 4 players" in response.json()["detail"]
+
+
+def test_chunked_batches_cover_the_squad(mock_db, monkeypatch):
+    monkeypatch.setattr(app, "ANALYTICS_BATCH_MAX_PLAYERS", 2)
+    asyncio.run(mock_db.player_stats.insert_many([
+        {"_id": app.player_stats_key(app.DEFAULT_SQUAD, name), "player_name": name, "total_matches": 3}
+        for name in SQUAD[1:]
+    ]))
+    client = TestClient(app.app)
+    
+    analytics = {}
+    for start in range(0, len(SQUAD), 2):
+        response = client.get("/api/analytics/players", params={"players": SQUAD[start:start + 2]})
+        assert response.status_code == 200
+        analytics.update(response.json()["players"])
+    assert analytics == {name: {"player_name": name, "total_matches": 3} if name != "Rohit Sharma" else None for name in SQUAD}
@@ -0,0 +1,102 @@
+import asyncio
+import contextlib
+import functools
+import io
+import json
+import threading
+import zipfile
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import app
+
+SQUAD_PLAYERS = ["JJ Bumrah", "RG Sharma", "SA Yadav"]
+OTHER_PLAYERS = [f"X Player{number}" for number in range(6)]
+
+
+def match_json(number, squad=True):
+    home = app.DEFAULT_SQUAD if squad else "Team A"
+    home_players = SQUAD_PLAYERS if squad else OTHER_PLAYERS[3:]
+    deliveries = [
+        {"batter": home_players[ball % 2], "bowler": OTHER_PLAYERS[0], "non_striker": home_players[(ball + 1) % 2],
+         "runs": {"batter": ball % 3, "extras": 0, "total": ball % 3}}
+        for ball in range(6)
+    ]
+    return json.dumps({
+        "meta": {},
+        "info": {
+            "dates": [f"2024-04-{number:02d}"], "teams": [home, "Team B"], "venue": f"Venue {number}",
+            "match_type": "T20", "season": "2024", "gender": "male", "event": {"name": "Indian Premier League"},
+            "players": {home: home_players, "Team B": OTHER_PLAYERS[:3]}
+        },
+        "innings": [{"team": home, "overs": [{"over": 0, "deliveries": deliveries}]}]
+    })
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def cricsheet(tmp_path, mock_db, monkeypatch):
+    """Local Cricsheet stand-in serving one archive - returns the member names of its squad matches"""
+    with zipfile.ZipFile(tmp_path / "ipl_male_json.zip", "w") as archive:
+        for number in range(1, 4):
+            archive.writestr(f"{number}.json", match_json(number))
+        archive.writestr("4.json", match_json(4, squad=False))
+        # A squad name, so it gets past the prefilter, in a member that does not decode
+        archive.writestr("5.json", '{"info": {"players": {"Mumbai Indians": ["RG Sharma"]}')
+        archive.writestr("README.txt", "Cricsheet stand-in")
+    
+    server = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(QuietHandler, directory=str(tmp_path)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(app, "CRICSHEET_BASE_URL", f"http://127.0.0.1:{server.server_port}")
+    monkeypatch.setattr(app, "CRICSHEET_ARCHIVES", ["ipl_male_json.zip"])
+    monkeypatch.setattr(app, "archive_cache", None)
+    
+    async def no_op(*args, **kwargs):
+        return 0
+    # Player stats and registry learning are beside the point here (and use operators mongomock lacks)
+    monkeypatch.setattr(app, "refresh_player_stats", no_op)
+    monkeypatch.setattr(app, "learn_squad_person_ids", no_op)
+    
+    yield ["1.json", "2.json", "3.json"]
+    server.shutdown()
+    server.server_close()
+
+
+def incremental_sync():
+    job = app.SyncJob(incremental=True)
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = asyncio.run(app.download_and_process_cricsheet_data(incremental=True, job=job))
+    assert result["success"]
+    return job.counters
+
+
+def manifest(db):
+    return asyncio.run(db.ingested_files.distinct("_id"))
+
+
+def test_second_sync_skips_exactly_the_ingested_members(cricsheet, mock_db):
+    first = incremental_sync()
+    assert sorted(manifest(mock_db)) == cricsheet
+    assert (first["files_processed"], first["files_skipped"], first["files_prefiltered"]) == (5, 0, 1)
+    records = asyncio.run(mock_db.matches.count_documents({}))
+    assert records == 3 * len(SQUAD_PLAYERS)
+    
+    # Forget the archive's validators so the unchanged archive is downloaded again
+    asyncio.run(mock_db.archive_state.delete_many({}))
+    second = incremental_sync()
+    assert second["files_skipped"] == len(cricsheet)
+    # The prefiltered and the broken member were never recorded, so they are read again
+    assert (second["files_processed"], second["files_prefiltered"]) == (2, 1)
+    assert sorted(manifest(mock_db)) == cricsheet
+    assert asyncio.run(mock_db.matches.count_documents({})) == records
+
+
+def test_unchanged_archive_is_not_downloaded_again(cricsheet, mock_db):
+    incremental_sync()
+    # 304 on the stored validators - no member is read at all
+    assert incremental_sync() == app.SyncJob().counters
@@ -0,0 +1,84 @@
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app
+
+DATES = [f"2024-04-{day:02d}" for day in range(1, 13)]
+
+
+def match_record(number, player="Rohit Sharma"):
+    record = {
+        "player_name": player, "match_id": f"m{number:03d}", "team": app.DEFAULT_SQUAD,
+        "team1": "Mumbai Indians", "team2": "Chennai Super Kings", "venue": "Wankhede Stadium",
+        # Several records per date, so pages split same-day records on _id
+        "date": DATES[number % len(DATES)], "format": "T20", "tournament": "Indian Premier League"
+    }
+    record.update(app.keyword_fields(record))
+    return record
+
+
+@pytest.fixture
+def client(mock_db):
+    asyncio.run(mock_db.matches.insert_many(
+        [match_record(number) for number in range(84)] + [match_record(number, "Jasprit Bumrah") for number in range(84, 90)]
+    ))
+    return TestClient(app.app)
+
+
+def read_pages(client, path, limit):
+    pages, cursor = [], None
+    while True:
+        response = client.get(path, params={"limit": limit, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        pages.append([match["match_id"] for match in response.json()])
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return pages
+
+
+def test_pages_cover_every_record_once(client):
+    pages = read_pages(client, "/api/matches", 10)
+    match_ids = [match_id for page in pages for match_id in page]
+    assert [len(page) for page in pages] == [10] * 9
+    assert sorted(match_ids) == [f"m{number:03d}" for number in range(90)]
+
+
+def test_last_full_page_has_no_next_cursor(client):
+    response = client.get("/api/players/Jasprit Bumrah/matches", params={"limit": 6})
+    assert len(response.json()) == 6
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_player_pages_are_newest_first(client):
+    pages = read_pages(client, "/api/players/rohit sharma/matches", 25)
+    assert [len(page) for page in pages] == [25, 25, 25, 9]
+    dates = [match_record(int(match_id[1:]))["date"] for page in pages for match_id in page]
+    assert dates == sorted(dates, reverse=True)
+
+
+@pytest.mark.parametrize("limit", [0, app.MATCH_PAGE_MAX_SIZE + 1, -1])
+def test_unbounded_pages_have_to_stream(client, limit):
+    assert client.get("/api/matches", params={"limit": limit}).status_code == 400
+
+
+def test_invalid_cursor(client):
+    assert client.get("/api/matches", params={"cursor": "bm90LWEtY3Vyc29y"}).status_code == 400
+
+
+def test_stream_every_record(client):
+    response = client.get("/api/matches", params={"limit": 0, "stream": "true"})
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert len(lines) == 90 and all("match_id" in line for line in lines)
+
+
+def test_limited_stream_ends_with_next_cursor(client):
+    response = client.get("/api/matches", params={"limit": 50, "stream": "true"})
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert len(lines) == 51 and set(lines[-1]) == {"next_cursor"}
+    rest = client.get("/api/matches", params={"limit": 50, "cursor": lines[-1]["next_cursor"]})
+    assert "X-Next-Cursor" not in rest.headers
+    assert sorted(line["match_id"] for line in lines[:-1] + rest.json()) == [f"m{number:03d}" for number in range(90)]
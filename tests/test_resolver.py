@@ -0,0 +1,41 @@
+import pytest
+
+from match_parser import DEFAULT_SQUAD, PLAYER_ALTERNATIVES, MI_PLAYERS, PlayerNameResolver, build_squad_prefilter
+
+TEAMS = [DEFAULT_SQUAD, "Sunrisers Hyderabad"]
+
+
+@pytest.fixture
+def resolver():
+    return PlayerNameResolver(MI_PLAYERS, PLAYER_ALTERNATIVES, DEFAULT_SQUAD)
+
+
+@pytest.mark.parametrize("name", ["Sharma", "Kumar", "Abhishek Sharma", "Bhuvneshwar Kumar", "Ishan Kishan"])
+def test_namesakes_are_not_squad_players(resolver, name):
+    assert resolver.identify(name, teams_in_match=TEAMS, strict=True) is None
+    assert resolver.identify(name, teams_in_match=TEAMS) is None
+
+
+@pytest.mark.parametrize("name, canonical", [
+    ("KV Sharma", "Karn Sharma"), ("RG Sharma", "Rohit Sharma"), ("Ashwani Kumar", "Ashwani Kumar"), ("A Kumar", "Ashwani Kumar")
+])
+def test_squad_names_resolve(resolver, name, canonical):
+    assert resolver.identify(name, teams_in_match=TEAMS, strict=True) == canonical
+
+
+def test_registry_ids_decide_over_names(resolver):
+    resolver.set_person_ids({"kv-sharma-id": "Karn Sharma"})
+    assert resolver.identify("KV Sharma", "kv-sharma-id", TEAMS, strict=True) == "Karn Sharma"
+    assert resolver.identify("KV Sharma", "another-id", TEAMS, strict=True) is None
+
+
+def test_no_config_alias_is_a_bare_surname():
+    for canonical, aliases in PLAYER_ALTERNATIVES.items():
+        surname = canonical.split()[-1]
+        assert surname not in aliases, canonical
+
+
+def test_prefilter_skips_surname_only_files():
+    prefilter = build_squad_prefilter()
+    assert not prefilter.may_involve_squad(b'{"players": {"Sunrisers Hyderabad": ["Sharma", "Kumar"]}}')
+    assert prefilter.may_involve_squad(b'{"players": {"Mumbai Indians": ["KV Sharma"]}}')
@@ -0,0 +1,77 @@
+import app
+
+SAMPLE_RECORDS = [
+    {"match_id": "m1", "player_name": "Rohit Sharma", "format": "T20", "tournament": "Indian Premier League", "season": "2024", "date": "2024-04-01"},
+    {"match_id": "m2", "player_name": "Rohit Sharma", "format": "ODI", "tournament": "ICC Cricket World Cup", "season": "2023/24", "date": "2023-11-19"},
+    {"match_id": "m3", "player_name": "Jasprit Bumrah", "format": "T20", "tournament": "Indian Premier League", "season": "2025", "date": "2025-04-07"},
+    {"match_id": "m4", "player_name": "Tilak Varma", "format": "T20", "tournament": "Indian Premier League", "season": "2025", "date": "2025-04-13"},
+]
+
+
+def ixscan(index_name, key_pattern, bounds):
+    return {"stage": "IXSCAN", "indexName": index_name, "keyPattern": key_pattern, "indexBounds": bounds}
+
+
+def explained(stage):
+    return {"queryPlanner": {"winningPlan": {"stage": "FETCH", "inputStage": stage}}}
+
+
+def test_text_filter_modes():
+    assert app.text_filter("player_name", "Rohit Sharma") == {"player_key": "rohit sharma"}
+    assert app.text_filter("player_name", " Rohit  SHARMA ", "exact") == {"player_key": "rohit sharma"}
+    assert app.text_filter("tournament", "Indian P", "prefix") == {"tournament_key": {"$regex": "^indian\\ p"}}
+    assert app.text_filter("format", "t20", "regex") == {"format": {"$regex": "t20", "$options": "i"}}
+
+
+def test_bounded_index_scan_on_the_filtered_key():
+    plan = explained(ixscan(
+        "player_key_date_id", {"player_key": 1, "date": -1, "_id": -1},
+        {"player_key": ['["rohit sharma", "rohit sharma"]'], "date": ["[MaxKey, MinKey]"], "_id": ["[MaxKey, MinKey]"]}
+    ))
+    assert app.bounded_index_scan(plan, ["player_key"]) == "player_key_date_id"
+
+
+def test_bounded_index_scan_rejects_a_walk_of_another_index():
+    plan = explained(ixscan("date_id", {"date": -1, "_id": -1}, {"date": ["[MaxKey, MinKey]"], "_id": ["[MaxKey, MinKey]"]}))
+    assert app.bounded_index_scan(plan, ["player_key"]) is None
+
+
+def test_bounded_index_scan_rejects_unbounded_keys():
+    plan = explained(ixscan(
+        "tournament_key_season_key_date", {"tournament_key": 1, "season_key": 1, "date": -1},
+        {"tournament_key": ['["indian premier league", "indian premier league"]'], "season_key": ["[MinKey, MaxKey]"], "date": ["[MaxKey, MinKey]"]}
+    ))
+    assert app.bounded_index_scan(plan, ["tournament_key"]) == "tournament_key_season_key_date"
+    assert app.bounded_index_scan(plan, ["tournament_key", "season_key"]) is None
+
+
+def test_bounded_index_scan_reads_nested_plans():
+    # Slot-based engine explain output nests the classic plan under queryPlan
+    plan = {"queryPlanner": {"winningPlan": {"queryPlan": explained(ixscan(
+        "format_key_date", {"format_key": 1, "date": -1},
+        {"format_key": ['["t20", "t21")', "[/^t20/, /^t20/]"], "date": ["[MaxKey, MinKey]"]}
+    ))["queryPlanner"]["winningPlan"], "slotBasedPlan": {}}}}
+    assert app.bounded_index_scan(plan, ["format_key"]) == "format_key_date"
+
+
+def test_sorts_in_memory():
+    index_order = explained(ixscan("player_key_date_id", {"player_key": 1, "date": -1, "_id": -1}, {"player_key": ['["rohit sharma", "rohit sharma"]']}))
+    assert not app.sorts_in_memory(index_order)
+    sorted_after = {"queryPlanner": {"winningPlan": {"stage": "SORT", "inputStage": index_order["queryPlanner"]["winningPlan"]}}}
+    assert app.sorts_in_memory(sorted_after)
+
+
+def test_text_filters_seek_on_their_own_indexes(run_with_mongo):
+    async def body(db):
+        await db.matches.insert_many([{**record, **app.keyword_fields(record)} for record in SAMPLE_RECORDS])
+        await app.ensure_indexes()
+        return await app.explain_text_filters()
+    
+    plans = run_with_mongo(body)
+    for match in ("exact", "prefix"):
+        assert plans[f"player_name {match}"] == "player_key_date_id"
+        assert plans[f"format {match}"] == "format_key_date"
+        assert plans[f"tournament {match}"] == "tournament_key_season_key_date"
+        assert plans[f"tournament+season {match}"] == "tournament_key_season_key_date"
+    # The default (exact) player filter lists newest first straight off the index
+    assert plans["player_name listing"] == "player_key_date_id"